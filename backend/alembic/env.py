@@ -3,7 +3,7 @@ Alembic environment configuration
 Handles database migrations
 """
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, pool, text
 from alembic import context
 import sys
 from pathlib import Path
@@ -28,6 +28,18 @@ if config.config_file_name is not None:
 # Add your model's MetaData object here for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Session settings for index builds (parallel B-tree builds, in-memory sorts),
+# opt-in per run, e.g.:
+#   alembic -x maintenance_work_mem=2GB -x max_parallel_maintenance_workers=4 upgrade head
+# Without them the server defaults apply.
+MAINTENANCE_SETTINGS = ("maintenance_work_mem", "max_parallel_maintenance_workers")
+
+
+def get_maintenance_settings() -> dict:
+    """The MAINTENANCE_SETTINGS given with -x on the command line"""
+    x_arguments = context.get_x_argument(as_dictionary=True)
+    return {name: x_arguments[name] for name in MAINTENANCE_SETTINGS if name in x_arguments}
+
 
 def run_migrations_offline() -> None:
     """
@@ -67,11 +79,23 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        maintenance_settings = get_maintenance_settings()
+        if maintenance_settings and connection.dialect.name == "postgresql":
+            for name, value in maintenance_settings.items():
+                connection.execute(
+                    text("SELECT set_config(:name, :value, false)"),
+                    {"name": name, "value": value}
+                )
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
             compare_server_default=True,
+            # One transaction per revision so index revisions can leave it
+            # for CREATE INDEX CONCURRENTLY (autocommit_block)
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,108 @@
+"""
+Partition track_points by track_id hash
+
+Revision ID: 004_partition_track_points
+Revises: 003_phase3_tables
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004_partition_track_points'
+down_revision = '003_phase3_tables'
+branch_labels = None
+depends_on = None
+
+# Number of hash partitions for track_points
+TRACK_POINT_PARTITIONS = 16
+
+# Copied by name: later revisions re-add id, which moves it to the end
+COLUMNS = (
+    "id, track_id, frame_number, timestamp, bbox_x1, bbox_y1, bbox_x2, bbox_y2, "
+    "confidence, x_px, y_px, x_m, y_m, keypoints, created_at"
+)
+
+
+def upgrade() -> None:
+    """Rebuild track_points as a HASH (track_id) partitioned table"""
+
+    # Keep the existing rows aside while the partitioned parent is created
+    op.execute("ALTER TABLE track_points RENAME TO track_points_unpartitioned")
+    op.execute("ALTER TABLE track_points_unpartitioned RENAME CONSTRAINT track_points_pkey TO track_points_unpartitioned_pkey")
+    op.execute("ALTER TABLE track_points_unpartitioned RENAME CONSTRAINT track_points_track_id_fkey TO track_points_unpartitioned_track_id_fkey")
+    op.execute("ALTER INDEX idx_trackpoint_track_id RENAME TO idx_trackpoint_track_id_old")
+    op.execute("ALTER INDEX idx_trackpoint_track_frame RENAME TO idx_trackpoint_track_frame_old")
+    op.execute("ALTER INDEX idx_trackpoint_frame RENAME TO idx_trackpoint_frame_old")
+
+    # Primary key must contain the partition key
+    op.execute("""
+        CREATE TABLE track_points (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            track_id UUID NOT NULL REFERENCES tracks(id) ON DELETE CASCADE,
+            frame_number INTEGER NOT NULL,
+            timestamp FLOAT NOT NULL,
+            bbox_x1 INTEGER NOT NULL,
+            bbox_y1 INTEGER NOT NULL,
+            bbox_x2 INTEGER NOT NULL,
+            bbox_y2 INTEGER NOT NULL,
+            confidence FLOAT NOT NULL,
+            x_px FLOAT NOT NULL,
+            y_px FLOAT NOT NULL,
+            x_m FLOAT,
+            y_m FLOAT,
+            keypoints JSON,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (id, track_id)
+        ) PARTITION BY HASH (track_id)
+    """)
+
+    for i in range(TRACK_POINT_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE track_points_p{i} PARTITION OF track_points "
+            f"FOR VALUES WITH (MODULUS {TRACK_POINT_PARTITIONS}, REMAINDER {i})"
+        )
+
+    # Indexes on the parent are propagated to every partition (PG11+)
+    op.execute("CREATE INDEX idx_trackpoint_track_id ON track_points (track_id)")
+    op.execute("CREATE INDEX idx_trackpoint_track_frame ON track_points (track_id, frame_number)")
+    op.execute("CREATE INDEX idx_trackpoint_frame ON track_points (frame_number)")
+
+    op.execute(f"INSERT INTO track_points ({COLUMNS}) SELECT {COLUMNS} FROM track_points_unpartitioned")
+    op.execute("DROP TABLE track_points_unpartitioned")
+
+
+def downgrade() -> None:
+    """Restore a plain (unpartitioned) track_points table"""
+
+    op.execute("ALTER TABLE track_points RENAME TO track_points_partitioned")
+    op.execute("ALTER TABLE track_points_partitioned RENAME CONSTRAINT track_points_pkey TO track_points_partitioned_pkey")
+    op.execute("ALTER TABLE track_points_partitioned RENAME CONSTRAINT track_points_track_id_fkey TO track_points_partitioned_track_id_fkey")
+    op.execute("ALTER INDEX idx_trackpoint_track_id RENAME TO idx_trackpoint_track_id_part")
+    op.execute("ALTER INDEX idx_trackpoint_track_frame RENAME TO idx_trackpoint_track_frame_part")
+    op.execute("ALTER INDEX idx_trackpoint_frame RENAME TO idx_trackpoint_frame_part")
+
+    op.execute("""
+        CREATE TABLE track_points (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            track_id UUID NOT NULL REFERENCES tracks(id) ON DELETE CASCADE,
+            frame_number INTEGER NOT NULL,
+            timestamp FLOAT NOT NULL,
+            bbox_x1 INTEGER NOT NULL,
+            bbox_y1 INTEGER NOT NULL,
+            bbox_x2 INTEGER NOT NULL,
+            bbox_y2 INTEGER NOT NULL,
+            confidence FLOAT NOT NULL,
+            x_px FLOAT NOT NULL,
+            y_px FLOAT NOT NULL,
+            x_m FLOAT,
+            y_m FLOAT,
+            keypoints JSON,
+            created_at TIMESTAMP NOT NULL
+        )
+    """)
+    op.execute(f"INSERT INTO track_points ({COLUMNS}) SELECT {COLUMNS} FROM track_points_partitioned")
+    op.execute("DROP TABLE track_points_partitioned")
+
+    op.create_index('idx_trackpoint_track_id', 'track_points', ['track_id'])
+    op.create_index('idx_trackpoint_track_frame', 'track_points', ['track_id', 'frame_number'])
+    op.create_index('idx_trackpoint_frame', 'track_points', ['frame_number'])
@@ -0,0 +1,50 @@
+"""
+Switch append-heavy tables to BIGINT identity primary keys
+
+Revision ID: 005_bigint_identity_pks
+Revises: 004_partition_track_points
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005_bigint_identity_pks'
+down_revision = '004_partition_track_points'
+branch_labels = None
+depends_on = None
+
+# matches / videos / tracks keep their UUIDs: they are exposed through the API
+# and tracks.id doubles as the player_id stored in the analytics tables.
+
+
+def upgrade() -> None:
+    """Replace UUID ids with BIGINT ids (identity columns where the table allows it)"""
+
+    # track_points is partitioned: the key still has to include track_id.
+    # PostgreSQL < 17 cannot add an identity column to a table that already
+    # has partitions, so the id is a BIGINT fed by an owned sequence instead.
+    op.execute("ALTER TABLE track_points DROP CONSTRAINT track_points_pkey")
+    op.execute("ALTER TABLE track_points DROP COLUMN id")
+    op.execute("CREATE SEQUENCE track_points_id_seq AS BIGINT")
+    op.execute("ALTER TABLE track_points ADD COLUMN id BIGINT NOT NULL DEFAULT nextval('track_points_id_seq')")
+    op.execute("ALTER SEQUENCE track_points_id_seq OWNED BY track_points.id")
+    op.execute("ALTER TABLE track_points ADD PRIMARY KEY (id, track_id)")
+
+    for table in ('player_metric_timeseries', 'events'):
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_pkey")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN id")
+        op.execute(f"ALTER TABLE {table} ADD COLUMN id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY")
+
+
+def downgrade() -> None:
+    """Restore UUID primary keys"""
+
+    for table in ('events', 'player_metric_timeseries'):
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_pkey")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN id")
+        op.execute(f"ALTER TABLE {table} ADD COLUMN id UUID NOT NULL DEFAULT gen_random_uuid() PRIMARY KEY")
+
+    op.execute("ALTER TABLE track_points DROP CONSTRAINT track_points_pkey")
+    op.execute("ALTER TABLE track_points DROP COLUMN id")
+    op.execute("ALTER TABLE track_points ADD COLUMN id UUID NOT NULL DEFAULT gen_random_uuid()")
+    op.execute("ALTER TABLE track_points ADD PRIMARY KEY (id, track_id)")
@@ -0,0 +1,100 @@
+"""
+Flatten JSON columns: keypoints side table, numeric calibration matrix, JSONB
+
+Revision ID: 006_flatten_json_columns
+Revises: 005_bigint_identity_pks
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006_flatten_json_columns'
+down_revision = '005_bigint_identity_pks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Move keypoints to their own table and drop plain JSON columns"""
+
+    # ========================================================================
+    # 1. track_points.keypoints -> track_point_keypoints
+    # ========================================================================
+    op.execute("""
+        CREATE TABLE track_point_keypoints (
+            track_point_id BIGINT NOT NULL,
+            track_id UUID NOT NULL,
+            kp_index SMALLINT NOT NULL,
+            x REAL NOT NULL,
+            y REAL NOT NULL,
+            conf REAL,
+            PRIMARY KEY (track_point_id, kp_index),
+            FOREIGN KEY (track_point_id, track_id)
+                REFERENCES track_points (id, track_id) ON DELETE CASCADE
+        )
+    """)
+
+    # Keypoints were stored as [[x, y, conf], ...]
+    op.execute("""
+        INSERT INTO track_point_keypoints (track_point_id, track_id, kp_index, x, y, conf)
+        SELECT tp.id, tp.track_id, (kp.ord - 1)::smallint,
+               (kp.value->>0)::real, (kp.value->>1)::real, (kp.value->>2)::real
+        FROM track_points tp,
+             jsonb_array_elements(tp.keypoints::jsonb) WITH ORDINALITY AS kp(value, ord)
+        WHERE tp.keypoints IS NOT NULL
+          AND jsonb_typeof(tp.keypoints::jsonb) = 'array'
+    """)
+
+    op.execute("ALTER TABLE track_points DROP COLUMN keypoints")
+
+    # ========================================================================
+    # 2. calibration_matrices.matrix -> DOUBLE PRECISION[][]
+    # ========================================================================
+    op.execute("ALTER TABLE calibration_matrices ADD COLUMN matrix_values DOUBLE PRECISION[][]")
+    op.execute("""
+        UPDATE calibration_matrices
+        SET matrix_values = ARRAY(
+            SELECT ARRAY(SELECT jsonb_array_elements_text(row_values)::double precision)
+            FROM jsonb_array_elements(matrix::jsonb) AS row_values
+        )
+    """)
+    op.execute("ALTER TABLE calibration_matrices DROP COLUMN matrix")
+    op.execute("ALTER TABLE calibration_matrices RENAME COLUMN matrix_values TO matrix")
+    op.execute("ALTER TABLE calibration_matrices ALTER COLUMN matrix SET NOT NULL")
+
+    # ========================================================================
+    # 3. Remaining JSON columns -> JSONB
+    # ========================================================================
+    for table, column in (
+        ('calibration_matrices', 'source_points'),
+        ('calibration_matrices', 'target_points'),
+        ('team_colors', 'color_cluster_centers'),
+    ):
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb")
+
+
+def downgrade() -> None:
+    """Restore JSON columns"""
+
+    for table, column in (
+        ('team_colors', 'color_cluster_centers'),
+        ('calibration_matrices', 'target_points'),
+        ('calibration_matrices', 'source_points'),
+    ):
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSON USING {column}::json")
+
+    op.execute("ALTER TABLE calibration_matrices ALTER COLUMN matrix TYPE JSON USING array_to_json(matrix)")
+
+    op.execute("ALTER TABLE track_points ADD COLUMN keypoints JSON")
+    op.execute("""
+        UPDATE track_points tp
+        SET keypoints = kp.points
+        FROM (
+            SELECT track_point_id, track_id,
+                   json_agg(json_build_array(x, y, conf) ORDER BY kp_index) AS points
+            FROM track_point_keypoints
+            GROUP BY track_point_id, track_id
+        ) kp
+        WHERE tp.id = kp.track_point_id AND tp.track_id = kp.track_id
+    """)
+    op.execute("DROP TABLE track_point_keypoints")
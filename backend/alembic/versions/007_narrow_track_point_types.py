@@ -0,0 +1,36 @@
+"""
+Narrow track_points column types (SMALLINT bbox, REAL coordinates)
+
+Revision ID: 007_narrow_track_point_types
+Revises: 006_flatten_json_columns
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007_narrow_track_point_types'
+down_revision = '006_flatten_json_columns'
+branch_labels = None
+depends_on = None
+
+# Pixel bboxes of a <=4K frame fit in SMALLINT; single precision is plenty
+# for confidence and pixel/metric coordinates. timestamp stays DOUBLE
+# PRECISION: REAL only resolves ~0.5 ms past the first hour, which is
+# amplified by the 1/dt in speed and acceleration.
+BBOX_COLUMNS = ('bbox_x1', 'bbox_y1', 'bbox_x2', 'bbox_y2')
+REAL_COLUMNS = ('confidence', 'x_px', 'y_px', 'x_m', 'y_m')
+
+
+def _alter_types(bbox_type: str, real_type: str) -> None:
+    # One ALTER TABLE so the table is rewritten only once
+    clauses = [f"ALTER COLUMN {col} TYPE {bbox_type}" for col in BBOX_COLUMNS]
+    clauses += [f"ALTER COLUMN {col} TYPE {real_type}" for col in REAL_COLUMNS]
+    op.execute("ALTER TABLE track_points " + ", ".join(clauses))
+
+
+def upgrade() -> None:
+    _alter_types("SMALLINT", "REAL")
+
+
+def downgrade() -> None:
+    _alter_types("INTEGER", "DOUBLE PRECISION")
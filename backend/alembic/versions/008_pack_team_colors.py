@@ -0,0 +1,55 @@
+"""
+Pack team_colors RGB arrays into a single INTEGER
+
+Revision ID: 008_pack_team_colors
+Revises: 007_narrow_track_point_types
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008_pack_team_colors'
+down_revision = '007_narrow_track_point_types'
+branch_labels = None
+depends_on = None
+
+COLOR_COLUMNS = ('primary_color_rgb', 'secondary_color_rgb')
+
+
+def upgrade() -> None:
+    """Store colors as (R << 16) | (G << 8) | B"""
+
+    for column in COLOR_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE team_colors
+            ALTER COLUMN {column} TYPE INTEGER
+            USING ({column}[1] << 16) | ({column}[2] << 8) | {column}[3]
+        """)
+
+    # Channel accessors for ad-hoc queries
+    op.execute("""
+        CREATE VIEW team_colors_rgb AS
+        SELECT id, match_id, team_side, team_name,
+               (primary_color_rgb >> 16) & 255 AS primary_r,
+               (primary_color_rgb >> 8) & 255 AS primary_g,
+               primary_color_rgb & 255 AS primary_b,
+               (secondary_color_rgb >> 16) & 255 AS secondary_r,
+               (secondary_color_rgb >> 8) & 255 AS secondary_g,
+               secondary_color_rgb & 255 AS secondary_b
+        FROM team_colors
+    """)
+
+
+def downgrade() -> None:
+    """Restore INTEGER[] RGB columns"""
+
+    op.execute("DROP VIEW team_colors_rgb")
+
+    for column in COLOR_COLUMNS:
+        op.execute(f"""
+            ALTER TABLE team_colors
+            ALTER COLUMN {column} TYPE INTEGER[]
+            USING CASE WHEN {column} IS NULL THEN NULL ELSE ARRAY[
+                ({column} >> 16) & 255, ({column} >> 8) & 255, {column} & 255
+            ] END
+        """)
@@ -0,0 +1,43 @@
+"""
+Covering indexes for per-track and per-player reads
+
+Revision ID: 009_covering_indexes
+Revises: 008_pack_team_colors
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009_covering_indexes'
+down_revision = '008_pack_team_colors'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Replace composite indexes with INCLUDE variants for index-only scans"""
+
+    # Analytics engines read (x_m, y_m, timestamp) per track in frame order.
+    # track_points is partitioned, so CONCURRENTLY is not available here
+    op.execute("DROP INDEX idx_trackpoint_track_frame")
+    op.execute("""
+        CREATE INDEX idx_trackpoint_track_frame ON track_points (track_id, frame_number)
+        INCLUDE (x_m, y_m, confidence, timestamp)
+    """)
+
+    # Event timelines are read per (match, player) ordered by timestamp.
+    # events is not partitioned: build without blocking writes
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY idx_event_match_player_ts ON events (match_id, player_id, timestamp)
+            INCLUDE (event_type, start_x, start_y, end_x, end_y, xt_value)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY idx_event_match_player")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX idx_event_match_player_ts")
+    op.create_index('idx_event_match_player', 'events', ['match_id', 'player_id'])
+
+    op.execute("DROP INDEX idx_trackpoint_track_frame")
+    op.execute("CREATE INDEX idx_trackpoint_track_frame ON track_points (track_id, frame_number)")
@@ -0,0 +1,45 @@
+"""
+BRIN indexes for naturally ordered frame/timestamp columns
+
+Revision ID: 010_brin_indexes
+Revises: 009_covering_indexes
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '010_brin_indexes'
+down_revision = '009_covering_indexes'
+branch_labels = None
+depends_on = None
+
+# (old B-tree index, new BRIN index, table, column)
+BRIN_INDEXES = [
+    ('idx_trackpoint_frame', 'idx_trackpoint_frame_brin', 'track_points', 'frame_number'),
+    (None, 'idx_timeseries_timestamp_brin', 'player_metric_timeseries', 'timestamp'),
+    ('idx_event_timestamp', 'idx_event_timestamp_brin', 'events', 'timestamp'),
+]
+
+
+# CREATE INDEX CONCURRENTLY is not supported on partitioned parents
+PARTITIONED_TABLES = {'track_points'}
+
+
+def upgrade() -> None:
+    """Rows are appended in frame/timestamp order, so BRIN summaries stay tight"""
+    with op.get_context().autocommit_block():
+        for btree_name, brin_name, table, column in BRIN_INDEXES:
+            concurrently = "" if table in PARTITIONED_TABLES else " CONCURRENTLY"
+            op.execute(
+                f"CREATE INDEX{concurrently} {brin_name} ON {table} USING BRIN ({column}) "
+                f"WITH (pages_per_range = 64)"
+            )
+            if btree_name:
+                op.execute(f"DROP INDEX{concurrently} {btree_name}")
+
+
+def downgrade() -> None:
+    for btree_name, brin_name, table, column in reversed(BRIN_INDEXES):
+        op.execute(f"DROP INDEX {brin_name}")
+        if btree_name:
+            op.execute(f"CREATE INDEX {btree_name} ON {table} ({column})")
@@ -0,0 +1,38 @@
+"""
+Drop indexes that duplicate the leading columns of another index
+
+Revision ID: 011_drop_redundant_indexes
+Revises: 010_brin_indexes
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '011_drop_redundant_indexes'
+down_revision = '010_brin_indexes'
+branch_labels = None
+depends_on = None
+
+# (index, table, columns, superseded by)
+# match_id / video_id indexes without a covering composite are kept: they back
+# the ON DELETE CASCADE lookups from matches and videos.
+REDUNDANT_INDEXES = [
+    ('idx_track_video_id', 'tracks', ['video_id'], 'uq_video_track_id'),
+    ('idx_track_video_track_id', 'tracks', ['video_id', 'track_id'], 'uq_video_track_id'),
+    ('idx_trackpoint_track_id', 'track_points', ['track_id'], 'idx_trackpoint_track_frame'),
+    ('idx_teamcolor_match_id', 'team_colors', ['match_id'], 'uq_match_team_side'),
+    ('idx_tactical_snapshot_match', 'tactical_snapshots', ['match_id'], 'idx_tactical_snapshot_match_team'),
+    ('idx_xt_metric_match', 'xt_metrics', ['match_id'], 'idx_xt_metric_match_player'),
+    ('idx_event_match', 'events', ['match_id'], 'idx_event_match_player_ts'),
+    ('idx_transition_match', 'transition_metrics', ['match_id'], 'idx_transition_match_team'),
+]
+
+
+def upgrade() -> None:
+    for index_name, table, _columns, _superseded_by in REDUNDANT_INDEXES:
+        op.drop_index(index_name, table_name=table)
+
+
+def downgrade() -> None:
+    for index_name, table, columns, _superseded_by in reversed(REDUNDANT_INDEXES):
+        op.create_index(index_name, table, columns)
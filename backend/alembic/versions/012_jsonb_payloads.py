@@ -0,0 +1,37 @@
+"""
+Convert analytics JSON payloads to JSONB
+
+Revision ID: 012_jsonb_payloads
+Revises: 011_drop_redundant_indexes
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '012_jsonb_payloads'
+down_revision = '011_drop_redundant_indexes'
+branch_labels = None
+depends_on = None
+
+JSONB_COLUMNS = [
+    ('player_metrics', 'metadata'),
+    ('team_metrics', 'metadata'),
+    ('tactical_snapshots', 'player_positions'),
+    ('events', 'metadata'),
+]
+
+
+def upgrade() -> None:
+    for table, column in JSONB_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb")
+
+    # Containment lookups (metadata @> '{...}') on events
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY idx_event_metadata_gin ON events USING GIN (metadata jsonb_path_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX idx_event_metadata_gin")
+
+    for table, column in reversed(JSONB_COLUMNS):
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSON USING {column}::json")
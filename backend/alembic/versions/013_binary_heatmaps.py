@@ -0,0 +1,63 @@
+"""
+Store player_heatmaps.heatmap_data as a float32 BYTEA blob
+
+Revision ID: 013_binary_heatmaps
+Revises: 012_jsonb_payloads
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+import numpy as np
+import json
+
+# revision identifiers, used by Alembic.
+revision = '013_binary_heatmaps'
+down_revision = '012_jsonb_payloads'
+branch_labels = None
+depends_on = None
+
+# Row-major (grid_height, grid_width) little-endian float32
+HEATMAP_DTYPE = '<f4'
+
+
+def upgrade() -> None:
+    """Re-encode JSON grids as raw float32 bytes"""
+    bind = op.get_bind()
+
+    op.add_column('player_heatmaps', sa.Column('heatmap_blob', sa.LargeBinary(), nullable=True))
+
+    rows = bind.execute(sa.text("SELECT id, heatmap_data FROM player_heatmaps")).fetchall()
+    for row_id, data in rows:
+        if isinstance(data, str):
+            data = json.loads(data)
+        blob = np.asarray(data, dtype=HEATMAP_DTYPE).tobytes()
+        bind.execute(
+            sa.text("UPDATE player_heatmaps SET heatmap_blob = :blob WHERE id = :id"),
+            {"blob": blob, "id": row_id}
+        )
+
+    op.drop_column('player_heatmaps', 'heatmap_data')
+    op.alter_column('player_heatmaps', 'heatmap_blob', new_column_name='heatmap_data', nullable=False)
+
+    # Keep the (compressible, mostly-zero) grid inline with the row when possible
+    op.execute("ALTER TABLE player_heatmaps ALTER COLUMN heatmap_data SET STORAGE MAIN")
+
+
+def downgrade() -> None:
+    """Decode blobs back into JSON grids"""
+    bind = op.get_bind()
+
+    op.add_column('player_heatmaps', sa.Column('heatmap_json', sa.JSON(), nullable=True))
+
+    rows = bind.execute(sa.text(
+        "SELECT id, heatmap_data, grid_width, grid_height FROM player_heatmaps"
+    )).fetchall()
+    for row_id, blob, grid_width, grid_height in rows:
+        grid = np.frombuffer(blob, dtype=HEATMAP_DTYPE).reshape(grid_height, grid_width)
+        bind.execute(
+            sa.text("UPDATE player_heatmaps SET heatmap_json = CAST(:data AS JSON) WHERE id = :id"),
+            {"data": json.dumps(grid.tolist()), "id": row_id}
+        )
+
+    op.drop_column('player_heatmaps', 'heatmap_data')
+    op.alter_column('player_heatmaps', 'heatmap_json', new_column_name='heatmap_data', nullable=False)
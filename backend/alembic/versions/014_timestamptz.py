@@ -0,0 +1,82 @@
+"""
+Use TIMESTAMPTZ for all timestamp columns and set them in the database
+
+Revision ID: 014_timestamptz
+Revises: 013_binary_heatmaps
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '014_timestamptz'
+down_revision = '013_binary_heatmaps'
+branch_labels = None
+depends_on = None
+
+# Existing TIMESTAMP values are read as UTC. The created/updated and
+# processing columns were written with datetime.utcnow(); matches.match_date
+# holds the client-supplied date without a zone and is treated as UTC too.
+TIMESTAMP_COLUMNS = {
+    'matches': ['match_date', 'created_at', 'updated_at'],
+    'videos': ['processing_started_at', 'processing_completed_at', 'created_at', 'updated_at'],
+    'tracks': ['created_at', 'updated_at'],
+    'track_points': ['created_at'],
+    'calibration_matrices': ['created_at', 'updated_at'],
+    'team_colors': ['created_at', 'updated_at'],
+    'player_metrics': ['created_at', 'updated_at'],
+    'player_metric_timeseries': ['created_at'],
+    'player_heatmaps': ['created_at', 'updated_at'],
+    'team_metrics': ['created_at', 'updated_at'],
+    'tactical_snapshots': ['created_at'],
+    'xt_metrics': ['created_at', 'updated_at'],
+    'events': ['created_at'],
+    'transition_metrics': ['created_at'],
+}
+
+
+def _updated_at_tables():
+    return [table for table, columns in TIMESTAMP_COLUMNS.items() if 'updated_at' in columns]
+
+
+def upgrade() -> None:
+    """Convert to TIMESTAMPTZ, default created_at/updated_at to now()"""
+
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        alters = ", ".join(
+            f"ALTER COLUMN {column} TYPE TIMESTAMPTZ USING {column} AT TIME ZONE 'UTC'"
+            for column in columns
+        )
+        op.execute(f"ALTER TABLE {table} {alters}")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()")
+        if 'updated_at' in columns:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN updated_at SET DEFAULT now()")
+
+    # updated_at is maintained by the database instead of an app-side UPDATE
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in _updated_at_tables():
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    """Restore TIMESTAMP WITHOUT TIME ZONE"""
+
+    for table in _updated_at_tables():
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
+
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        alters = ", ".join(
+            f"ALTER COLUMN {column} TYPE TIMESTAMP USING {column} AT TIME ZONE 'UTC'"
+            for column in columns
+        )
+        op.execute(f"ALTER TABLE {table} {alters}")
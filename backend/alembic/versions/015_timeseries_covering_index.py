@@ -0,0 +1,44 @@
+"""
+Covering index for per-player metric timeseries reads
+
+Revision ID: 015_timeseries_covering_index
+Revises: 014_timestamptz
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '015_timeseries_covering_index'
+down_revision = '014_timestamptz'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Equality columns first, then the timestamp range; INCLUDE the payload"""
+
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY idx_timeseries_pm_type_ts
+            ON player_metric_timeseries (player_id, match_id, metric_type, timestamp)
+            INCLUDE (value, unit)
+        """)
+        op.execute(
+            "CREATE INDEX CONCURRENTLY idx_timeseries_match_ts "
+            "ON player_metric_timeseries (match_id, timestamp)"
+        )
+
+        # Superseded by the two indexes above (idx_timeseries_match_ts still
+        # serves the ON DELETE CASCADE lookup from matches)
+        op.execute("DROP INDEX CONCURRENTLY idx_timeseries_player_timestamp")
+        op.execute("DROP INDEX CONCURRENTLY idx_timeseries_player_match")
+        op.execute("DROP INDEX CONCURRENTLY idx_timeseries_match")
+
+
+def downgrade() -> None:
+    op.create_index('idx_timeseries_match', 'player_metric_timeseries', ['match_id'])
+    op.create_index('idx_timeseries_player_match', 'player_metric_timeseries', ['player_id', 'match_id'])
+    op.create_index('idx_timeseries_player_timestamp', 'player_metric_timeseries', ['player_id', 'timestamp'])
+
+    op.drop_index('idx_timeseries_match_ts', table_name='player_metric_timeseries')
+    op.drop_index('idx_timeseries_pm_type_ts', table_name='player_metric_timeseries')
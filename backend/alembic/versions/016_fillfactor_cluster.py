@@ -0,0 +1,64 @@
+"""
+Tune fillfactor for updated vs append-only tables, cluster track_points
+
+Revision ID: 016_fillfactor_cluster
+Revises: 015_timeseries_covering_index
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '016_fillfactor_cluster'
+down_revision = '015_timeseries_covering_index'
+branch_labels = None
+depends_on = None
+
+# Partition count from 004_partition_track_points
+TRACK_POINT_PARTITIONS = 16
+
+# Rows that get UPDATEd (status transitions, team assignment): leave room on
+# each page so updates stay HOT
+UPDATE_HEAVY_TABLES = ['matches', 'videos', 'tracks']
+UPDATE_HEAVY_FILLFACTOR = 70
+
+# INSERT-only tables stay densely packed. Storage parameters cannot be set on
+# a partitioned parent, so track_points is handled per partition.
+APPEND_ONLY_TABLES = (
+    ['player_metric_timeseries', 'events', 'player_heatmaps']
+    + [f'track_points_p{i}' for i in range(TRACK_POINT_PARTITIONS)]
+)
+
+
+def upgrade() -> None:
+    for table in UPDATE_HEAVY_TABLES:
+        op.execute(f"ALTER TABLE {table} SET (fillfactor = {UPDATE_HEAVY_FILLFACTOR})")
+    for table in APPEND_ONLY_TABLES:
+        op.execute(f"ALTER TABLE {table} SET (fillfactor = 100)")
+
+    # Physically order points by (track_id, frame_number) so per-track reads
+    # are sequential. CLUSTER locks the table: re-run it during maintenance
+    # windows after large ingests rather than from the workers.
+    # A partitioned parent cannot be clustered inside a transaction (nor at
+    # all before PostgreSQL 15), so each partition is clustered on its own
+    # piece of the index.
+    op.execute("""
+        DO $$
+        DECLARE part record;
+        BEGIN
+            FOR part IN
+                SELECT tbl.relname AS table_name, idx.relname AS index_name
+                FROM pg_inherits inh
+                JOIN pg_class idx ON idx.oid = inh.inhrelid
+                JOIN pg_index ind ON ind.indexrelid = idx.oid
+                JOIN pg_class tbl ON tbl.oid = ind.indrelid
+                WHERE inh.inhparent = 'idx_trackpoint_track_frame'::regclass
+            LOOP
+                EXECUTE format('CLUSTER %I USING %I', part.table_name, part.index_name);
+            END LOOP;
+        END $$
+    """)
+
+
+def downgrade() -> None:
+    for table in UPDATE_HEAVY_TABLES + APPEND_ONLY_TABLES:
+        op.execute(f"ALTER TABLE {table} RESET (fillfactor)")
@@ -0,0 +1,115 @@
+"""
+Replace PostgreSQL enum types with SMALLINT codes or VARCHAR + CHECK
+
+Revision ID: 017_enums_to_codes
+Revises: 016_fillfactor_cluster
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '017_enums_to_codes'
+down_revision = '016_fillfactor_cluster'
+branch_labels = None
+depends_on = None
+
+PROCESSING_STATUS = ['pending', 'processing', 'completed', 'failed']
+OBJECT_CLASS = ['player', 'ball', 'referee', 'goalkeeper']
+TEAM_SIDE = ['home', 'away', 'referee', 'unknown']
+METRIC_TYPE = [
+    'total_distance', 'top_speed', 'avg_speed', 'high_intensity_distance', 'sprint_count',
+    'max_acceleration', 'max_deceleration', 'stamina_index', 'avg_heart_rate', 'distance_per_minute',
+]
+# Codes are the 1-based position, matching SmallIntEnum in app/analytics/models.py
+TIMESERIES_METRIC_TYPE = ['speed', 'acceleration', 'stamina', 'distance_rolling']
+EVENT_TYPE = ['pass', 'carry', 'shot', 'dribble', 'tackle', 'interception']
+
+# (table, column, enum type, values, varchar length) -> VARCHAR + CHECK
+TEXT_COLUMNS = [
+    ('videos', 'status', 'processingstatus', PROCESSING_STATUS, 16),
+    ('tracks', 'object_class', 'objectclass', OBJECT_CLASS, 16),
+    ('tracks', 'team_side', 'teamside', TEAM_SIDE, 16),
+    ('team_colors', 'team_side', 'teamside', TEAM_SIDE, 16),
+    ('player_metrics', 'metric_name', 'metrictype', METRIC_TYPE, 32),
+]
+
+# (table, column, enum type, values) -> SMALLINT code on the high-volume tables
+CODE_COLUMNS = [
+    ('player_metric_timeseries', 'metric_type', 'timeseriesmetrictype', TIMESERIES_METRIC_TYPE),
+    ('events', 'event_type', 'eventtype', EVENT_TYPE),
+]
+
+ENUM_TYPES = [
+    ('processingstatus', PROCESSING_STATUS),
+    ('objectclass', OBJECT_CLASS),
+    ('teamside', TEAM_SIDE),
+    ('metrictype', METRIC_TYPE),
+    ('timeseriesmetrictype', TIMESERIES_METRIC_TYPE),
+    ('eventtype', EVENT_TYPE),
+]
+
+# team_colors_rgb (008) selects team_side and has to be rebuilt around the ALTER
+TEAM_COLORS_RGB_VIEW = """
+    CREATE VIEW team_colors_rgb AS
+    SELECT id, match_id, team_side, team_name,
+           (primary_color_rgb >> 16) & 255 AS primary_r,
+           (primary_color_rgb >> 8) & 255 AS primary_g,
+           primary_color_rgb & 255 AS primary_b,
+           (secondary_color_rgb >> 16) & 255 AS secondary_r,
+           (secondary_color_rgb >> 8) & 255 AS secondary_g,
+           secondary_color_rgb & 255 AS secondary_b
+    FROM team_colors
+"""
+
+
+def _sql_array(values):
+    return "ARRAY[" + ", ".join(f"'{v}'" for v in values) + "]"
+
+
+def upgrade() -> None:
+    op.execute("DROP VIEW team_colors_rgb")
+    op.execute("ALTER TABLE videos ALTER COLUMN status DROP DEFAULT")
+
+    for table, column, _enum_name, values, length in TEXT_COLUMNS:
+        allowed = ", ".join(f"'{v}'" for v in values)
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR({length}) USING {column}::text")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT ck_{table}_{column} CHECK ({column} IN ({allowed}))")
+
+    for table, column, _enum_name, values in CODE_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE SMALLINT "
+            f"USING array_position({_sql_array(values)}, {column}::text)::smallint"
+        )
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT ck_{table}_{column} "
+            f"CHECK ({column} BETWEEN 1 AND {len(values)})"
+        )
+
+    op.execute("ALTER TABLE videos ALTER COLUMN status SET DEFAULT 'pending'")
+    op.execute(TEAM_COLORS_RGB_VIEW)
+
+    for enum_name, _values in ENUM_TYPES:
+        op.execute(f"DROP TYPE {enum_name}")
+
+
+def downgrade() -> None:
+    for enum_name, values in ENUM_TYPES:
+        allowed = ", ".join(f"'{v}'" for v in values)
+        op.execute(f"CREATE TYPE {enum_name} AS ENUM ({allowed})")
+
+    op.execute("DROP VIEW team_colors_rgb")
+    op.execute("ALTER TABLE videos ALTER COLUMN status DROP DEFAULT")
+
+    for table, column, enum_name, values in CODE_COLUMNS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT ck_{table}_{column}")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_name} "
+            f"USING ({_sql_array(values)})[{column}]::{enum_name}"
+        )
+
+    for table, column, enum_name, _values, _length in TEXT_COLUMNS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT ck_{table}_{column}")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_name} USING {column}::{enum_name}")
+
+    op.execute("ALTER TABLE videos ALTER COLUMN status SET DEFAULT 'pending'")
+    op.execute(TEAM_COLORS_RGB_VIEW)
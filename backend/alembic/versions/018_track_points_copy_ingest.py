@@ -0,0 +1,32 @@
+"""
+Prepare track_points for COPY ingestion
+
+Revision ID: 018_track_points_copy_ingest
+Revises: 017_enums_to_codes
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '018_track_points_copy_ingest'
+down_revision = '017_enums_to_codes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """No per-row now(); let the loader defer the tracks FK to commit"""
+
+    # created_at is set once per batch by app.db.bulk.copy_track_points
+    op.execute("ALTER TABLE track_points ALTER COLUMN created_at DROP DEFAULT")
+
+    # SET CONSTRAINTS ... DEFERRED only applies to DEFERRABLE constraints
+    op.execute(
+        "ALTER TABLE track_points ALTER CONSTRAINT track_points_track_id_fkey "
+        "DEFERRABLE INITIALLY IMMEDIATE"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE track_points ALTER CONSTRAINT track_points_track_id_fkey NOT DEFERRABLE")
+    op.execute("ALTER TABLE track_points ALTER COLUMN created_at SET DEFAULT NOW()")
@@ -0,0 +1,49 @@
+"""
+Columnar mirror of track_points for analytics scans (citus_columnar)
+
+Revision ID: 019_track_points_columnar
+Revises: 018_track_points_copy_ingest
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '019_track_points_columnar'
+down_revision = '018_track_points_copy_ingest'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create track_points_columnar USING columnar when the extension exists.
+    Without it (e.g. hosted Postgres) the analytics read path keeps using
+    the row-store track_points table.
+    """
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'citus_columnar') THEN
+                CREATE EXTENSION IF NOT EXISTS citus_columnar;
+                CREATE TABLE track_points_columnar (
+                    track_id UUID NOT NULL,
+                    frame_number INTEGER NOT NULL,
+                    timestamp DOUBLE PRECISION NOT NULL,
+                    x_px REAL NOT NULL,
+                    y_px REAL NOT NULL,
+                    x_m REAL,
+                    y_m REAL
+                ) USING columnar;
+                INSERT INTO track_points_columnar
+                SELECT track_id, frame_number, timestamp, x_px, y_px, x_m, y_m
+                FROM track_points
+                ORDER BY track_id, timestamp;
+            ELSE
+                RAISE NOTICE 'citus_columnar not available, skipping track_points_columnar';
+            END IF;
+        END $$
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS track_points_columnar")
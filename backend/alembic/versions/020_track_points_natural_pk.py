@@ -0,0 +1,76 @@
+"""
+Use (track_id, frame_number) as the track_points primary key, drop id
+
+Revision ID: 020_track_points_natural_pk
+Revises: 019_track_points_columnar
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '020_track_points_natural_pk'
+down_revision = '019_track_points_columnar'
+branch_labels = None
+depends_on = None
+
+# Payload carried by the PK index so per-track reads stay index-only
+# (previously on idx_trackpoint_track_frame, see 009_covering_indexes)
+PK_INCLUDE = "x_m, y_m, confidence, timestamp"
+
+
+def upgrade() -> None:
+    """The natural key replaces the surrogate id and idx_trackpoint_track_frame"""
+
+    # track_point_keypoints referenced (id, track_id): re-key it on frame_number
+    op.execute("ALTER TABLE track_point_keypoints ADD COLUMN frame_number INTEGER")
+    op.execute("""
+        UPDATE track_point_keypoints kp
+        SET frame_number = tp.frame_number
+        FROM track_points tp
+        WHERE tp.id = kp.track_point_id AND tp.track_id = kp.track_id
+    """)
+    op.execute("ALTER TABLE track_point_keypoints DROP CONSTRAINT track_point_keypoints_track_point_id_track_id_fkey")
+    op.execute("ALTER TABLE track_point_keypoints DROP CONSTRAINT track_point_keypoints_pkey")
+    op.execute("ALTER TABLE track_point_keypoints DROP COLUMN track_point_id")
+    op.execute("ALTER TABLE track_point_keypoints ALTER COLUMN frame_number SET NOT NULL")
+    op.execute("ALTER TABLE track_point_keypoints ADD PRIMARY KEY (track_id, frame_number, kp_index)")
+
+    op.execute("ALTER TABLE track_points DROP CONSTRAINT track_points_pkey")
+    op.execute("ALTER TABLE track_points DROP COLUMN id")
+    op.execute(f"ALTER TABLE track_points ADD PRIMARY KEY (track_id, frame_number) INCLUDE ({PK_INCLUDE})")
+    op.execute("DROP INDEX idx_trackpoint_track_frame")
+
+    op.execute("""
+        ALTER TABLE track_point_keypoints
+        ADD FOREIGN KEY (track_id, frame_number)
+            REFERENCES track_points (track_id, frame_number) ON DELETE CASCADE
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE track_point_keypoints DROP CONSTRAINT track_point_keypoints_track_id_frame_number_fkey")
+
+    op.execute(f"CREATE INDEX idx_trackpoint_track_frame ON track_points (track_id, frame_number) INCLUDE ({PK_INCLUDE})")
+    op.execute("ALTER TABLE track_points DROP CONSTRAINT track_points_pkey")
+    # As in 005: no identity column on a partitioned table before PostgreSQL 17
+    op.execute("CREATE SEQUENCE track_points_id_seq AS BIGINT")
+    op.execute("ALTER TABLE track_points ADD COLUMN id BIGINT NOT NULL DEFAULT nextval('track_points_id_seq')")
+    op.execute("ALTER SEQUENCE track_points_id_seq OWNED BY track_points.id")
+    op.execute("ALTER TABLE track_points ADD PRIMARY KEY (id, track_id)")
+
+    op.execute("ALTER TABLE track_point_keypoints ADD COLUMN track_point_id BIGINT")
+    op.execute("""
+        UPDATE track_point_keypoints kp
+        SET track_point_id = tp.id
+        FROM track_points tp
+        WHERE tp.track_id = kp.track_id AND tp.frame_number = kp.frame_number
+    """)
+    op.execute("ALTER TABLE track_point_keypoints DROP CONSTRAINT track_point_keypoints_pkey")
+    op.execute("ALTER TABLE track_point_keypoints DROP COLUMN frame_number")
+    op.execute("ALTER TABLE track_point_keypoints ALTER COLUMN track_point_id SET NOT NULL")
+    op.execute("ALTER TABLE track_point_keypoints ADD PRIMARY KEY (track_point_id, kp_index)")
+    op.execute("""
+        ALTER TABLE track_point_keypoints
+        ADD FOREIGN KEY (track_point_id, track_id)
+            REFERENCES track_points (id, track_id) ON DELETE CASCADE
+    """)
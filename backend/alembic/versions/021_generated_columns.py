@@ -0,0 +1,42 @@
+"""
+Generated STORED columns for derived quantities
+
+Revision ID: 021_generated_columns
+Revises: 020_track_points_natural_pk
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '021_generated_columns'
+down_revision = '020_track_points_natural_pk'
+branch_labels = None
+depends_on = None
+
+EVENT_VELOCITY = "CASE WHEN duration > 0 THEN distance / duration ELSE 0 END"
+
+
+def upgrade() -> None:
+    # events.distance stays a plain column: for carries it is the path
+    # length, not the start->end distance. velocity is always distance / duration.
+    op.execute("ALTER TABLE events DROP COLUMN velocity")
+    op.execute(
+        f"ALTER TABLE events ADD COLUMN velocity FLOAT NOT NULL "
+        f"GENERATED ALWAYS AS ({EVENT_VELOCITY}) STORED"
+    )
+
+    op.execute("""
+        ALTER TABLE track_points
+            ADD COLUMN bbox_w SMALLINT GENERATED ALWAYS AS (bbox_x2 - bbox_x1) STORED,
+            ADD COLUMN bbox_h SMALLINT GENERATED ALWAYS AS (bbox_y2 - bbox_y1) STORED
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE track_points DROP COLUMN bbox_h, DROP COLUMN bbox_w")
+
+    op.execute("ALTER TABLE events ADD COLUMN velocity_value FLOAT")
+    op.execute("UPDATE events SET velocity_value = velocity")
+    op.execute("ALTER TABLE events DROP COLUMN velocity")
+    op.execute("ALTER TABLE events RENAME COLUMN velocity_value TO velocity")
+    op.execute("ALTER TABLE events ALTER COLUMN velocity SET NOT NULL")
@@ -0,0 +1,139 @@
+"""
+Partition track_points by LIST (video_id): one partition per video
+
+Revision ID: 022_partition_points_by_video
+Revises: 021_generated_columns
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '022_partition_points_by_video'
+down_revision = '021_generated_columns'
+branch_labels = None
+depends_on = None
+
+# Partition count from 004_partition_track_points (for downgrade)
+TRACK_POINT_PARTITIONS = 16
+
+# Same payload as the 020 primary key
+PK_INCLUDE = "x_m, y_m, confidence, timestamp"
+
+# The FK is named explicitly: the old table's partitions still hold the
+# default name, and app.db.bulk defers it by name
+TRACK_POINTS_COLUMNS = """
+    video_id UUID NOT NULL,
+    track_id UUID NOT NULL
+        CONSTRAINT track_points_track_id_fkey REFERENCES tracks(id) ON DELETE CASCADE DEFERRABLE INITIALLY IMMEDIATE,
+    frame_number INTEGER NOT NULL,
+    timestamp DOUBLE PRECISION NOT NULL,
+    bbox_x1 SMALLINT NOT NULL,
+    bbox_y1 SMALLINT NOT NULL,
+    bbox_x2 SMALLINT NOT NULL,
+    bbox_y2 SMALLINT NOT NULL,
+    bbox_w SMALLINT GENERATED ALWAYS AS (bbox_x2 - bbox_x1) STORED,
+    bbox_h SMALLINT GENERATED ALWAYS AS (bbox_y2 - bbox_y1) STORED,
+    confidence REAL NOT NULL,
+    x_px REAL NOT NULL,
+    y_px REAL NOT NULL,
+    x_m REAL,
+    y_m REAL,
+    created_at TIMESTAMPTZ NOT NULL
+"""
+
+COPY_COLUMNS = (
+    "track_id, frame_number, timestamp, bbox_x1, bbox_y1, bbox_x2, bbox_y2, "
+    "confidence, x_px, y_px, x_m, y_m, created_at"
+)
+
+
+def upgrade() -> None:
+    """
+    Deleting a video drops its partition instead of cascading row by row
+    (see app.db.bulk.drop_track_points_partition). The tracks FK stays as a
+    safety net. player_metric_timeseries and events are orders of magnitude
+    smaller and keep their ON DELETE CASCADE.
+    """
+    op.execute("ALTER TABLE track_point_keypoints DROP CONSTRAINT track_point_keypoints_track_id_frame_number_fkey")
+    op.execute("ALTER TABLE track_points RENAME TO track_points_hashed")
+    op.execute("ALTER TABLE track_points_hashed RENAME CONSTRAINT track_points_pkey TO track_points_hashed_pkey")
+    op.execute("ALTER INDEX idx_trackpoint_frame_brin RENAME TO idx_trackpoint_frame_brin_hashed")
+
+    # Partition key must be part of the PK; track_id stays leading so the
+    # tracks FK cascade and per-track reads still use it
+    op.execute(f"""
+        CREATE TABLE track_points (
+            {TRACK_POINTS_COLUMNS},
+            PRIMARY KEY (track_id, frame_number, video_id) INCLUDE ({PK_INCLUDE})
+        ) PARTITION BY LIST (video_id)
+    """)
+    op.execute(
+        "CREATE INDEX idx_trackpoint_frame_brin ON track_points "
+        "USING BRIN (frame_number) WITH (pages_per_range = 64)"
+    )
+
+    # Same naming as app.db.bulk.track_points_partition
+    op.execute("""
+        DO $$
+        DECLARE
+            v UUID;
+        BEGIN
+            FOR v IN SELECT DISTINCT t.video_id FROM tracks t JOIN track_points_hashed tp ON tp.track_id = t.id LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF track_points FOR VALUES IN (%L) WITH (fillfactor = 100)',
+                    'track_points_v_' || replace(v::text, '-', ''), v
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"""
+        INSERT INTO track_points (video_id, {COPY_COLUMNS})
+        SELECT t.video_id, {', '.join('tp.' + c.strip() for c in COPY_COLUMNS.split(','))}
+        FROM track_points_hashed tp
+        JOIN tracks t ON t.id = tp.track_id
+    """)
+    op.execute("DROP TABLE track_points_hashed")
+
+    # Keypoints follow their point's partition key
+    op.execute("ALTER TABLE track_point_keypoints ADD COLUMN video_id UUID")
+    op.execute("UPDATE track_point_keypoints kp SET video_id = t.video_id FROM tracks t WHERE t.id = kp.track_id")
+    op.execute("ALTER TABLE track_point_keypoints ALTER COLUMN video_id SET NOT NULL")
+    op.execute("""
+        ALTER TABLE track_point_keypoints
+        ADD FOREIGN KEY (track_id, frame_number, video_id)
+            REFERENCES track_points (track_id, frame_number, video_id) ON DELETE CASCADE
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE track_point_keypoints DROP CONSTRAINT track_point_keypoints_track_id_frame_number_video_id_fkey")
+    op.execute("ALTER TABLE track_point_keypoints DROP COLUMN video_id")
+
+    op.execute("ALTER TABLE track_points RENAME TO track_points_by_video")
+    op.execute("ALTER TABLE track_points_by_video RENAME CONSTRAINT track_points_pkey TO track_points_by_video_pkey")
+    op.execute("ALTER INDEX idx_trackpoint_frame_brin RENAME TO idx_trackpoint_frame_brin_by_video")
+
+    columns = TRACK_POINTS_COLUMNS.replace("    video_id UUID NOT NULL,\n", "", 1)
+    op.execute(f"""
+        CREATE TABLE track_points (
+            {columns},
+            PRIMARY KEY (track_id, frame_number) INCLUDE ({PK_INCLUDE})
+        ) PARTITION BY HASH (track_id)
+    """)
+    for i in range(TRACK_POINT_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE track_points_p{i} PARTITION OF track_points "
+            f"FOR VALUES WITH (MODULUS {TRACK_POINT_PARTITIONS}, REMAINDER {i}) WITH (fillfactor = 100)"
+        )
+    op.execute(
+        "CREATE INDEX idx_trackpoint_frame_brin ON track_points "
+        "USING BRIN (frame_number) WITH (pages_per_range = 64)"
+    )
+    op.execute(f"INSERT INTO track_points ({COPY_COLUMNS}) SELECT {COPY_COLUMNS} FROM track_points_by_video")
+    op.execute("DROP TABLE track_points_by_video")
+
+    op.execute("""
+        ALTER TABLE track_point_keypoints
+        ADD FOREIGN KEY (track_id, frame_number)
+            REFERENCES track_points (track_id, frame_number) ON DELETE CASCADE
+    """)
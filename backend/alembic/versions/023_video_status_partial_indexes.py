@@ -0,0 +1,31 @@
+"""
+Replace idx_video_status with partial indexes on the rare statuses
+
+Revision ID: 023_video_status_partial_indexes
+Revises: 022_partition_points_by_video
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '023_video_status_partial_indexes'
+down_revision = '022_partition_points_by_video'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Almost every video ends up 'completed': only index the others"""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY idx_video_pending ON videos (created_at) "
+            "WHERE status IN ('pending', 'processing')"
+        )
+        op.execute("CREATE INDEX CONCURRENTLY idx_video_failed ON videos (created_at) WHERE status = 'failed'")
+        op.execute("DROP INDEX CONCURRENTLY idx_video_status")
+
+
+def downgrade() -> None:
+    op.create_index('idx_video_status', 'videos', ['status'])
+    op.drop_index('idx_video_failed', table_name='videos')
+    op.drop_index('idx_video_pending', table_name='videos')
@@ -0,0 +1,64 @@
+"""
+Store player metric time series as one array row per player, match and metric
+
+Revision ID: 024_player_metric_series
+Revises: 023_video_status_partial_indexes
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '024_player_metric_series'
+down_revision = '023_video_status_partial_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create player_metric_series and backfill it from player_metric_timeseries"""
+    op.create_table(
+        'player_metric_series',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=True), primary_key=True),
+        sa.Column('player_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('match_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('matches.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('video_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('videos.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('metric_type', sa.SmallInteger(), nullable=False),
+        sa.Column('unit', sa.String(50), nullable=True),
+        sa.Column('timestamps', postgresql.ARRAY(postgresql.DOUBLE_PRECISION()), nullable=False),
+        sa.Column('values', postgresql.ARRAY(postgresql.DOUBLE_PRECISION()), nullable=False),
+        sa.Column('start_ts', sa.Float(), nullable=False),
+        sa.Column('sample_rate', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.CheckConstraint('metric_type BETWEEN 1 AND 4', name='ck_player_metric_series_metric_type'),
+    )
+    op.create_index(
+        'idx_metric_series_player_match_type', 'player_metric_series',
+        ['player_id', 'match_id', 'metric_type']
+    )
+    op.create_index('idx_metric_series_match', 'player_metric_series', ['match_id'])
+    op.create_index('idx_metric_series_video', 'player_metric_series', ['video_id'])
+
+    # One array row per existing series; the old table stays for reads of
+    # data that has not been recomputed
+    op.execute("""
+        INSERT INTO player_metric_series
+            (player_id, match_id, video_id, metric_type, unit, timestamps, "values", start_ts, sample_rate)
+        SELECT
+            player_id, match_id, video_id, metric_type, max(unit),
+            array_agg(timestamp ORDER BY timestamp, id),
+            array_agg(value ORDER BY timestamp, id),
+            min(timestamp),
+            CASE WHEN max(timestamp) > min(timestamp)
+                 THEN (count(*) - 1) / (max(timestamp) - min(timestamp)) END
+        FROM player_metric_timeseries
+        GROUP BY player_id, match_id, video_id, metric_type
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_metric_series_video', table_name='player_metric_series')
+    op.drop_index('idx_metric_series_match', table_name='player_metric_series')
+    op.drop_index('idx_metric_series_player_match_type', table_name='player_metric_series')
+    op.drop_table('player_metric_series')
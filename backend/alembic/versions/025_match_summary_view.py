@@ -0,0 +1,49 @@
+"""
+Add mv_match_summary: player_metrics pivoted to one row per match and player
+
+Revision ID: 025_match_summary_view
+Revises: 024_player_metric_series
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '025_match_summary_view'
+down_revision = '024_player_metric_series'
+branch_labels = None
+depends_on = None
+
+# Metrics pivoted into columns: the per-match physical metrics stored in
+# player_metrics.metric_name at this revision, one column each
+SUMMARY_METRICS = (
+    'total_distance',
+    'top_speed',
+    'avg_speed',
+    'high_intensity_distance',
+    'sprint_count',
+    'max_acceleration',
+    'max_deceleration',
+    'stamina_index',
+)
+
+
+def upgrade() -> None:
+    columns = ",\n            ".join(
+        f"MAX(CASE WHEN metric_name = '{metric}' THEN numeric_value END) AS {metric}"
+        for metric in SUMMARY_METRICS
+    )
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW mv_match_summary AS
+        SELECT
+            match_id,
+            player_id,
+            {columns}
+        FROM player_metrics
+        GROUP BY match_id, player_id
+    """)
+    # Required by REFRESH ... CONCURRENTLY, and the lookup key of every read
+    op.execute("CREATE UNIQUE INDEX idx_mv_match_summary_match_player ON mv_match_summary (match_id, player_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW mv_match_summary")
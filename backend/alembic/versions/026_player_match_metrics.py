@@ -0,0 +1,136 @@
+"""
+Replace the per-metric player_metrics rows with one wide row per player and match
+
+Revision ID: 026_player_match_metrics
+Revises: 025_match_summary_view
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '026_player_match_metrics'
+down_revision = '025_match_summary_view'
+branch_labels = None
+depends_on = None
+
+# (column = player_metrics.metric_name, unit); sprint_count is stored as INTEGER
+SCALAR_METRICS = [
+    ('total_distance', 'm'),
+    ('top_speed', 'm/s'),
+    ('avg_speed', 'm/s'),
+    ('high_intensity_distance', 'm'),
+    ('sprint_count', 'count'),
+    ('max_acceleration', 'm/s²'),
+    ('max_deceleration', 'm/s²'),
+    ('stamina_index', 'index'),
+]
+
+METRIC_NAMES = [
+    'total_distance', 'top_speed', 'avg_speed', 'high_intensity_distance', 'sprint_count',
+    'max_acceleration', 'max_deceleration', 'stamina_index', 'avg_heart_rate', 'distance_per_minute',
+]
+
+
+def _pivot(metric_name: str) -> str:
+    return f"MAX(CASE WHEN metric_name = '{metric_name}' THEN numeric_value END)"
+
+
+def upgrade() -> None:
+    op.create_table(
+        'player_match_metrics',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('player_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('match_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('matches.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('video_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('videos.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('total_distance', sa.Float(), nullable=False),
+        sa.Column('top_speed', sa.Float(), nullable=False),
+        sa.Column('avg_speed', sa.Float(), nullable=False),
+        sa.Column('high_intensity_distance', sa.Float(), nullable=False),
+        sa.Column('sprint_count', sa.Integer(), nullable=False),
+        sa.Column('max_acceleration', sa.Float(), nullable=False),
+        sa.Column('max_deceleration', sa.Float(), nullable=False),
+        sa.Column('stamina_index', sa.Float(), nullable=False),
+        sa.Column('distance_per_minute', postgresql.JSONB(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.UniqueConstraint('player_id', 'match_id', name='uq_player_match_metrics_player_match'),
+    )
+    op.create_index('idx_player_match_metrics_match', 'player_match_metrics', ['match_id'])
+    op.execute(
+        "CREATE TRIGGER trg_player_match_metrics_updated_at BEFORE UPDATE ON player_match_metrics "
+        "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+    )
+
+    # Pivot existing rows (missing metrics default to 0, as the API did)
+    columns = ", ".join(column for column, _ in SCALAR_METRICS)
+    values = ",\n            ".join(
+        f"COALESCE({_pivot(column)}, 0)" + ("::INTEGER" if column == 'sprint_count' else "")
+        for column, _ in SCALAR_METRICS
+    )
+    op.execute(f"""
+        INSERT INTO player_match_metrics (player_id, match_id, video_id, {columns}, created_at)
+        SELECT
+            player_id, match_id, (array_agg(video_id))[1],
+            {values},
+            MIN(created_at)
+        FROM player_metrics
+        GROUP BY player_id, match_id
+    """)
+
+    # The pivot view over player_metrics (025) is superseded by the wide table
+    op.execute("DROP MATERIALIZED VIEW mv_match_summary")
+    op.drop_table('player_metrics')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'player_metrics',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('player_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('match_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('matches.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('video_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('videos.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('metric_name', sa.String(32), nullable=False),
+        sa.Column('numeric_value', sa.Float(), nullable=False),
+        sa.Column('unit', sa.String(50), nullable=True),
+        sa.Column('metadata', postgresql.JSONB(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.CheckConstraint(
+            "metric_name IN (" + ", ".join(f"'{name}'" for name in METRIC_NAMES) + ")",
+            name='ck_player_metrics_metric_name'
+        ),
+    )
+    op.create_index('idx_player_metric_player_match', 'player_metrics', ['player_id', 'match_id'])
+    op.create_index('idx_player_metric_match', 'player_metrics', ['match_id'])
+    op.create_index('idx_player_metric_video', 'player_metrics', ['video_id'])
+    op.create_index('idx_player_metric_type', 'player_metrics', ['metric_name'])
+    op.execute(
+        "CREATE TRIGGER trg_player_metrics_updated_at BEFORE UPDATE ON player_metrics "
+        "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+    )
+
+    # Unpivot: one row per scalar metric
+    for column, unit in SCALAR_METRICS:
+        op.execute(f"""
+            INSERT INTO player_metrics (player_id, match_id, video_id, metric_name, numeric_value, unit, created_at)
+            SELECT player_id, match_id, video_id, '{column}', {column}, '{unit}', created_at
+            FROM player_match_metrics
+        """)
+
+    pivot = ",\n            ".join(
+        f"{_pivot(column)} AS {column}" for column, _ in SCALAR_METRICS
+    )
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW mv_match_summary AS
+        SELECT
+            match_id,
+            player_id,
+            {pivot}
+        FROM player_metrics
+        GROUP BY match_id, player_id
+    """)
+    op.execute("CREATE UNIQUE INDEX idx_mv_match_summary_match_player ON mv_match_summary (match_id, player_id)")
+
+    op.drop_table('player_match_metrics')
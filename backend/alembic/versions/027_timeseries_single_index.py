@@ -0,0 +1,46 @@
+"""
+Collapse player_metric_timeseries indexes into one match-leading covering index
+
+Revision ID: 027_timeseries_single_index
+Revises: 026_player_match_metrics
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '027_timeseries_single_index'
+down_revision = '026_player_match_metrics'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    (match_id, player_id, metric_type, timestamp) INCLUDE (value, unit) serves
+    per-match chart reads index-only and the ON DELETE CASCADE lookup from
+    matches, so idx_timeseries_pm_type_ts, idx_timeseries_match_ts and the
+    timestamp BRIN go. idx_timeseries_video stays for the cascade from videos
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY idx_timeseries_covering
+            ON player_metric_timeseries (match_id, player_id, metric_type, timestamp)
+            INCLUDE (value, unit)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY idx_timeseries_pm_type_ts")
+        op.execute("DROP INDEX CONCURRENTLY idx_timeseries_match_ts")
+        op.execute("DROP INDEX CONCURRENTLY idx_timeseries_timestamp_brin")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX idx_timeseries_timestamp_brin ON player_metric_timeseries "
+        "USING BRIN (timestamp) WITH (pages_per_range = 64)"
+    )
+    op.create_index('idx_timeseries_match_ts', 'player_metric_timeseries', ['match_id', 'timestamp'])
+    op.create_index(
+        'idx_timeseries_pm_type_ts', 'player_metric_timeseries',
+        ['player_id', 'match_id', 'metric_type', 'timestamp'],
+        postgresql_include=['value', 'unit']
+    )
+    op.drop_index('idx_timeseries_covering', table_name='player_metric_timeseries')
@@ -0,0 +1,117 @@
+"""
+Partition player_metric_timeseries and events by HASH (match_id)
+
+Revision ID: 028_partition_by_match
+Revises: 027_timeseries_single_index
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '028_partition_by_match'
+down_revision = '027_timeseries_single_index'
+branch_labels = None
+depends_on = None
+
+# Number of hash partitions per table
+MATCH_PARTITIONS = 16
+
+# table -> (foreign keys, columns copied (velocity on events is generated), indexes)
+TABLES = {
+    'player_metric_timeseries': (
+        [
+            "FOREIGN KEY (match_id) REFERENCES matches(id) ON DELETE CASCADE",
+            "FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE",
+        ],
+        "id, player_id, match_id, video_id, timestamp, frame_number, metric_type, value, unit, created_at",
+        [
+            ('idx_timeseries_covering',
+             "(match_id, player_id, metric_type, timestamp) INCLUDE (value, unit)"),
+            ('idx_timeseries_video', "(video_id)"),
+        ],
+    ),
+    'events': (
+        [
+            "FOREIGN KEY (match_id) REFERENCES matches(id) ON DELETE CASCADE",
+        ],
+        "id, match_id, player_id, team_side, event_type, timestamp, frame_number, "
+        "start_x, start_y, end_x, end_y, distance, duration, xt_value, metadata, created_at",
+        [
+            ('idx_event_player', "(player_id)"),
+            ('idx_event_match_player_ts',
+             "(match_id, player_id, timestamp) INCLUDE (event_type, start_x, start_y, end_x, end_y, xt_value)"),
+            ('idx_event_type', "(event_type)"),
+            ('idx_event_metadata_gin', "USING GIN (metadata jsonb_path_ops)"),
+            ('idx_event_timestamp_brin', "USING BRIN (timestamp) WITH (pages_per_range = 64)"),
+        ],
+    ),
+}
+
+LIKE_OPTIONS = "INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING GENERATED INCLUDING CONSTRAINTS INCLUDING STORAGE"
+
+
+def _set_aside(table: str, suffix: str) -> str:
+    """Rename a table, its indexes and identity sequence out of the way"""
+    old = f"{table}_{suffix}"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq RENAME TO {old}_id_seq")
+    for name, _ in TABLES[table][2]:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_{suffix}")
+    return old
+
+
+def _fill(table: str, old: str) -> None:
+    """Copy rows over (keeping ids), recreate indexes and drop the old table"""
+    _, columns, indexes = TABLES[table]
+    for name, definition in indexes:
+        op.execute(f"CREATE INDEX {name} ON {table} {definition}")
+    op.execute(
+        f"INSERT INTO {table} ({columns}) OVERRIDING SYSTEM VALUE "
+        f"SELECT {columns} FROM {old}"
+    )
+    op.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+    )
+    op.execute(f"DROP TABLE {old}")
+
+
+def upgrade() -> None:
+    """
+    Every read filters on match_id: queries prune to one partition, each
+    partition's indexes are 1/16th of the size, and inserts for different
+    matches no longer contend on the same index pages
+    """
+    for table, (foreign_keys, _, _) in TABLES.items():
+        old = _set_aside(table, 'unpartitioned')
+
+        # Partition key must be part of the PK
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {old} {LIKE_OPTIONS},
+                PRIMARY KEY (id, match_id),
+                {', '.join(foreign_keys)}
+            ) PARTITION BY HASH (match_id)
+        """)
+        # Storage parameters cannot be set on a partitioned parent
+        for i in range(MATCH_PARTITIONS):
+            op.execute(
+                f"CREATE TABLE {table}_p{i} PARTITION OF {table} "
+                f"FOR VALUES WITH (MODULUS {MATCH_PARTITIONS}, REMAINDER {i}) WITH (fillfactor = 100)"
+            )
+
+        _fill(table, old)
+
+
+def downgrade() -> None:
+    for table, (foreign_keys, _, _) in TABLES.items():
+        old = _set_aside(table, 'partitioned')
+
+        op.execute(f"""
+            CREATE TABLE {table} (
+                LIKE {old} {LIKE_OPTIONS},
+                PRIMARY KEY (id),
+                {', '.join(foreign_keys)}
+            ) WITH (fillfactor = 100)
+        """)
+
+        _fill(table, old)
@@ -0,0 +1,46 @@
+"""
+Record the encoding of player_heatmaps.heatmap_data (float32 or quantized uint16)
+
+Revision ID: 029_heatmap_dtype
+Revises: 028_partition_by_match
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+import numpy as np
+
+# revision identifiers, used by Alembic.
+revision = '029_heatmap_dtype'
+down_revision = '028_partition_by_match'
+branch_labels = None
+depends_on = None
+
+# uint16 grids span 0..max_intensity (app.analytics.heatmap.encode_grid)
+UINT16_MAX = 65535
+
+
+def upgrade() -> None:
+    """Existing blobs are float32 (013); new ones may be uint16"""
+    op.add_column(
+        'player_heatmaps',
+        sa.Column('dtype', sa.String(16), nullable=False, server_default='float32')
+    )
+    op.create_check_constraint('ck_player_heatmaps_dtype', 'player_heatmaps', "dtype IN ('float32', 'uint16')")
+
+
+def downgrade() -> None:
+    """Re-encode uint16 grids as float32 before dropping the column"""
+    bind = op.get_bind()
+
+    rows = bind.execute(sa.text(
+        "SELECT id, heatmap_data, max_intensity FROM player_heatmaps WHERE dtype = 'uint16'"
+    )).fetchall()
+    for row_id, blob, max_intensity in rows:
+        grid = np.frombuffer(blob, dtype='<u2').astype(np.float64) * (max_intensity / UINT16_MAX)
+        bind.execute(
+            sa.text("UPDATE player_heatmaps SET heatmap_data = :blob, dtype = 'float32' WHERE id = :id"),
+            {"blob": grid.astype('<f4').tobytes(), "id": row_id}
+        )
+
+    op.drop_constraint('ck_player_heatmaps_dtype', 'player_heatmaps', type_='check')
+    op.drop_column('player_heatmaps', 'dtype')
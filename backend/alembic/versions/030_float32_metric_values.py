@@ -0,0 +1,41 @@
+"""
+Store physical metric values as REAL (float32)
+
+Revision ID: 030_float32_metric_values
+Revises: 029_heatmap_dtype
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '030_float32_metric_values'
+down_revision = '029_heatmap_dtype'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Samples come from REAL track_points columns; FLOAT8 only doubled the row size"""
+    op.alter_column(
+        'player_metric_timeseries', 'value',
+        type_=sa.REAL(), existing_type=sa.Float(), existing_nullable=False
+    )
+    op.alter_column(
+        'player_metric_series', 'values',
+        type_=postgresql.ARRAY(sa.REAL()), existing_type=postgresql.ARRAY(postgresql.DOUBLE_PRECISION()),
+        existing_nullable=False, postgresql_using='"values"::real[]'
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'player_metric_series', 'values',
+        type_=postgresql.ARRAY(postgresql.DOUBLE_PRECISION()), existing_type=postgresql.ARRAY(sa.REAL()),
+        existing_nullable=False, postgresql_using='"values"::float8[]'
+    )
+    op.alter_column(
+        'player_metric_timeseries', 'value',
+        type_=sa.Float(), existing_type=sa.REAL(), existing_nullable=False
+    )
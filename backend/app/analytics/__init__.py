@@ -1,70 +1,98 @@
 """
 Analytics module initialization - Phase 3
+
+Engines and models are imported lazily (PEP 562) so importing
+app.analytics does not pull in numpy / scipy / the ORM until a name is used.
 """
-from app.analytics.physical import (
-    PhysicalMetricsEngine,
-    TeamMetricsEngine,
-    PhysicalMetrics,
-    TrackPointData
-)
-from app.analytics.heatmap import (
-    HeatmapEngine,
-    ZoneAnalyzer,
-    Heatmap,
-    HeatmapConfig
-)
-from app.analytics.models import (
-    PlayerMetric,
-    PlayerMetricTimeSeries,
-    PlayerHeatmap,
-    TeamMetric,
-    MetricType,
-    TimeSeriesMetricType
-)
-from app.analytics.tactical import (
-    TacticalAnalysisEngine,
-    TeamTacticalSnapshot,
-    TransitionEvent,
-    compute_tactical_snapshots
-)
-from app.analytics.xt import (
-    ExpectedThreatEngine,
-    XTEvent,
-    PlayerXTSummary,
-    compute_match_xt
-)
-from app.analytics.events import (
-    EventDetectionEngine,
-    FootballEvent,
-    detect_match_events
-)
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = [
+# name -> submodule that defines it
+_LAZY = {
     # Phase 2
-    "PhysicalMetricsEngine",
-    "TeamMetricsEngine",
-    "PhysicalMetrics",
-    "TrackPointData",
-    "HeatmapEngine",
-    "ZoneAnalyzer",
-    "Heatmap",
-    "HeatmapConfig",
-    "PlayerMetric",
-    "PlayerMetricTimeSeries",
-    "PlayerHeatmap",
-    "TeamMetric",
-    "MetricType",
-    "TimeSeriesMetricType",
+    "PhysicalMetricsEngine": "app.analytics.physical",
+    "TeamMetricsEngine": "app.analytics.physical",
+    "PhysicalMetrics": "app.analytics.physical",
+    "TrackPointData": "app.analytics.physical",
+    "TrackArray": "app.analytics.physical",
+    "HeatmapEngine": "app.analytics.heatmap",
+    "ZoneAnalyzer": "app.analytics.heatmap",
+    "Heatmap": "app.analytics.heatmap",
+    "HeatmapConfig": "app.analytics.heatmap",
+    "PlayerMatchMetrics": "app.analytics.models",
+    "PlayerMetricTimeSeries": "app.analytics.models",
+    "PlayerMetricSeries": "app.analytics.models",
+    "PlayerHeatmap": "app.analytics.models",
+    "TeamMetric": "app.analytics.models",
+    "MetricType": "app.analytics.models",
+    "TimeSeriesMetricType": "app.analytics.models",
     # Phase 3
-    "TacticalAnalysisEngine",
-    "TeamTacticalSnapshot",
-    "TransitionEvent",
-    "compute_tactical_snapshots",
-    "ExpectedThreatEngine",
-    "XTEvent",
-    "PlayerXTSummary",
-    "compute_match_xt",
-    "EventDetectionEngine",
-    "FootballEvent",
-    "detect_match_events"
-]
+    "TacticalAnalysisEngine": "app.analytics.tactical",
+    "TeamTacticalSnapshot": "app.analytics.tactical",
+    "TransitionEvent": "app.analytics.tactical",
+    "compute_tactical_snapshots": "app.analytics.tactical",
+    "ExpectedThreatEngine": "app.analytics.xt",
+    "XTEvent": "app.analytics.xt",
+    "PlayerXTSummary": "app.analytics.xt",
+    "compute_match_xt": "app.analytics.xt",
+    "EventDetectionEngine": "app.analytics.events",
+    "FootballEvent": "app.analytics.events",
+    "detect_match_events": "app.analytics.events",
+}
+
+__all__ = tuple(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(__all__))
+
+
+if TYPE_CHECKING:
+    from app.analytics.physical import (
+        PhysicalMetricsEngine,
+        TeamMetricsEngine,
+        PhysicalMetrics,
+        TrackPointData,
+        TrackArray
+    )
+    from app.analytics.heatmap import (
+        HeatmapEngine,
+        ZoneAnalyzer,
+        Heatmap,
+        HeatmapConfig
+    )
+    from app.analytics.models import (
+        PlayerMatchMetrics,
+        PlayerMetricTimeSeries,
+        PlayerMetricSeries,
+        PlayerHeatmap,
+        TeamMetric,
+        MetricType,
+        TimeSeriesMetricType
+    )
+    from app.analytics.tactical import (
+        TacticalAnalysisEngine,
+        TeamTacticalSnapshot,
+        TransitionEvent,
+        compute_tactical_snapshots
+    )
+    from app.analytics.xt import (
+        ExpectedThreatEngine,
+        XTEvent,
+        PlayerXTSummary,
+        compute_match_xt
+    )
+    from app.analytics.events import (
+        EventDetectionEngine,
+        FootballEvent,
+        detect_match_events
+    )
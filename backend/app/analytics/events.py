@@ -4,17 +4,231 @@ Event Detection Engine for Nashama Vision Phase 3
 Detects and classifies football events: passes, carries, shots
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import List, Dict, Optional
 from datetime import datetime
+import math
+import os
 import uuid
+from math import hypot
 import numpy as np
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.models import Track, TrackPoint
+from app.analytics.jit import njit, prange, as_kernel_input
 
 
-@dataclass
+# Shot geometry (pitch in meters, attacking toward x = PITCH_LENGTH)
+PITCH_LENGTH = 105.0
+PITCH_WIDTH = 68.0
+SHOT_MIN_X = PITCH_LENGTH * 2 / 3  # attacking third
+SHOT_GOAL_X = PITCH_LENGTH
+SHOT_GOAL_Y = PITCH_WIDTH / 2
+
+
+def _event_ids(count: int) -> List[str]:
+    """
+    Random (version 4) UUID strings for a batch of events
+    
+    Reads the entropy for the whole batch with one os.urandom call instead of
+    one per uuid.uuid4()
+    """
+    entropy = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=entropy[k:k + 16], version=4))
+        for k in range(0, 16 * count, 16)
+    ]
+
+
+def _frame(value) -> Optional[int]:
+    """Frame number from the int64 frames array (-1 marks a missing frame)"""
+    value = int(value)
+    return None if value < 0 else value
+
+
+# ============================================================================
+# Detection kernel
+# One forward scan over x/y/timestamp detecting passes, carries and shots,
+# compiled by numba when available. It returns indices (and accumulated
+# values) only; FootballEvent objects are built by the engine afterwards.
+# ============================================================================
+
+EVENT_PASS = 0
+EVENT_CARRY = 1
+EVENT_SHOT = 2
+
+PASS_WINDOW = 20  # look-ahead: next 19 points
+SHOT_WINDOW = 10  # look-ahead: next 9 points
+
+# Thresholds, squared where the kernel compares squared distances
+PASS_MIN_DIST_SQ = 5.0 ** 2  # distance > 5m
+PASS_MAX_DURATION = 2.0  # duration < 2s
+PASS_MIN_SPEED_SQ = 12.0 ** 2  # velocity > 12 m/s
+CARRY_MIN_SPEED = 3.0  # segment velocity in (3, 12) m/s
+CARRY_MAX_SPEED = 12.0
+CARRY_MIN_DIST = 3.0  # total distance > 3m
+SHOT_MIN_DIST_SQ = 3.0 ** 2  # distance > 3m
+SHOT_MIN_SPEED_SQ = 18.0 ** 2  # velocity > 18 m/s
+SHOT_MIN_COS_SQ = 0.7 ** 2  # cosine to goal > 0.7
+
+
+@njit(cache=True, fastmath=True)
+def _detect_events_kernel(xs, ys, ts):
+    """
+    Detect all event types in a single pass
+    
+    Each detector keeps its own cursor (the next start index it considers),
+    so results are the same as running them one after the other:
+    - pass: first point in the next 19 with distance > 5m, 0 < dt < 2s, v > 12 m/s
+    - carry: run of segments at 3-12 m/s covering more than 3m
+    - shot: from the attacking third, first point in the next 9 at > 18 m/s
+      pointing at goal (cosine > 0.7)
+    
+    Returns:
+        (codes, starts, ends, values_a, values_b); values are carry distance
+        and duration for carries (unused for other events)
+    """
+    n = len(xs)
+    capacity = 3 * n
+    codes = np.empty(capacity, dtype=np.int64)
+    starts = np.empty(capacity, dtype=np.int64)
+    ends = np.empty(capacity, dtype=np.int64)
+    values_a = np.zeros(capacity, dtype=np.float64)
+    values_b = np.zeros(capacity, dtype=np.float64)
+    count = 0
+    
+    next_pass = 0
+    next_carry = 0
+    next_shot = 0
+    
+    for i in range(n - 1):
+        x0 = xs[i]
+        y0 = ys[i]
+        t0 = ts[i]
+        
+        # Passes and shots share the look-ahead window: each offset's
+        # distance and duration is computed once for both
+        pass_open = i == next_pass
+        shot_open = i == next_shot and x0 > SHOT_MIN_X
+        if pass_open:
+            next_pass = i + 1
+        if i == next_shot:
+            next_shot = i + 1
+        
+        if pass_open or shot_open:
+            to_goal_x = SHOT_GOAL_X - x0
+            to_goal_y = SHOT_GOAL_Y - y0
+            mag_goal_sq = to_goal_x * to_goal_x + to_goal_y * to_goal_y
+            
+            # Thresholds are compared in squared form: no square roots in the window
+            for j in range(i + 1, min(i + PASS_WINDOW, n)):
+                if not pass_open and (not shot_open or j >= i + SHOT_WINDOW):
+                    break
+                move_x = xs[j] - x0
+                move_y = ys[j] - y0
+                distance_sq = move_x * move_x + move_y * move_y
+                duration = ts[j] - t0
+                if duration <= 0:
+                    continue
+                
+                if (pass_open and distance_sq > PASS_MIN_DIST_SQ and duration < PASS_MAX_DURATION
+                        and distance_sq > PASS_MIN_SPEED_SQ * duration * duration):
+                    codes[count] = EVENT_PASS
+                    starts[count] = i
+                    ends[count] = j
+                    count += 1
+                    pass_open = False
+                    next_pass = j + 1
+                
+                # dot > 0 keeps the sign that squaring the cosine would lose
+                if shot_open and j < i + SHOT_WINDOW and distance_sq > SHOT_MIN_DIST_SQ:
+                    dot = move_x * to_goal_x + move_y * to_goal_y
+                    if (distance_sq > SHOT_MIN_SPEED_SQ * duration * duration and dot > 0
+                            and dot * dot > SHOT_MIN_COS_SQ * distance_sq * mag_goal_sq):
+                        codes[count] = EVENT_SHOT
+                        starts[count] = i
+                        ends[count] = j
+                        count += 1
+                        shot_open = False
+                        next_shot = j + 1
+        
+        if i == next_carry:
+            carry_distance = 0.0
+            carry_duration = 0.0
+            last = i
+            
+            j = i + 1
+            while j < n:
+                segment_dist = math.sqrt((xs[j] - xs[last]) ** 2 + (ys[j] - ys[last]) ** 2)
+                segment_time = ts[j] - ts[last]
+                if segment_time > 0:
+                    segment_velocity = segment_dist / segment_time
+                    # Continue carry if velocity is moderate
+                    if CARRY_MIN_SPEED < segment_velocity < CARRY_MAX_SPEED:
+                        carry_distance += segment_dist
+                        carry_duration += segment_time
+                        last = j
+                        j += 1
+                    else:
+                        break
+                else:
+                    j += 1
+            
+            if carry_distance > CARRY_MIN_DIST and carry_duration > 0:
+                codes[count] = EVENT_CARRY
+                starts[count] = i
+                ends[count] = last
+                values_a[count] = carry_distance
+                values_b[count] = carry_duration
+                count += 1
+                next_carry = j
+            else:
+                next_carry = i + 1
+    
+    return codes[:count], starts[:count], ends[:count], values_a[:count], values_b[:count]
+
+
+@njit(cache=True, parallel=True)
+def _detect_tracks_kernel(xs, ys, ts, offsets):
+    """
+    Run _detect_events_kernel on many tracks in parallel
+    
+    Track k occupies [offsets[k], offsets[k + 1]) of the arrays. A track of
+    m points yields at most 3 * m events, so its results are written to its
+    own region starting at 3 * offsets[k] and threads never share slots.
+    
+    Returns:
+        (codes, starts, ends, values_a, values_b, counts); track k's events
+        are the first counts[k] entries of its region, with indices local to
+        the track
+    """
+    n_tracks = len(offsets) - 1
+    capacity = 3 * len(xs)
+    codes = np.empty(capacity, dtype=np.int64)
+    starts = np.empty(capacity, dtype=np.int64)
+    ends = np.empty(capacity, dtype=np.int64)
+    values_a = np.empty(capacity, dtype=np.float64)
+    values_b = np.empty(capacity, dtype=np.float64)
+    counts = np.zeros(n_tracks, dtype=np.int64)
+    
+    for k in prange(n_tracks):
+        lo = offsets[k]
+        hi = offsets[k + 1]
+        c, s, e, a, b = _detect_events_kernel(xs[lo:hi], ys[lo:hi], ts[lo:hi])
+        m = len(c)
+        base = 3 * lo
+        codes[base:base + m] = c
+        starts[base:base + m] = s
+        ends[base:base + m] = e
+        values_a[base:base + m] = a
+        values_b[base:base + m] = b
+        counts[k] = m
+    
+    return codes, starts, ends, values_a, values_b, counts
+
+
+@dataclass(slots=True)
 class FootballEvent:
     """Represents a detected football event"""
     id: str
@@ -39,9 +253,69 @@ class FootballEvent:
     
     metadata: Optional[Dict] = None
     
+    def get_metadata(self) -> Optional[Dict]:
+        """
+        Event-specific details
+        
+        Detectors leave metadata unset: the values are derived from the
+        event's fields on demand rather than stored as a dict per event.
+        """
+        if self.metadata is not None:
+            return self.metadata
+        
+        if self.event_type == "pass":
+            return {
+                "pass_length": self.distance,
+                "pass_velocity": self.velocity
+            }
+        
+        if self.event_type == "carry":
+            return {
+                "carry_distance": self.distance,
+                "avg_velocity": self.velocity
+            }
+        
+        if self.event_type == "shot":
+            to_goal_x = SHOT_GOAL_X - self.start_x
+            to_goal_y = SHOT_GOAL_Y - self.start_y
+            mag_goal = hypot(to_goal_x, to_goal_y)
+            if self.distance > 0 and mag_goal > 0:
+                toward_goal = (
+                    (self.end_x - self.start_x) * to_goal_x +
+                    (self.end_y - self.start_y) * to_goal_y
+                ) / (self.distance * mag_goal)
+            else:
+                toward_goal = 0.0
+            return {
+                "shot_velocity": self.velocity,
+                "toward_goal_score": toward_goal,
+                "distance_from_goal": mag_goal
+            }
+        
+        return None
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
-        return asdict(self)
+        # Explicit build: dataclasses.asdict deep-copies field by field
+        metadata = self.get_metadata()
+        return {
+            "id": self.id,
+            "match_id": self.match_id,
+            "player_id": self.player_id,
+            "team_side": self.team_side,
+            "event_type": self.event_type,
+            "timestamp": self.timestamp,
+            "frame_number": self.frame_number,
+            "start_x": self.start_x,
+            "start_y": self.start_y,
+            "end_x": self.end_x,
+            "end_y": self.end_y,
+            "distance": self.distance,
+            "duration": self.duration,
+            "velocity": self.velocity,
+            "xt_value": self.xt_value,
+            "metadata": dict(metadata) if metadata is not None else None,
+        }
 
 
 class EventDetectionEngine:
@@ -65,16 +339,62 @@ class EventDetectionEngine:
         Returns:
             List of FootballEvent objects
         """
-        tracks = self.db.query(Track).filter(
-            Track.match_id == match_id,
-            Track.team_side.isnot(None)
+        # One query for every point of the match instead of one per track
+        rows = self.db.execute(
+            select(
+                TrackPoint.track_id,
+                Track.team_side,
+                TrackPoint.x_m,
+                TrackPoint.y_m,
+                TrackPoint.timestamp,
+                TrackPoint.frame_number
+            )
+            .join(Track, Track.id == TrackPoint.track_id)
+            .where(
+                Track.match_id == match_id,
+                Track.team_side.isnot(None),
+                TrackPoint.x_m.isnot(None),
+                TrackPoint.y_m.isnot(None)
+            )
+            .order_by(TrackPoint.track_id, TrackPoint.timestamp)
         ).all()
         
         all_events = []
+        if not rows:
+            return all_events
+        
+        track_ids, team_sides, x_m, y_m, timestamps, frame_numbers = zip(*rows)
+        n = len(rows)
+        ids = np.array(track_ids, dtype=object)
+        xs = np.fromiter(x_m, dtype=np.float64, count=n)
+        ys = np.fromiter(y_m, dtype=np.float64, count=n)
+        ts = np.fromiter(timestamps, dtype=np.float64, count=n)
+        frames = np.fromiter(
+            (-1 if f is None else f for f in frame_numbers),
+            dtype=np.int64, count=n
+        )
         
-        for track in tracks:
-            player_events = self.detect_player_events(track.id, match_id)
-            all_events.extend(player_events)
+        # Rows are grouped by track: each track is a contiguous slice, and
+        # slicing gives views, not copies
+        _, starts = np.unique(ids, return_index=True)
+        starts.sort()
+        offsets = np.append(starts, n).astype(np.int64)
+        
+        # Tracks are independent: detect on all of them in one (parallel) call
+        codes, ev_starts, ev_ends, values_a, values_b, counts = _detect_tracks_kernel(
+            as_kernel_input(xs), as_kernel_input(ys), as_kernel_input(ts), offsets
+        )
+        
+        for k, count in enumerate(counts.tolist()):
+            if count == 0:
+                continue
+            lo, hi = int(offsets[k]), int(offsets[k + 1])
+            found = slice(3 * lo, 3 * lo + count)
+            all_events.extend(self._build_track_events(
+                codes[found], ev_starts[found], ev_ends[found], values_a[found], values_b[found],
+                xs[lo:hi], ys[lo:hi], ts[lo:hi], frames[lo:hi],
+                track_ids[lo], match_id, team_sides[lo]
+            ))
         
         # Sort by timestamp
         all_events.sort(key=lambda e: e.timestamp)
@@ -109,31 +429,92 @@ class EventDetectionEngine:
         if len(points) < 2:
             return []
         
+        # Structure-of-arrays view of the track, built once for all detectors
+        n = len(points)
+        xs = np.fromiter((p.x_m for p in points), dtype=np.float64, count=n)
+        ys = np.fromiter((p.y_m for p in points), dtype=np.float64, count=n)
+        ts = np.fromiter((p.timestamp for p in points), dtype=np.float64, count=n)
+        frames = np.fromiter(
+            (-1 if p.frame_number is None else p.frame_number for p in points),
+            dtype=np.int64, count=n
+        )
+        
+        return self._detect_track_events(xs, ys, ts, frames, player_id, match_id, track.team_side)
+    
+    def _detect_track_events(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ts: np.ndarray,
+        frames: np.ndarray,
+        player_id: str,
+        match_id: str,
+        team_side: str
+    ) -> List[FootballEvent]:
+        """Run all detectors on one track's timestamp-ordered arrays"""
+        codes, starts, ends, values_a, values_b = _detect_events_kernel(
+            as_kernel_input(xs), as_kernel_input(ys), as_kernel_input(ts)
+        )
+        return self._build_track_events(
+            codes, starts, ends, values_a, values_b,
+            xs, ys, ts, frames, player_id, match_id, team_side
+        )
+    
+    def _build_track_events(
+        self,
+        codes: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        values_a: np.ndarray,
+        values_b: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ts: np.ndarray,
+        frames: np.ndarray,
+        player_id: str,
+        match_id: str,
+        team_side: str
+    ) -> List[FootballEvent]:
+        """Turn one track's kernel output into FootballEvent objects"""
         events = []
+        is_pass = codes == EVENT_PASS
+        is_carry = codes == EVENT_CARRY
+        is_shot = codes == EVENT_SHOT
         
         # Pass detection
-        pass_events = self._detect_passes(points, player_id, match_id, track.team_side)
-        events.extend(pass_events)
+        events.extend(self._pass_events(
+            starts[is_pass], ends[is_pass],
+            xs, ys, ts, frames, player_id, match_id, team_side
+        ))
         
         # Carry detection
-        carry_events = self._detect_carries(points, player_id, match_id, track.team_side)
-        events.extend(carry_events)
+        events.extend(self._carry_events(
+            starts[is_carry], ends[is_carry], values_a[is_carry], values_b[is_carry],
+            xs, ys, ts, frames, player_id, match_id, team_side
+        ))
         
         # Shot detection
-        shot_events = self._detect_shots(points, player_id, match_id, track.team_side)
-        events.extend(shot_events)
+        events.extend(self._shot_events(
+            starts[is_shot], ends[is_shot],
+            xs, ys, ts, frames, player_id, match_id, team_side
+        ))
         
         return events
     
-    def _detect_passes(
+    def _pass_events(
         self,
-        points: List[TrackPoint],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ts: np.ndarray,
+        frames: np.ndarray,
         player_id: str,
         match_id: str,
         team_side: str
     ) -> List[FootballEvent]:
         """
-        Detect pass events
+        Build pass events from detected (start, end) indices
         
         Pass characteristics:
         - Rapid ball movement (high velocity)
@@ -141,63 +522,47 @@ class EventDetectionEngine:
         - Duration < 2 seconds
         """
         passes = []
-        
-        i = 0
-        while i < len(points) - 1:
-            current = points[i]
-            
-            # Look ahead for rapid movement
-            for j in range(i + 1, min(i + 20, len(points))):
-                next_point = points[j]
-                
-                distance = np.sqrt(
-                    (next_point.x_m - current.x_m) ** 2 +
-                    (next_point.y_m - current.y_m) ** 2
-                )
-                
-                duration = next_point.timestamp - current.timestamp
-                
-                if duration > 0 and distance > 5.0 and duration < 2.0:
-                    velocity = distance / duration
-                    
-                    if velocity > 12.0:  # High velocity threshold for pass
-                        event = FootballEvent(
-                            id=str(uuid.uuid4()),
-                            match_id=match_id,
-                            player_id=player_id,
-                            team_side=team_side,
-                            event_type="pass",
-                            timestamp=current.timestamp,
-                            frame_number=current.frame_number,
-                            start_x=current.x_m,
-                            start_y=current.y_m,
-                            end_x=next_point.x_m,
-                            end_y=next_point.y_m,
-                            distance=distance,
-                            duration=duration,
-                            velocity=velocity,
-                            metadata={
-                                "pass_length": distance,
-                                "pass_velocity": velocity
-                            }
-                        )
-                        passes.append(event)
-                        i = j
-                        break
+        ids = _event_ids(len(starts))
+        for event_id, i, j in zip(ids, starts.tolist(), ends.tolist()):
+            distance = hypot(float(xs[j] - xs[i]), float(ys[j] - ys[i]))
+            duration = float(ts[j] - ts[i])
+            velocity = distance / duration
             
-            i += 1
+            passes.append(FootballEvent(
+                id=event_id,
+                match_id=match_id,
+                player_id=player_id,
+                team_side=team_side,
+                event_type="pass",
+                timestamp=float(ts[i]),
+                frame_number=_frame(frames[i]),
+                start_x=float(xs[i]),
+                start_y=float(ys[i]),
+                end_x=float(xs[j]),
+                end_y=float(ys[j]),
+                distance=distance,
+                duration=duration,
+                velocity=velocity
+            ))
         
         return passes
     
-    def _detect_carries(
+    def _carry_events(
         self,
-        points: List[TrackPoint],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        distances: np.ndarray,
+        durations: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ts: np.ndarray,
+        frames: np.ndarray,
         player_id: str,
         match_id: str,
         team_side: str
     ) -> List[FootballEvent]:
         """
-        Detect carry/dribble events
+        Build carry/dribble events from detected runs
         
         Carry characteristics:
         - Continuous movement
@@ -205,80 +570,45 @@ class EventDetectionEngine:
         - Distance > 3m
         """
         carries = []
-        
-        i = 0
-        while i < len(points) - 1:
-            # Accumulate continuous movement
-            start_point = points[i]
-            carry_distance = 0.0
-            carry_duration = 0.0
-            last_point = start_point
-            
-            j = i + 1
-            while j < len(points):
-                current_point = points[j]
-                
-                segment_dist = np.sqrt(
-                    (current_point.x_m - last_point.x_m) ** 2 +
-                    (current_point.y_m - last_point.y_m) ** 2
-                )
-                
-                segment_time = current_point.timestamp - last_point.timestamp
-                
-                if segment_time > 0:
-                    segment_velocity = segment_dist / segment_time
-                    
-                    # Continue carry if velocity is moderate
-                    if 3.0 < segment_velocity < 12.0:
-                        carry_distance += segment_dist
-                        carry_duration += segment_time
-                        last_point = current_point
-                        j += 1
-                    else:
-                        break
-                else:
-                    j += 1
+        ids = _event_ids(len(starts))
+        for event_id, start, last, carry_distance, carry_duration in zip(
+            ids, starts.tolist(), ends.tolist(), distances.tolist(), durations.tolist()
+        ):
+            velocity = carry_distance / carry_duration
             
-            # Create carry event if meaningful
-            if carry_distance > 3.0 and carry_duration > 0:
-                velocity = carry_distance / carry_duration
-                
-                event = FootballEvent(
-                    id=str(uuid.uuid4()),
-                    match_id=match_id,
-                    player_id=player_id,
-                    team_side=team_side,
-                    event_type="carry",
-                    timestamp=start_point.timestamp,
-                    frame_number=start_point.frame_number,
-                    start_x=start_point.x_m,
-                    start_y=start_point.y_m,
-                    end_x=last_point.x_m,
-                    end_y=last_point.y_m,
-                    distance=carry_distance,
-                    duration=carry_duration,
-                    velocity=velocity,
-                    metadata={
-                        "carry_distance": carry_distance,
-                        "avg_velocity": velocity
-                    }
-                )
-                carries.append(event)
-                i = j
-            else:
-                i += 1
+            carries.append(FootballEvent(
+                id=event_id,
+                match_id=match_id,
+                player_id=player_id,
+                team_side=team_side,
+                event_type="carry",
+                timestamp=float(ts[start]),
+                frame_number=_frame(frames[start]),
+                start_x=float(xs[start]),
+                start_y=float(ys[start]),
+                end_x=float(xs[last]),
+                end_y=float(ys[last]),
+                distance=carry_distance,
+                duration=carry_duration,
+                velocity=velocity
+            ))
         
         return carries
     
-    def _detect_shots(
+    def _shot_events(
         self,
-        points: List[TrackPoint],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ts: np.ndarray,
+        frames: np.ndarray,
         player_id: str,
         match_id: str,
         team_side: str
     ) -> List[FootballEvent]:
         """
-        Detect shot events
+        Build shot events from detected (start, end) indices
         
         Shot characteristics:
         - Very high velocity (> 20 m/s)
@@ -286,78 +616,29 @@ class EventDetectionEngine:
         - In attacking third (x > 70m)
         """
         shots = []
-        
-        PITCH_LENGTH = 105.0
-        PITCH_WIDTH = 68.0
-        ATTACKING_THIRD = PITCH_LENGTH * 2 / 3
-        
-        goal_x = PITCH_LENGTH
-        goal_y = PITCH_WIDTH / 2
-        
-        i = 0
-        while i < len(points) - 1:
-            current = points[i]
-            
-            # Only consider if in attacking third
-            if current.x_m > ATTACKING_THIRD:
-                # Look for rapid movement toward goal
-                for j in range(i + 1, min(i + 10, len(points))):
-                    next_point = points[j]
-                    
-                    distance = np.sqrt(
-                        (next_point.x_m - current.x_m) ** 2 +
-                        (next_point.y_m - current.y_m) ** 2
-                    )
-                    
-                    duration = next_point.timestamp - current.timestamp
-                    
-                    if duration > 0 and distance > 3.0:
-                        velocity = distance / duration
-                        
-                        # Check if movement is toward goal
-                        move_x = next_point.x_m - current.x_m
-                        move_y = next_point.y_m - current.y_m
-                        
-                        to_goal_x = goal_x - current.x_m
-                        to_goal_y = goal_y - current.y_m
-                        
-                        dot = move_x * to_goal_x + move_y * to_goal_y
-                        mag_move = np.sqrt(move_x**2 + move_y**2)
-                        mag_goal = np.sqrt(to_goal_x**2 + to_goal_y**2)
-                        
-                        if mag_move > 0 and mag_goal > 0:
-                            toward_goal = dot / (mag_move * mag_goal)
-                        else:
-                            toward_goal = 0
-                        
-                        # High velocity toward goal = shot
-                        if velocity > 18.0 and toward_goal > 0.7:
-                            event = FootballEvent(
-                                id=str(uuid.uuid4()),
-                                match_id=match_id,
-                                player_id=player_id,
-                                team_side=team_side,
-                                event_type="shot",
-                                timestamp=current.timestamp,
-                                frame_number=current.frame_number,
-                                start_x=current.x_m,
-                                start_y=current.y_m,
-                                end_x=next_point.x_m,
-                                end_y=next_point.y_m,
-                                distance=distance,
-                                duration=duration,
-                                velocity=velocity,
-                                metadata={
-                                    "shot_velocity": velocity,
-                                    "toward_goal_score": toward_goal,
-                                    "distance_from_goal": mag_goal
-                                }
-                            )
-                            shots.append(event)
-                            i = j
-                            break
+        ids = _event_ids(len(starts))
+        for event_id, i, j in zip(ids, starts.tolist(), ends.tolist()):
+            x0, y0 = float(xs[i]), float(ys[i])
+            distance = hypot(float(xs[j]) - x0, float(ys[j]) - y0)
+            duration = float(ts[j] - ts[i])
+            velocity = distance / duration
             
-            i += 1
+            shots.append(FootballEvent(
+                id=event_id,
+                match_id=match_id,
+                player_id=player_id,
+                team_side=team_side,
+                event_type="shot",
+                timestamp=float(ts[i]),
+                frame_number=_frame(frames[i]),
+                start_x=x0,
+                start_y=y0,
+                end_x=float(xs[j]),
+                end_y=float(ys[j]),
+                distance=distance,
+                duration=duration,
+                velocity=velocity
+            ))
         
         return shots
     
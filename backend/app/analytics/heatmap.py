@@ -5,6 +5,7 @@ Creates 2D spatial heatmaps for player and team analysis
 import numpy as np
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,9 +33,15 @@ class Heatmap:
     max_intensity: float
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary for JSON serialization"""
+        """
+        Convert to dictionary for JSON serialization
+        
+        "data" stays a NumPy array; serialize with orjson
+        (OPT_SERIALIZE_NUMPY, as FastAPI's ORJSONResponse does) or use
+        to_bytes() for a compact binary payload.
+        """
         return {
-            "data": self.data.tolist(),
+            "data": self.data,
             "grid_width": self.grid_width,
             "grid_height": self.grid_height,
             "pitch_length": self.pitch_length,
@@ -43,11 +50,19 @@ class Heatmap:
             "max_intensity": float(self.max_intensity)
         }
     
+    def to_bytes(self, dtype: str = "float32") -> bytes:
+        """
+        Encode the grid for PlayerHeatmap.heatmap_data (see encode_grid)
+        
+        The shape is (grid_height, grid_width).
+        """
+        return encode_grid(self.data, dtype, self.max_intensity)
+    
     def to_normalized_dict(self) -> Dict:
         """Convert to dictionary with normalized intensities (0-1)"""
         normalized_data = self.data / self.max_intensity if self.max_intensity > 0 else self.data
         return {
-            "data": normalized_data.tolist(),
+            "data": normalized_data,
             "grid_width": self.grid_width,
             "grid_height": self.grid_height,
             "pitch_length": self.pitch_length,
@@ -57,6 +72,39 @@ class Heatmap:
         }
 
 
+# Stored grid encodings (PlayerHeatmap.dtype) -> little-endian NumPy dtype
+HEATMAP_DTYPES = {
+    "float32": "<f4",
+    "uint16": "<u2",  # quantized: 0..65535 spans 0..max_intensity
+}
+_UINT16_MAX = 65535
+
+
+def encode_grid(grid: np.ndarray, dtype: str, max_intensity: float) -> bytes:
+    """
+    Encode a grid as row-major bytes
+    
+    "float32" stores the values as is. "uint16" halves the size by storing
+    round(value / max_intensity * 65535); the error is below 1/131070 of
+    max_intensity, invisible on a rendered heatmap.
+    """
+    if dtype == "uint16":
+        scale = _UINT16_MAX / max_intensity if max_intensity > 0 else 0.0
+        quantized = np.rint(np.asarray(grid, dtype=np.float64) * scale)
+        return quantized.astype(HEATMAP_DTYPES[dtype]).tobytes()
+    return np.asarray(grid, dtype=HEATMAP_DTYPES[dtype]).tobytes()
+
+
+def decode_grid(
+    blob: bytes, dtype: str, grid_height: int, grid_width: int, max_intensity: float
+) -> np.ndarray:
+    """Decode encode_grid output into a (grid_height, grid_width) float32 array"""
+    grid = np.frombuffer(blob, dtype=HEATMAP_DTYPES[dtype]).reshape(grid_height, grid_width)
+    if dtype == "uint16":
+        return grid.astype(np.float32) * np.float32(max_intensity / _UINT16_MAX)
+    return grid
+
+
 class HeatmapEngine:
     """
     Generates spatial heatmaps from position data
@@ -75,7 +123,7 @@ class HeatmapEngine:
         Generate a 2D heatmap from position data
         
         Args:
-            positions: List of (x, y) coordinates in meters
+            positions: List of (x, y) coordinates in meters, or an (N, 2) array
             normalize: Whether to normalize intensities to 0-1 range
             apply_smoothing: Whether to apply Gaussian smoothing
             
@@ -86,24 +134,25 @@ class HeatmapEngine:
             logger.warning("No positions provided for heatmap generation")
             return None
         
-        # Initialize grid
-        grid = np.zeros((self.config.grid_height, self.config.grid_width))
+        pts = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        pitch_length = self.config.pitch_length
+        pitch_width = self.config.pitch_width
         
-        # Calculate bin sizes
-        bin_width = self.config.pitch_length / self.config.grid_width
-        bin_height = self.config.pitch_width / self.config.grid_height
+        # Clamp off-pitch positions into the edge bins (histogram2d would
+        # drop them). The last bin edge is inclusive, so clipping to the
+        # pitch boundary itself is enough
+        xs = np.clip(pts[:, 0], 0.0, pitch_length)
+        ys = np.clip(pts[:, 1], 0.0, pitch_width)
         
-        # Populate grid
-        for x, y in positions:
-            # Convert position to grid indices
-            col = int(x / bin_width)
-            row = int(y / bin_height)
-            
-            # Clamp to grid boundaries
-            col = max(0, min(col, self.config.grid_width - 1))
-            row = max(0, min(row, self.config.grid_height - 1))
-            
-            grid[row, col] += 1
+        # Explicit edges: every point is already inside them, so no range
+        # masking is needed
+        x_edges = np.linspace(0.0, pitch_length, self.config.grid_width + 1)
+        y_edges = np.linspace(0.0, pitch_width, self.config.grid_height + 1)
+        
+        # Rows are y bins, columns are x bins. Counts and densities are kept
+        # in float32: plenty for a heatmap and half the bytes to smooth
+        grid, _, _ = np.histogram2d(ys, xs, bins=[y_edges, x_edges])
+        grid = grid.astype(np.float32, copy=False)
         
         # Apply Gaussian smoothing if requested
         if apply_smoothing:
@@ -111,7 +160,7 @@ class HeatmapEngine:
         
         # Get statistics
         total_positions = len(positions)
-        max_intensity = np.max(grid)
+        max_intensity = float(np.max(grid))
         
         # Normalize if requested
         if normalize and max_intensity > 0:
@@ -170,18 +219,29 @@ class HeatmapEngine:
         if len(positions) == 0:
             return {i: 0.0 for i in range(len(zones))}
         
-        zone_counts = {i: 0 for i in range(len(zones))}
+        if len(zones) == 0:
+            return {}
         
-        for x, y in positions:
-            for i, (x_min, y_min, x_max, y_max) in enumerate(zones):
-                if x_min <= x <= x_max and y_min <= y <= y_max:
-                    zone_counts[i] += 1
-                    break  # Count each position in only one zone
+        pts = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        zs = np.asarray(zones, dtype=np.float64).reshape(-1, 4)
         
-        total_positions = len(positions)
+        # (N, Z) membership matrix, zones given as (x_min, y_min, x_max, y_max)
+        x = pts[:, 0, None]
+        y = pts[:, 1, None]
+        inside = (
+            (x >= zs[None, :, 0]) & (x <= zs[None, :, 2]) &
+            (y >= zs[None, :, 1]) & (y <= zs[None, :, 3])
+        )
+        
+        # Count each position in only one zone: the first one containing it
+        first = inside.argmax(axis=1)
+        valid = inside.any(axis=1)
+        zone_counts = np.bincount(first[valid], minlength=len(zs))
+        
+        total_positions = len(pts)
         zone_occupancy = {
-            i: (count / total_positions) * 100.0
-            for i, count in zone_counts.items()
+            i: (int(count) / total_positions) * 100.0
+            for i, count in enumerate(zone_counts)
         }
         
         return zone_occupancy
@@ -207,11 +267,14 @@ class HeatmapEngine:
             return []
         
         # Sort by timestamp
-        sorted_positions = sorted(positions_with_time, key=lambda p: p[2])
+        data = np.asarray(positions_with_time, dtype=np.float64).reshape(-1, 3)
+        data = data[np.argsort(data[:, 2], kind="stable")]
+        ts = data[:, 2]
+        xy = data[:, :2]
         
         # Determine time range
-        min_time = sorted_positions[0][2]
-        max_time = sorted_positions[-1][2]
+        min_time = ts[0]
+        max_time = ts[-1]
         
         heatmaps = []
         current_time = min_time
@@ -219,16 +282,14 @@ class HeatmapEngine:
         while current_time <= max_time:
             window_end = current_time + time_window
             
-            # Get positions in this window
-            window_positions = [
-                (x, y) for x, y, t in sorted_positions
-                if current_time <= t < window_end
-            ]
+            # Positions in [current_time, window_end) form a contiguous slice
+            lo = np.searchsorted(ts, current_time, side="left")
+            hi = np.searchsorted(ts, window_end, side="left")
             
-            if len(window_positions) > 0:
-                heatmap = self.generate_heatmap(window_positions, normalize, apply_smoothing=True)
+            if hi > lo:
+                heatmap = self.generate_heatmap(xy[lo:hi], normalize, apply_smoothing=True)
                 if heatmap:
-                    heatmaps.append((current_time, heatmap))
+                    heatmaps.append((float(current_time), heatmap))
             
             current_time += time_window
         
@@ -236,7 +297,7 @@ class HeatmapEngine:
     
     def _apply_gaussian_smoothing(self, grid: np.ndarray, sigma: float = 1.0) -> np.ndarray:
         """
-        Apply Gaussian smoothing to grid using convolution
+        Apply Gaussian smoothing to grid
         
         Args:
             grid: 2D numpy array
@@ -245,43 +306,36 @@ class HeatmapEngine:
         Returns:
             Smoothed grid
         """
-        # Create Gaussian kernel
-        kernel_size = int(6 * sigma + 1)
-        if kernel_size % 2 == 0:
-            kernel_size += 1
-        
-        kernel = self._gaussian_kernel_2d(kernel_size, sigma)
+        if sigma <= 0:
+            return grid
         
-        # Apply convolution
-        from scipy.ndimage import convolve
-        smoothed = convolve(grid, kernel, mode='constant', cval=0.0)
+        # Separable filter: two 1-D passes instead of a K x K convolution,
+        # with the (cached) kernel shared by both axes and all calls
+        kernel = _gaussian_kernel_1d(sigma)
         
-        return smoothed
+        from scipy.ndimage import correlate1d
+        smoothed = correlate1d(grid, kernel, axis=0, mode='constant', cval=0.0)
+        return correlate1d(smoothed, kernel, axis=1, mode='constant', cval=0.0)
+
+
+@lru_cache(maxsize=16)
+def _gaussian_kernel_1d(sigma: float) -> np.ndarray:
+    """
+    Normalized 1-D Gaussian kernel of size int(6 * sigma + 1), rounded up to odd
     
-    def _gaussian_kernel_2d(self, size: int, sigma: float) -> np.ndarray:
-        """
-        Create 2D Gaussian kernel
-        
-        Args:
-            size: Kernel size (should be odd)
-            sigma: Standard deviation
-            
-        Returns:
-            2D Gaussian kernel
-        """
-        center = size // 2
-        kernel = np.zeros((size, size))
-        
-        for i in range(size):
-            for j in range(size):
-                x = i - center
-                y = j - center
-                kernel[i, j] = np.exp(-(x**2 + y**2) / (2 * sigma**2))
-        
-        # Normalize
-        kernel = kernel / np.sum(kernel)
-        
-        return kernel
+    Cached per sigma (the config value is normally the only one used); the
+    returned array is read-only since it is shared.
+    """
+    kernel_size = int(6 * sigma + 1)
+    if kernel_size % 2 == 0:
+        kernel_size += 1
+    radius = kernel_size // 2
+    
+    x = np.arange(-radius, radius + 1, dtype=np.float64)
+    kernel = np.exp(-(x * x) / (2 * sigma * sigma))
+    kernel /= kernel.sum()
+    kernel.setflags(write=False)
+    return kernel
 
 
 class ZoneAnalyzer:
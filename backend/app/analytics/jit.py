@@ -0,0 +1,31 @@
+"""
+Optional Numba JIT for numeric analytics kernels
+
+Kernels are written as plain scalar loops over arrays. With numba installed
+they are compiled with @njit; without it they run as regular Python, where
+callers should pass lists (see as_kernel_input) since indexing Python lists
+is much cheaper than indexing NumPy arrays element by element.
+"""
+import numpy as np
+
+try:
+    from numba import njit as _numba_njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _numba_njit = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """numba.njit when available, otherwise a no-op decorator (prange is range)"""
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
+
+
+def as_kernel_input(array: np.ndarray):
+    """Arrays for compiled kernels, lists for the pure-Python fallback"""
+    return array if NUMBA_AVAILABLE else array.tolist()
@@ -2,17 +2,73 @@
 Analytics Database Models
 New models for Phase 2 analytics storage
 """
-from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, Text,
-    ForeignKey, Index, Enum
+    Column, Integer, BigInteger, String, Float, DateTime, Text,
+    ForeignKey, Index, Identity, LargeBinary, SmallInteger, CheckConstraint, Computed,
+    UniqueConstraint, DDL, event
 )
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID, JSON, JSONB, ARRAY, DOUBLE_PRECISION, REAL
 import uuid
 import enum
+import numpy as np
 
 from app.db.session import Base
+from app.analytics.heatmap import decode_grid
+
+# BIGINT identity key for append-heavy tables (plain INTEGER on SQLite so
+# the test database still autoincrements)
+BigIntegerPK = BigInteger().with_variant(Integer, "sqlite")
+
+# JSONB on PostgreSQL, plain JSON elsewhere (SQLite test database)
+JSONBType = JSON().with_variant(JSONB(), "postgresql")
+
+# Hash partitions of the match-partitioned tables (alembic 028)
+MATCH_PARTITIONS = 16
+
+# FLOAT8[] on PostgreSQL, a JSON list elsewhere
+Float8Array = JSON().with_variant(ARRAY(DOUBLE_PRECISION), "postgresql")
+
+# REAL[] on PostgreSQL, a JSON list elsewhere (float32 metric values)
+Float4Array = JSON().with_variant(ARRAY(REAL), "postgresql")
+
+
+class SmallIntEnum(TypeDecorator):
+    """
+    Store a str Enum as a SMALLINT code on high-volume tables.
+    Codes are the 1-based declaration order: only ever append new members.
+    """
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+        self._members = list(enum_class)
+        # str Enum members hash and compare like their values, so one dict
+        # maps both members and raw strings to codes (bound once per row)
+        self._codes = {member: code for code, member in enumerate(self._members, start=1)}
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        code = self._codes.get(value)
+        if code is None:
+            # Unknown value: let the Enum raise its ValueError
+            code = self._codes[self.enum_class(value)]
+        return code
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value - 1]
+
+
+def enum_codes_check(column: str, enum_class) -> str:
+    """CHECK expression bounding a SmallIntEnum column to its known codes"""
+    return f"{column} BETWEEN 1 AND {len(enum_class)}"
 
 
 class MetricType(str, enum.Enum):
@@ -37,37 +93,54 @@ class TimeSeriesMetricType(str, enum.Enum):
     DISTANCE_ROLLING = "distance_rolling"
 
 
-class PlayerMetric(Base):
+class PlayerMatchMetrics(Base):
     """
-    PlayerMetric - Stores aggregate metrics for a player in a match
-    One record per player per match per metric
+    PlayerMatchMetrics - Aggregate metrics for a player in a match
+    One record per player per match, one column per metric
     """
-    __tablename__ = "player_metrics"
+    __tablename__ = "player_match_metrics"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     player_id = Column(UUID(as_uuid=True), nullable=False)  # References Track.id
     match_id = Column(UUID(as_uuid=True), ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
     video_id = Column(UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
     
-    # Metric Information
-    metric_name = Column(Enum(MetricType), nullable=False)
-    numeric_value = Column(Float, nullable=False)
-    unit = Column(String(50), nullable=True)  # e.g., "m", "m/s", "count"
+    # Metrics (units in PLAYER_MATCH_METRIC_UNITS)
+    total_distance = Column(Float, nullable=False)
+    top_speed = Column(Float, nullable=False)
+    avg_speed = Column(Float, nullable=False)
+    high_intensity_distance = Column(Float, nullable=False)
+    sprint_count = Column(Integer, nullable=False)
+    max_acceleration = Column(Float, nullable=False)
+    max_deceleration = Column(Float, nullable=False)
+    stamina_index = Column(Float, nullable=False)
+    distance_per_minute = Column(JSONBType, nullable=True)  # meters per minute of play
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    # Indexes
+    # Indexes (the unique key also serves per-player lookups)
     __table_args__ = (
-        Index("idx_player_metric_player_match", "player_id", "match_id"),
-        Index("idx_player_metric_match", "match_id"),
-        Index("idx_player_metric_video", "video_id"),
-        Index("idx_player_metric_type", "metric_name"),
+        UniqueConstraint("player_id", "match_id", name="uq_player_match_metrics_player_match"),
+        Index("idx_player_match_metrics_match", "match_id"),
     )
     
     def __repr__(self):
-        return f"<PlayerMetric(player_id={self.player_id}, metric={self.metric_name}, value={self.numeric_value})>"
+        return f"<PlayerMatchMetrics(player_id={self.player_id}, match_id={self.match_id})>"
+
+
+# Scalar metric columns of PlayerMatchMetrics (named after MetricType values)
+PLAYER_MATCH_METRIC_UNITS = {
+    MetricType.TOTAL_DISTANCE: "m",
+    MetricType.TOP_SPEED: "m/s",
+    MetricType.AVG_SPEED: "m/s",
+    MetricType.HIGH_INTENSITY_DISTANCE: "m",
+    MetricType.SPRINT_COUNT: "count",
+    MetricType.MAX_ACCELERATION: "m/s²",
+    MetricType.MAX_DECELERATION: "m/s²",
+    MetricType.STAMINA_INDEX: "index",
+}
 
 
 class PlayerMetricTimeSeries(Base):
@@ -77,9 +150,12 @@ class PlayerMetricTimeSeries(Base):
     """
     __tablename__ = "player_metric_timeseries"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(BigIntegerPK, Identity(always=True), primary_key=True)
     player_id = Column(UUID(as_uuid=True), nullable=False)  # References Track.id
-    match_id = Column(UUID(as_uuid=True), ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
+    # Partition key (HASH), so part of the primary key
+    match_id = Column(
+        UUID(as_uuid=True), ForeignKey("matches.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
     video_id = Column(UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
     
     # Time Information
@@ -87,25 +163,87 @@ class PlayerMetricTimeSeries(Base):
     frame_number = Column(Integer, nullable=True)
     
     # Metric Information
-    metric_type = Column(Enum(TimeSeriesMetricType), nullable=False)
-    value = Column(Float, nullable=False)
+    metric_type = Column(SmallIntEnum(TimeSeriesMetricType), nullable=False)
+    value = Column(Float().with_variant(REAL(), "postgresql"), nullable=False)  # float32, like the samples
     unit = Column(String(50), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Indexes
     __table_args__ = (
-        Index("idx_timeseries_player_match", "player_id", "match_id"),
-        Index("idx_timeseries_player_timestamp", "player_id", "timestamp"),
-        Index("idx_timeseries_match", "match_id"),
+        # Single covering index: index-only chart reads and the cascade
+        # from matches; every extra index is paid on each insert
+        Index(
+            "idx_timeseries_covering", "match_id", "player_id", "metric_type", "timestamp",
+            postgresql_include=["value", "unit"]
+        ),
         Index("idx_timeseries_video", "video_id"),
+        CheckConstraint(
+            enum_codes_check("metric_type", TimeSeriesMetricType),
+            name="ck_player_metric_timeseries_metric_type"
+        ),
+        {"postgresql_partition_by": "HASH (match_id)"},
     )
     
     def __repr__(self):
         return f"<PlayerMetricTimeSeries(player_id={self.player_id}, metric={self.metric_type}, timestamp={self.timestamp})>"
 
 
+class PlayerMetricSeries(Base):
+    """
+    PlayerMetricSeries - One whole time series per player, match and metric
+    Replaces the row-per-sample PlayerMetricTimeSeries (kept for old data)
+    """
+    __tablename__ = "player_metric_series"
+    
+    id = Column(BigIntegerPK, Identity(always=True), primary_key=True)
+    player_id = Column(UUID(as_uuid=True), nullable=False)  # References Track.id
+    match_id = Column(UUID(as_uuid=True), ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
+    video_id = Column(UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
+    
+    # Metric Information
+    metric_type = Column(SmallIntEnum(TimeSeriesMetricType), nullable=False)
+    unit = Column(String(50), nullable=True)
+    
+    # Samples, sorted by timestamp (seconds from video start)
+    timestamps = Column(Float8Array, nullable=False)
+    values = Column(Float4Array, nullable=False)
+    start_ts = Column(Float, nullable=False)
+    sample_rate = Column(Float, nullable=True)  # samples per second, NULL for a single sample
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    # Indexes
+    __table_args__ = (
+        Index("idx_metric_series_player_match_type", "player_id", "match_id", "metric_type"),
+        Index("idx_metric_series_match", "match_id"),
+        Index("idx_metric_series_video", "video_id"),
+        CheckConstraint(
+            enum_codes_check("metric_type", TimeSeriesMetricType),
+            name="ck_player_metric_series_metric_type"
+        ),
+    )
+    
+    @classmethod
+    def from_points(cls, points, **fields) -> "PlayerMetricSeries":
+        """Build a series from non-empty (timestamp, value) pairs sorted by timestamp"""
+        samples = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        timestamps = samples[:, 0]
+        span = float(timestamps[-1] - timestamps[0])
+        return cls(
+            timestamps=timestamps.tolist(),
+            values=samples[:, 1].tolist(),
+            start_ts=float(timestamps[0]),
+            sample_rate=(len(timestamps) - 1) / span if span > 0 else None,
+            **fields
+        )
+    
+    def __repr__(self):
+        return f"<PlayerMetricSeries(player_id={self.player_id}, metric={self.metric_type}, samples={len(self.values)})>"
+
+
 class PlayerHeatmap(Base):
     """
     PlayerHeatmap - Stores heatmap data for a player in a match
@@ -120,7 +258,8 @@ class PlayerHeatmap(Base):
     # Heatmap Data
     grid_width = Column(Integer, nullable=False)  # Number of bins horizontally
     grid_height = Column(Integer, nullable=False)  # Number of bins vertically
-    heatmap_data = Column(JSON, nullable=False)  # 2D array of intensity values
+    heatmap_data = Column(LargeBinary, nullable=False)  # row-major (grid_height x grid_width)
+    dtype = Column(String(16), nullable=False, server_default="float32")  # encoding, see heatmap.encode_grid
     
     # Pitch Dimensions (meters)
     pitch_length = Column(Float, default=105.0)
@@ -131,16 +270,25 @@ class PlayerHeatmap(Base):
     max_intensity = Column(Float, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Indexes
     __table_args__ = (
         Index("idx_heatmap_player_match", "player_id", "match_id"),
         Index("idx_heatmap_match", "match_id"),
         Index("idx_heatmap_video", "video_id"),
+        CheckConstraint("dtype IN ('float32', 'uint16')", name="ck_player_heatmaps_dtype"),
     )
     
+    @property
+    def grid(self) -> np.ndarray:
+        """Decode heatmap_data into a (grid_height, grid_width) float32 array"""
+        return decode_grid(
+            self.heatmap_data, self.dtype or "float32",
+            self.grid_height, self.grid_width, self.max_intensity
+        )
+    
     def __repr__(self):
         return f"<PlayerHeatmap(player_id={self.player_id}, match_id={self.match_id})>"
 
@@ -162,11 +310,11 @@ class TeamMetric(Base):
     unit = Column(String(50), nullable=True)
     
     # Additional Context
-    extra_data = Column(JSON, nullable=True)
+    extra_data = Column("metadata", JSONBType, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Indexes
     __table_args__ = (
@@ -231,14 +379,13 @@ class TacticalSnapshot(Base):
     pressing_intensity = Column(Float, nullable=True)
     
     # Player positions (JSON array)
-    player_positions = Column(JSON, nullable=True)
+    player_positions = Column(JSONBType, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Indexes
     __table_args__ = (
-        Index("idx_tactical_snapshot_match", "match_id"),
         Index("idx_tactical_snapshot_match_team", "match_id", "team_side"),
         Index("idx_tactical_snapshot_timestamp", "timestamp"),
     )
@@ -273,12 +420,11 @@ class XTMetric(Base):
     avg_xt_per_action = Column(Float, nullable=False, default=0.0)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Indexes
     __table_args__ = (
-        Index("idx_xt_metric_match", "match_id"),
         Index("idx_xt_metric_player", "player_id"),
         Index("idx_xt_metric_match_player", "match_id", "player_id"),
     )
@@ -293,12 +439,15 @@ class Event(Base):
     """
     __tablename__ = "events"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    match_id = Column(UUID(as_uuid=True), ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
+    id = Column(BigIntegerPK, Identity(always=True), primary_key=True)
+    # Partition key (HASH), so part of the primary key
+    match_id = Column(
+        UUID(as_uuid=True), ForeignKey("matches.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
     player_id = Column(UUID(as_uuid=True), nullable=False)  # References Track.id
     team_side = Column(String(50), nullable=False)
     
-    event_type = Column(Enum(EventType), nullable=False)
+    event_type = Column(SmallIntEnum(EventType), nullable=False)
     timestamp = Column(Float, nullable=False)
     frame_number = Column(Integer, nullable=True)
     
@@ -309,26 +458,39 @@ class Event(Base):
     end_y = Column(Float, nullable=False)
     
     # Event metrics
-    distance = Column(Float, nullable=False)
+    distance = Column(Float, nullable=False)  # path length (carries are not straight lines)
     duration = Column(Float, nullable=False)
-    velocity = Column(Float, nullable=False)
+    velocity = Column(
+        Float,
+        Computed("CASE WHEN duration > 0 THEN distance / duration ELSE 0 END", persisted=True),
+        nullable=False
+    )
     
     # xT value
     xt_value = Column(Float, nullable=True)
     
     # Additional metadata
-    extra_data = Column(JSON, nullable=True)
+    extra_data = Column("metadata", JSONBType, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Indexes
     __table_args__ = (
-        Index("idx_event_match", "match_id"),
         Index("idx_event_player", "player_id"),
-        Index("idx_event_match_player", "match_id", "player_id"),
+        Index(
+            "idx_event_match_player_ts", "match_id", "player_id", "timestamp",
+            postgresql_include=["event_type", "start_x", "start_y", "end_x", "end_y", "xt_value"]
+        ),
         Index("idx_event_type", "event_type"),
-        Index("idx_event_timestamp", "timestamp"),
+        Index("idx_event_metadata_gin", "metadata", postgresql_using="gin",
+              postgresql_ops={"metadata": "jsonb_path_ops"}),
+        Index(
+            "idx_event_timestamp_brin", "timestamp",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 64}
+        ),
+        CheckConstraint(enum_codes_check("event_type", EventType), name="ck_events_event_type"),
+        {"postgresql_partition_by": "HASH (match_id)"},
     )
     
     def __repr__(self):
@@ -355,13 +517,25 @@ class TransitionMetric(Base):
     avg_speed = Column(Float, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Indexes
     __table_args__ = (
-        Index("idx_transition_match", "match_id"),
         Index("idx_transition_match_team", "match_id", "team_side"),
     )
     
     def __repr__(self):
         return f"<TransitionMetric(type={self.transition_type}, duration={self.duration:.1f}s)>"
+
+
+def _create_match_partitions(table) -> None:
+    """Have create_all also create the HASH (match_id) partitions of a table"""
+    for i in range(MATCH_PARTITIONS):
+        event.listen(table, "after_create", DDL(
+            f"CREATE TABLE {table.name}_p{i} PARTITION OF {table.name} "
+            f"FOR VALUES WITH (MODULUS {MATCH_PARTITIONS}, REMAINDER {i}) WITH (fillfactor = 100)"
+        ).execute_if(dialect="postgresql"))
+
+
+_create_match_partitions(PlayerMetricTimeSeries.__table__)
+_create_match_partitions(Event.__table__)
@@ -3,11 +3,14 @@ Physical Metrics Engine
 Computes physical performance metrics from tracking data
 """
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Sequence, Union
 from dataclasses import dataclass
 from datetime import datetime
+import math
 import logging
 
+from app.analytics.jit import njit, prange, NUMBA_AVAILABLE
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +25,63 @@ class TrackPointData:
     y_px: float
 
 
+@dataclass
+class TrackArray:
+    """
+    Column (structure-of-arrays) view of one track, ordered by timestamp
+    
+    Coordinates are float32, the precision track_points stores them at
+    (REAL). Timestamps stay float64: past ~4096 s float32 only resolves
+    ~0.5 ms, which is coarse next to a 40 ms frame step and would skew speed
+    and acceleration. Missing coordinates are NaN; missing frame numbers
+    are -1.
+    """
+    timestamp: np.ndarray
+    x_m: np.ndarray
+    y_m: np.ndarray
+    frame_number: np.ndarray
+    
+    @classmethod
+    def from_points(cls, track_points: Sequence) -> "TrackArray":
+        """
+        Build the columns from point objects (TrackPointData, TrackPoint rows
+        or anything exposing timestamp, frame_number, x_m and y_m)
+        """
+        n = len(track_points)
+        timestamp = np.fromiter((p.timestamp for p in track_points), dtype=np.float64, count=n)
+        x_m = np.fromiter(
+            (np.nan if p.x_m is None else p.x_m for p in track_points), dtype=np.float32, count=n
+        )
+        y_m = np.fromiter(
+            (np.nan if p.y_m is None else p.y_m for p in track_points), dtype=np.float32, count=n
+        )
+        frame_number = np.fromiter(
+            (-1 if p.frame_number is None else p.frame_number for p in track_points),
+            dtype=np.int64, count=n
+        )
+        
+        # The tracker emits points in order: skip the sort and the copies
+        if np.all(timestamp[1:] >= timestamp[:-1]):
+            return cls(timestamp=timestamp, x_m=x_m, y_m=y_m, frame_number=frame_number)
+        
+        # Stable, like sorted(): equal timestamps keep their input order
+        order = np.argsort(timestamp, kind="stable")
+        return cls(
+            timestamp=timestamp[order],
+            x_m=x_m[order],
+            y_m=y_m[order],
+            frame_number=frame_number[order]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.timestamp)
+    
+    @property
+    def has_metric_coords(self) -> bool:
+        """Whether every point has calibrated (x_m, y_m) coordinates"""
+        return not (np.isnan(self.x_m).any() or np.isnan(self.y_m).any())
+
+
 @dataclass
 class PhysicalMetrics:
     """Complete physical metrics for a player"""
@@ -55,6 +115,152 @@ class PhysicalMetrics:
     stamina_curve: List[Tuple[float, float]]  # (timestamp, stamina_value)
 
 
+@njit(cache=True, fastmath=True)
+def _physical_kernel(xs, ys, ts, high_intensity_threshold, sprint_threshold, sprint_min_duration):
+    """
+    Distance, speed, acceleration, intensity and sprint metrics in one sweep
+    
+    Same results as the NumPy helpers of PhysicalMetricsEngine (samples with
+    no time step are skipped; acceleration is between consecutive kept
+    samples). Distances, speeds and accelerations are float32 like the
+    TrackArray coordinates; timestamps and the scalar sums are float64.
+    Returns the tuple unpacked in PhysicalMetricsEngine.compute_metrics.
+    """
+    n = len(xs)
+    distances = np.empty(max(n - 1, 0), dtype=np.float32)
+    speeds = np.empty(max(n - 1, 0), dtype=np.float32)
+    timestamps = np.empty(max(n - 1, 0), dtype=np.float64)
+    accelerations = np.empty(max(n - 2, 0), dtype=np.float32)
+    
+    total_distance = 0.0
+    speed_sum = 0.0
+    top_speed = 0.0
+    high_intensity_distance = 0.0
+    sprint_distance = 0.0
+    sprint_count = 0
+    max_accel = 0.0
+    max_decel = 0.0
+    abs_accel_sum = 0.0
+    
+    in_sprint = False
+    sprint_start_time = 0.0
+    prev_speed = 0.0  # unrounded, for the acceleration
+    m = 0  # kept samples
+    
+    for i in range(1, n):
+        dt = ts[i] - ts[i - 1]
+        if dt <= 0:
+            continue
+        
+        dist = math.sqrt((xs[i] - xs[i - 1]) ** 2 + (ys[i] - ys[i - 1]) ** 2)
+        speed = dist / dt
+        t = ts[i]
+        
+        distances[m] = dist
+        speeds[m] = speed
+        timestamps[m] = t
+        total_distance += dist
+        speed_sum += speed
+        if m == 0 or speed > top_speed:
+            top_speed = speed
+        
+        if m > 0:
+            dt_speed = t - timestamps[m - 1]
+            accel = (speed - prev_speed) / dt_speed if dt_speed > 0 else 0.0
+            accelerations[m - 1] = accel
+            abs_accel_sum += abs(accel)
+            if m == 1 or accel > max_accel:
+                max_accel = accel
+            if m == 1 or accel < max_decel:
+                max_decel = accel
+        
+        if speed >= high_intensity_threshold:
+            high_intensity_distance += dist
+        
+        # Sprint runs: counted when they last at least sprint_min_duration
+        # (first to last sprinting sample)
+        if speed >= sprint_threshold:
+            sprint_distance += dist
+            if not in_sprint:
+                in_sprint = True
+                sprint_start_time = t
+        elif in_sprint:
+            if timestamps[m - 1] - sprint_start_time >= sprint_min_duration:
+                sprint_count += 1
+            in_sprint = False
+        
+        prev_speed = speed
+        m += 1
+    
+    if in_sprint and timestamps[m - 1] - sprint_start_time >= sprint_min_duration:
+        sprint_count += 1
+    
+    avg_speed = speed_sum / m if m > 0 else 0.0
+    avg_accel = abs_accel_sum / (m - 1) if m > 1 else 0.0
+    
+    return (
+        distances[:m], speeds[:m], timestamps[:m], accelerations[:max(m - 1, 0)],
+        total_distance, avg_speed, top_speed, max_accel, max_decel, avg_accel,
+        high_intensity_distance, sprint_distance, sprint_count
+    )
+
+
+@njit(cache=True, parallel=True)
+def _physical_batch_kernel(xs, ys, ts, offsets, high_intensity_threshold, sprint_threshold, sprint_min_duration):
+    """
+    Run _physical_kernel on many tracks in parallel
+    
+    Track k occupies [offsets[k], offsets[k + 1]) of the concatenated
+    columns. Its per-sample outputs (fewer than its point count) are written
+    back into the same region, so threads never share slots.
+    
+    Returns:
+        (distances, speeds, timestamps, accelerations, counts, scalars,
+        sprint_counts); track k has counts[k] samples at offsets[k] and
+        counts[k] - 1 accelerations. scalars[k] holds total_distance,
+        avg_speed, top_speed, max_accel, max_decel, avg_accel,
+        high_intensity_distance, sprint_distance
+    """
+    n_tracks = len(offsets) - 1
+    total = len(xs)
+    distances = np.empty(total, dtype=np.float32)
+    speeds = np.empty(total, dtype=np.float32)
+    timestamps = np.empty(total, dtype=np.float64)
+    accelerations = np.empty(total, dtype=np.float32)
+    counts = np.zeros(n_tracks, dtype=np.int64)
+    scalars = np.zeros((n_tracks, 8), dtype=np.float64)
+    sprint_counts = np.zeros(n_tracks, dtype=np.int64)
+    
+    for k in prange(n_tracks):
+        lo = offsets[k]
+        hi = offsets[k + 1]
+        (
+            d, s, t, a,
+            total_distance, avg_speed, top_speed, max_accel, max_decel, avg_accel,
+            high_intensity_distance, sprint_distance, sprint_count
+        ) = _physical_kernel(
+            xs[lo:hi], ys[lo:hi], ts[lo:hi],
+            high_intensity_threshold, sprint_threshold, sprint_min_duration
+        )
+        m = len(d)
+        distances[lo:lo + m] = d
+        speeds[lo:lo + m] = s
+        timestamps[lo:lo + m] = t
+        accelerations[lo:lo + len(a)] = a
+        counts[k] = m
+        scalars[k, 0] = total_distance
+        scalars[k, 1] = avg_speed
+        scalars[k, 2] = top_speed
+        scalars[k, 3] = max_accel
+        scalars[k, 4] = max_decel
+        scalars[k, 5] = avg_accel
+        scalars[k, 6] = high_intensity_distance
+        scalars[k, 7] = sprint_distance
+        sprint_counts[k] = sprint_count
+    
+    return distances, speeds, timestamps, accelerations, counts, scalars, sprint_counts
+
+
 class PhysicalMetricsEngine:
     """
     Computes physical performance metrics from track point data
@@ -76,56 +282,116 @@ class PhysicalMetricsEngine:
         self.sprint_threshold = sprint_threshold_mps
         self.sprint_min_duration = sprint_min_duration
     
-    def compute_metrics(self, track_points: List[TrackPointData]) -> Optional[PhysicalMetrics]:
+    def compute_metrics(
+        self, track_points: Union[TrackArray, List[TrackPointData]]
+    ) -> Optional[PhysicalMetrics]:
         """
         Compute all physical metrics for a player track
         
         Args:
-            track_points: List of track points ordered by timestamp
+            track_points: TrackArray, or a list of track points (converted
+                          once with TrackArray.from_points)
             
         Returns:
             PhysicalMetrics object or None if insufficient data
         """
-        if len(track_points) < 2:
-            logger.warning("Insufficient track points for metric computation")
+        track = self._prepare_track(track_points)
+        if track is None:
             return None
         
-        # Sort by timestamp to ensure correct ordering
-        track_points = sorted(track_points, key=lambda p: p.timestamp)
+        if NUMBA_AVAILABLE:
+            # Compiled single sweep over the columns
+            core = _physical_kernel(
+                track.x_m, track.y_m, track.timestamp,
+                self.high_intensity_threshold, self.sprint_threshold, self.sprint_min_duration
+            )
+        else:
+            core = self._compute_core_metrics(track)
         
-        # Check if metric coordinates are available
-        has_metric_coords = all(p.x_m is not None and p.y_m is not None for p in track_points)
+        return self._build_metrics(track, core)
+    
+    def compute_metrics_batch(
+        self, tracks: List[Union[TrackArray, List[TrackPointData]]]
+    ) -> List[Optional[PhysicalMetrics]]:
+        """
+        Compute metrics for many independent tracks (e.g. all players of a match)
         
-        if not has_metric_coords:
-            logger.warning("Track points missing metric coordinates (x_m, y_m). Cannot compute metrics.")
+        With numba the core sweep runs for all tracks at once, in parallel
+        across threads; otherwise tracks are processed one by one.
+        
+        Returns:
+            One PhysicalMetrics (or None, as compute_metrics) per input track
+        """
+        if not NUMBA_AVAILABLE:
+            return [self.compute_metrics(track) for track in tracks]
+        
+        prepared = [self._prepare_track(track) for track in tracks]
+        valid = [track for track in prepared if track is not None]
+        if not valid:
+            return [None] * len(tracks)
+        
+        offsets = np.zeros(len(valid) + 1, dtype=np.int64)
+        np.cumsum([len(track) for track in valid], out=offsets[1:])
+        
+        distances, speeds, timestamps, accelerations, counts, scalars, sprint_counts = _physical_batch_kernel(
+            np.concatenate([track.x_m for track in valid]),
+            np.concatenate([track.y_m for track in valid]),
+            np.concatenate([track.timestamp for track in valid]),
+            offsets,
+            self.high_intensity_threshold, self.sprint_threshold, self.sprint_min_duration
+        )
+        
+        results = []
+        k = 0
+        for track in prepared:
+            if track is None:
+                results.append(None)
+                continue
+            
+            lo = int(offsets[k])
+            m = int(counts[k])
+            core = (
+                distances[lo:lo + m], speeds[lo:lo + m], timestamps[lo:lo + m],
+                accelerations[lo:lo + max(m - 1, 0)],
+                *scalars[k].tolist(), int(sprint_counts[k])
+            )
+            results.append(self._build_metrics(track, core))
+            k += 1
+        
+        return results
+    
+    def _prepare_track(
+        self, track_points: Union[TrackArray, List[TrackPointData]]
+    ) -> Optional[TrackArray]:
+        """Columns sorted by timestamp, or None if metrics cannot be computed"""
+        if len(track_points) < 2:
+            logger.warning("Insufficient track points for metric computation")
             return None
         
-        # Compute distance and speed
-        distances, speeds, timestamps = self._compute_distance_and_speed(track_points)
+        track = track_points if isinstance(track_points, TrackArray) else TrackArray.from_points(track_points)
         
-        # Compute acceleration
-        accelerations = self._compute_acceleration(speeds, timestamps)
+        if not track.has_metric_coords:
+            logger.warning("Track points missing metric coordinates (x_m, y_m). Cannot compute metrics.")
+            return None
         
-        # Compute high-intensity and sprint metrics
-        high_intensity_distance = self._compute_high_intensity_distance(distances, speeds)
-        sprint_distance, sprint_count = self._compute_sprint_metrics(distances, speeds, timestamps)
+        return track
+    
+    def _build_metrics(self, track: TrackArray, core: tuple) -> PhysicalMetrics:
+        """Derive the remaining metrics from the core sweep and assemble the result"""
+        (
+            distances, speeds, timestamps, accelerations,
+            total_distance, avg_speed, top_speed, max_accel, max_decel, avg_accel,
+            high_intensity_distance, sprint_distance, sprint_count
+        ) = core
         
         # Compute stamina metrics
-        distance_per_minute = self._compute_distance_per_minute(track_points, distances, timestamps)
+        distance_per_minute = self._compute_distance_per_minute(track, distances, timestamps)
         stamina_index = self._compute_stamina_index(distance_per_minute, speeds)
         stamina_curve = self._compute_stamina_curve(speeds, timestamps)
         
-        # Aggregate metrics
-        total_distance = np.sum(distances)
-        avg_speed = np.mean(speeds) if len(speeds) > 0 else 0.0
-        top_speed = np.max(speeds) if len(speeds) > 0 else 0.0
-        max_accel = np.max(accelerations) if len(accelerations) > 0 else 0.0
-        max_decel = np.min(accelerations) if len(accelerations) > 0 else 0.0
-        avg_accel = np.mean(np.abs(accelerations)) if len(accelerations) > 0 else 0.0
-        
-        # Build time series
-        speed_timeseries = [(timestamps[i], speeds[i]) for i in range(len(speeds))]
-        acceleration_timeseries = [(timestamps[i], accelerations[i]) for i in range(len(accelerations))]
+        # Build time series (Python floats)
+        speed_timeseries = list(zip(timestamps.tolist(), speeds.tolist()))
+        acceleration_timeseries = list(zip(timestamps.tolist(), accelerations.tolist()))
         
         return PhysicalMetrics(
             total_distance_m=total_distance,
@@ -141,14 +407,42 @@ class PhysicalMetricsEngine:
             max_deceleration_mps2=max_decel,
             avg_acceleration_mps2=avg_accel,
             stamina_index=stamina_index,
-            distance_per_minute=distance_per_minute,
+            distance_per_minute=distance_per_minute.tolist(),
             speed_timeseries=speed_timeseries,
             acceleration_timeseries=acceleration_timeseries,
             stamina_curve=stamina_curve
         )
     
+    def _compute_core_metrics(self, track: TrackArray) -> tuple:
+        """
+        NumPy equivalent of _physical_kernel (used without numba)
+        """
+        # Compute distance and speed
+        distances, speeds, timestamps = self._compute_distance_and_speed(track)
+        
+        # Compute acceleration
+        accelerations = self._compute_acceleration(speeds, timestamps)
+        
+        # Compute high-intensity and sprint metrics
+        high_intensity_distance = self._compute_high_intensity_distance(distances, speeds)
+        sprint_distance, sprint_count = self._compute_sprint_metrics(distances, speeds, timestamps)
+        
+        # Aggregate metrics (float32 samples, float64 sums)
+        total_distance = float(np.sum(distances, dtype=np.float64))
+        avg_speed = float(np.mean(speeds, dtype=np.float64)) if len(speeds) > 0 else 0.0
+        top_speed = float(np.max(speeds)) if len(speeds) > 0 else 0.0
+        max_accel = float(np.max(accelerations)) if len(accelerations) > 0 else 0.0
+        max_decel = float(np.min(accelerations)) if len(accelerations) > 0 else 0.0
+        avg_accel = float(np.mean(np.abs(accelerations), dtype=np.float64)) if len(accelerations) > 0 else 0.0
+        
+        return (
+            distances, speeds, timestamps, accelerations,
+            total_distance, avg_speed, top_speed, max_accel, max_decel, avg_accel,
+            high_intensity_distance, sprint_distance, sprint_count
+        )
+    
     def _compute_distance_and_speed(
-        self, track_points: List[TrackPointData]
+        self, track: TrackArray
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Compute point-to-point distance and instantaneous speed
@@ -158,29 +452,16 @@ class PhysicalMetricsEngine:
             speeds: array of instantaneous speeds (m/s)
             timestamps: array of timestamps for each speed measurement
         """
-        distances = []
-        speeds = []
-        timestamps = []
+        xs, ys, ts = track.x_m, track.y_m, track.timestamp
         
-        for i in range(1, len(track_points)):
-            p1 = track_points[i - 1]
-            p2 = track_points[i]
-            
-            # Euclidean distance
-            dx = p2.x_m - p1.x_m
-            dy = p2.y_m - p1.y_m
-            dist = np.sqrt(dx**2 + dy**2)
-            
-            # Time difference
-            dt = p2.timestamp - p1.timestamp
-            
-            if dt > 0:
-                speed = dist / dt
-                distances.append(dist)
-                speeds.append(speed)
-                timestamps.append(p2.timestamp)
+        # Consecutive-point displacement; samples with no time step are skipped
+        dt = np.diff(ts)
+        valid = dt > 0
+        distances = np.hypot(np.diff(xs), np.diff(ys))[valid]
+        speeds = (distances / dt[valid]).astype(np.float32)
+        timestamps = ts[1:][valid]
         
-        return np.array(distances), np.array(speeds), np.array(timestamps)
+        return distances, speeds, timestamps
     
     def _compute_acceleration(
         self, speeds: np.ndarray, timestamps: np.ndarray
@@ -192,21 +473,14 @@ class PhysicalMetricsEngine:
             accelerations: array of instantaneous accelerations (m/s^2)
         """
         if len(speeds) < 2:
-            return np.array([])
-        
-        accelerations = []
+            return np.zeros(0, dtype=speeds.dtype)
         
-        for i in range(1, len(speeds)):
-            dv = speeds[i] - speeds[i - 1]
-            dt = timestamps[i] - timestamps[i - 1]
-            
-            if dt > 0:
-                accel = dv / dt
-                accelerations.append(accel)
-            else:
-                accelerations.append(0.0)
+        dv = np.diff(speeds)
+        dt = np.diff(timestamps)
         
-        return np.array(accelerations)
+        # 0 where there is no time step
+        accelerations = np.divide(dv, dt, out=np.zeros(len(dv)), where=dt > 0)
+        return accelerations.astype(speeds.dtype)
     
     def _compute_high_intensity_distance(
         self, distances: np.ndarray, speeds: np.ndarray
@@ -215,7 +489,7 @@ class PhysicalMetricsEngine:
         Compute distance covered above high-intensity threshold
         """
         high_intensity_mask = speeds >= self.high_intensity_threshold
-        return np.sum(distances[high_intensity_mask])
+        return float(np.sum(distances[high_intensity_mask], dtype=np.float64))
     
     def _compute_sprint_metrics(
         self, distances: np.ndarray, speeds: np.ndarray, timestamps: np.ndarray
@@ -231,59 +505,44 @@ class PhysicalMetricsEngine:
             sprint_count: number of distinct sprint events
         """
         sprint_mask = speeds >= self.sprint_threshold
-        sprint_distance = np.sum(distances[sprint_mask])
+        sprint_distance = float(np.sum(distances[sprint_mask], dtype=np.float64))
         
-        # Count distinct sprint events
-        sprint_count = 0
-        in_sprint = False
-        sprint_start_time = 0.0
-        
-        for i, is_sprinting in enumerate(sprint_mask):
-            if is_sprinting and not in_sprint:
-                # Start of a potential sprint
-                in_sprint = True
-                sprint_start_time = timestamps[i]
-            elif not is_sprinting and in_sprint:
-                # End of sprint
-                sprint_duration = timestamps[i - 1] - sprint_start_time
-                if sprint_duration >= self.sprint_min_duration:
-                    sprint_count += 1
-                in_sprint = False
-        
-        # Check if still in sprint at the end
-        if in_sprint:
-            sprint_duration = timestamps[-1] - sprint_start_time
-            if sprint_duration >= self.sprint_min_duration:
-                sprint_count += 1
+        # Count distinct sprint events: runs of the mask, found from its edges
+        # (zero sentinels close runs at either end of the series)
+        edges = np.diff(np.concatenate(([0], sprint_mask.view(np.int8), [0])))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1) - 1  # last sprinting sample
+        durations = timestamps[run_ends] - timestamps[run_starts]
+        sprint_count = int(np.count_nonzero(durations >= self.sprint_min_duration))
         
         return sprint_distance, sprint_count
     
     def _compute_distance_per_minute(
-        self, track_points: List[TrackPointData], distances: np.ndarray, timestamps: np.ndarray
-    ) -> List[float]:
+        self, track: TrackArray, distances: np.ndarray, timestamps: np.ndarray
+    ) -> np.ndarray:
         """
         Compute distance covered per minute of the match
         
         Returns:
-            List of distances per minute
+            Array of distances per minute
         """
-        if len(track_points) == 0:
-            return []
+        if len(track) == 0:
+            return np.zeros(0)
         
-        total_duration = track_points[-1].timestamp
+        total_duration = track.timestamp[-1]
         num_minutes = int(np.ceil(total_duration / 60.0))
         
-        distance_per_minute = [0.0] * num_minutes
-        
-        for i, dist in enumerate(distances):
-            minute_idx = int(timestamps[i] / 60.0)
-            if minute_idx < num_minutes:
-                distance_per_minute[minute_idx] += dist
+        # Samples past the last whole minute (timestamp == num_minutes * 60)
+        # are not counted
+        minute_idx = (timestamps / 60.0).astype(np.int64)
+        in_range = minute_idx < num_minutes
         
-        return distance_per_minute
+        return np.bincount(
+            minute_idx[in_range], weights=distances[in_range], minlength=num_minutes
+        )
     
     def _compute_stamina_index(
-        self, distance_per_minute: List[float], speeds: np.ndarray
+        self, distance_per_minute: np.ndarray, speeds: np.ndarray
     ) -> float:
         """
         Compute stamina index (0-100 scale)
@@ -296,7 +555,7 @@ class PhysicalMetricsEngine:
         if len(distance_per_minute) == 0:
             return 0.0
         
-        distances_array = np.array(distance_per_minute)
+        distances_array = np.asarray(distance_per_minute)
         
         # Remove zeros for better calculation
         non_zero_distances = distances_array[distances_array > 0]
@@ -304,8 +563,8 @@ class PhysicalMetricsEngine:
         if len(non_zero_distances) < 2:
             return 50.0  # Default neutral value
         
-        mean_dist = np.mean(non_zero_distances)
-        std_dist = np.std(non_zero_distances)
+        mean_dist = float(np.mean(non_zero_distances, dtype=np.float64))
+        std_dist = float(np.std(non_zero_distances, dtype=np.float64))
         
         if mean_dist == 0:
             return 50.0
@@ -330,22 +589,17 @@ class PhysicalMetricsEngine:
         if len(speeds) == 0:
             return []
         
-        window_size = self.STAMINA_WINDOW_SIZE
-        stamina_curve = []
+        half_window = self.STAMINA_WINDOW_SIZE / 2
         
-        for i, ts in enumerate(timestamps):
-            # Find points within window
-            window_start = ts - window_size / 2
-            window_end = ts + window_size / 2
-            
-            mask = (timestamps >= window_start) & (timestamps <= window_end)
-            window_speeds = speeds[mask]
-            
-            if len(window_speeds) > 0:
-                avg_speed = np.mean(window_speeds)
-                stamina_curve.append((ts, avg_speed))
+        # Timestamps are sorted: each window [ts - w/2, ts + w/2] is an index
+        # range, and its mean comes from prefix sums
+        lo = np.searchsorted(timestamps, timestamps - half_window, side="left")
+        hi = np.searchsorted(timestamps, timestamps + half_window, side="right")
+        # float64 prefix sums: differences of float32 ones lose precision
+        csum = np.concatenate(([0.0], np.cumsum(speeds, dtype=np.float64)))
+        avg_speeds = (csum[hi] - csum[lo]) / (hi - lo)  # a window always holds its own sample
         
-        return stamina_curve
+        return list(zip(timestamps.tolist(), avg_speeds.tolist()))
 
 
 class TeamMetricsEngine:
@@ -384,21 +638,18 @@ class TeamMetricsEngine:
         if len(player_positions) < 2:
             return {"width": 0.0, "height": 0.0, "area": 0.0, "compactness": 0.0}
         
-        positions = np.array(player_positions)
+        positions = np.asarray(player_positions, dtype=np.float32).reshape(-1, 2)
         
-        # Width and height (range in x and y)
-        width = np.max(positions[:, 0]) - np.min(positions[:, 0])
-        height = np.max(positions[:, 1]) - np.min(positions[:, 1])
-        area = width * height
+        # Width and height (range in x and y), one reduction per bound
+        extent = positions.max(axis=0) - positions.min(axis=0)
+        width, height = float(extent[0]), float(extent[1])
         
-        # Compactness (standard deviation from centroid)
-        centroid = np.mean(positions, axis=0)
-        distances = np.sqrt(np.sum((positions - centroid)**2, axis=1))
-        compactness = np.mean(distances)
+        # Compactness (mean distance from centroid)
+        distances = np.linalg.norm(positions - positions.mean(axis=0), axis=1)
         
         return {
             "width": width,
             "height": height,
-            "area": area,
-            "compactness": compactness
+            "area": width * height,
+            "compactness": float(distances.mean())
         }
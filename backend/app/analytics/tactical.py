@@ -10,15 +10,17 @@ This module provides comprehensive tactical analysis including:
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple
 from datetime import datetime
 import numpy as np
-from scipy.spatial import ConvexHull
 from scipy.cluster.vq import kmeans2
+from scipy.optimize import linear_sum_assignment
 from collections import defaultdict
 
+from sqlalchemy import func, cast, Float
 from sqlalchemy.orm import Session
 from app.models.models import Track, TrackPoint, Match
+from app.analytics.utils import convex_hull_areas
 
 
 @dataclass
@@ -53,7 +55,7 @@ class TeamTacticalSnapshot:
     pressing_intensity: float  # 0-100
     
     # Player positions (for debugging/visualization)
-    player_positions: List[Tuple[float, float]]
+    player_positions: np.ndarray  # (players, 2) float32; .tolist() for JSON
 
 
 @dataclass
@@ -118,11 +120,20 @@ class TacticalAnalysisEngine:
         ]
     }
     
+    # Templates flattened once: names and a (formations, 11, 2) tensor
+    FORMATION_NAMES = tuple(STANDARD_FORMATIONS)
+    FORMATION_TEMPLATES = np.array(
+        [[slot for line in formation for slot in line] for formation in STANDARD_FORMATIONS.values()],
+        dtype=np.float32
+    )
+    
     PITCH_LENGTH = 105.0  # meters
     PITCH_WIDTH = 68.0    # meters
     
     def __init__(self, db: Session):
         self.db = db
+        # analyze_match_tactics results by (match_id, window_size)
+        self._snapshots: Dict[Tuple[str, float], Dict[str, List[TeamTacticalSnapshot]]] = {}
         
     def analyze_match_tactics(
         self, 
@@ -132,6 +143,10 @@ class TacticalAnalysisEngine:
         """
         Compute tactical snapshots for both teams across the match
         
+        Results are cached on the engine, so detect_transitions for each team
+        reuses one computation. The returned lists are shared; treat them as
+        read-only. Use a new engine to see newly ingested tracks.
+        
         Args:
             match_id: Match UUID
             window_size: Time window in seconds for averaging positions
@@ -139,6 +154,17 @@ class TacticalAnalysisEngine:
         Returns:
             Dict with 'home' and 'away' keys, each containing list of snapshots
         """
+        key = (str(match_id), float(window_size))
+        if key not in self._snapshots:
+            self._snapshots[key] = self._compute_match_tactics(match_id, window_size)
+        return self._snapshots[key]
+    
+    def _compute_match_tactics(
+        self,
+        match_id: str,
+        window_size: float
+    ) -> Dict[str, List[TeamTacticalSnapshot]]:
+        """Uncached analyze_match_tactics"""
         match = self.db.query(Match).filter(Match.id == match_id).first()
         if not match:
             raise ValueError(f"Match {match_id} not found")
@@ -157,22 +183,26 @@ class TacticalAnalysisEngine:
         away_tracks = [t for t in tracks if t.team_side == "away"]
         
         # Get time range
-        all_track_points = self.db.query(TrackPoint).join(Track).filter(
+        min_time, max_time = self.db.query(
+            func.min(TrackPoint.timestamp), func.max(TrackPoint.timestamp)
+        ).join(Track).filter(
             Track.match_id == match_id
-        ).all()
+        ).one()
         
-        if not all_track_points:
+        if min_time is None:
             return {"home": [], "away": []}
         
-        min_time = min(tp.timestamp for tp in all_track_points)
-        max_time = max(tp.timestamp for tp in all_track_points)
+        # Per-player average positions for every window, from one query
+        window_positions = self._window_positions(
+            [t.id for t in tracks], min_time, window_size / 2
+        )
         
         # Generate snapshots
         home_snapshots = self._generate_snapshots(
-            home_tracks, min_time, max_time, window_size, "home"
+            home_tracks, window_positions, min_time, max_time, window_size, "home"
         )
         away_snapshots = self._generate_snapshots(
-            away_tracks, min_time, max_time, window_size, "away"
+            away_tracks, window_positions, min_time, max_time, window_size, "away"
         )
         
         return {
@@ -180,9 +210,66 @@ class TacticalAnalysisEngine:
             "away": away_snapshots
         }
     
+    def _window_positions(
+        self,
+        track_ids: List,
+        min_time: float,
+        step: float
+    ) -> Tuple[Dict, np.ndarray, np.ndarray]:
+        """
+        Average (x_m, y_m) of each track in each 50%-overlapping window
+        
+        The database returns position sums and counts per track and time
+        bucket, bucket b holding timestamps in
+        [min_time + b * step, min_time + (b + 1) * step). Window k
+        (window_size = 2 * step) is buckets k and k + 1, so all windows
+        come from two shifted slices of the bucket grid.
+        
+        Returns:
+            (row of each track_id, avg_x, avg_y); avg arrays are float32
+            [tracks, windows] and NaN where a track has no points
+        """
+        bucket = func.floor((TrackPoint.timestamp - min_time) / step).label("bucket")
+        rows = self.db.query(
+            TrackPoint.track_id,
+            bucket,
+            func.sum(cast(TrackPoint.x_m, Float)),
+            func.sum(cast(TrackPoint.y_m, Float)),
+            func.count()
+        ).filter(
+            TrackPoint.track_id.in_(track_ids),
+            TrackPoint.x_m.isnot(None),
+            TrackPoint.y_m.isnot(None)
+        ).group_by(TrackPoint.track_id, bucket).all()
+        
+        track_rows = {track_id: i for i, track_id in enumerate(track_ids)}
+        n = len(rows)
+        
+        # Structure of arrays over the (track, bucket) cells
+        cell_rows = np.fromiter((track_rows[r[0]] for r in rows), dtype=np.int64, count=n)
+        cell_buckets = np.fromiter((r[1] for r in rows), dtype=np.float64, count=n).astype(np.int64)
+        
+        width = int(cell_buckets.max()) + 2 if n else 1
+        sum_x = np.zeros((len(track_ids), width))
+        sum_y = np.zeros((len(track_ids), width))
+        counts = np.zeros((len(track_ids), width))
+        sum_x[cell_rows, cell_buckets] = np.fromiter((r[2] for r in rows), dtype=np.float64, count=n)
+        sum_y[cell_rows, cell_buckets] = np.fromiter((r[3] for r in rows), dtype=np.float64, count=n)
+        counts[cell_rows, cell_buckets] = np.fromiter((r[4] for r in rows), dtype=np.float64, count=n)
+        
+        # Sums stay float64 (a bucket can hold thousands of points); the
+        # averages are float32, plenty for meters on a 105 x 68 m pitch
+        window_counts = counts[:, :-1] + counts[:, 1:]
+        with np.errstate(invalid="ignore"):
+            avg_x = ((sum_x[:, :-1] + sum_x[:, 1:]) / window_counts).astype(np.float32)
+            avg_y = ((sum_y[:, :-1] + sum_y[:, 1:]) / window_counts).astype(np.float32)
+        
+        return track_rows, avg_x, avg_y
+    
     def _generate_snapshots(
         self,
         tracks: List[Track],
+        window_positions: Tuple[Dict, np.ndarray, np.ndarray],
         min_time: float,
         max_time: float,
         window_size: float,
@@ -191,81 +278,112 @@ class TacticalAnalysisEngine:
         """Generate tactical snapshots for a team"""
         snapshots = []
         
-        # Create time windows
-        current_time = min_time
-        step = window_size / 2  # 50% overlap
+        # Create time windows (50% overlap); window k starts on bucket k
+        track_rows, avg_x, avg_y = window_positions
+        step = window_size / 2
+        n_windows = min(int(np.ceil((max_time - min_time) / step)), avg_x.shape[1])
+        starts = (min_time + step * np.arange(n_windows)).tolist()
+        
+        # This team's window averages as (windows, players), in track order
+        team_rows = np.array([track_rows[t.id] for t in tracks], dtype=np.int64)
+        team_x = avg_x[team_rows, :n_windows].T
+        team_y = avg_y[team_rows, :n_windows].T
+        
+        # Shape statistics of every window at once
+        stats = self._compute_window_stats(team_x, team_y)
+        stats["defensive_line_height"] = self._compute_defensive_line_height(stats["defensive"], team_side)
+        stats["block_type"] = self._determine_block_type(stats["defensive_line_height"])
+        stats["compactness"] = convex_hull_areas(team_x, team_y)  # parallel over windows
+        columns = {name: values.tolist() for name, values in stats.items()}
+        
+        for window in np.flatnonzero(stats["players"] >= 3).tolist():
+            snapshots.append(self._compute_snapshot(
+                team_x[window], team_y[window], {name: values[window] for name, values in columns.items()},
+                starts[window], starts[window] + window_size, team_side
+            ))
         
-        while current_time < max_time:
-            window_end = current_time + window_size
-            
-            snapshot = self._compute_snapshot(
-                tracks, current_time, window_end, team_side
-            )
+        return snapshots
+    
+    def _compute_window_stats(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Centroid, spread and line positions of many windows in one pass
+        
+        Args:
+            xs, ys: (windows, players) average positions, NaN for players
+                    without points in a window
             
-            if snapshot:
-                snapshots.append(snapshot)
+        Returns:
+            Per-window arrays: 'players' (count), 'centroid_x', 'centroid_y',
+            'spread_x', 'spread_y' (population std), and the 'defensive',
+            'midfield' and 'attacking' lines (mean y of each third of the
+            players by y). Values are NaN for windows without players.
+        """
+        present = ~np.isnan(xs)
+        players = present.sum(axis=1)
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            centroid_x = np.where(present, xs, 0.0).sum(axis=1) / players
+            centroid_y = np.where(present, ys, 0.0).sum(axis=1) / players
+            spread_x = np.sqrt(np.where(present, (xs - centroid_x[:, None]) ** 2, 0.0).sum(axis=1) / players)
+            spread_y = np.sqrt(np.where(present, (ys - centroid_y[:, None]) ** 2, 0.0).sum(axis=1) / players)
             
-            current_time += step
+            # Thirds of each window's players by y: NaNs sort last, so the
+            # first players[w] entries of row w are its sorted y values
+            y_sorted = np.sort(ys, axis=1)
+            csum = np.zeros((len(ys), ys.shape[1] + 1))
+            np.cumsum(np.where(np.isnan(y_sorted), 0.0, y_sorted), axis=1, out=csum[:, 1:])
+            a = players // 3
+            b = 2 * players // 3
+            sum_a, sum_b, sum_n = np.take_along_axis(csum, np.stack([a, b, players], axis=1), axis=1).T
+            defensive = sum_a / a
+            midfield = (sum_b - sum_a) / (b - a)
+            attacking = (sum_n - sum_b) / (players - b)
         
-        return snapshots
+        return {
+            "players": players,
+            "centroid_x": centroid_x,
+            "centroid_y": centroid_y,
+            "spread_x": spread_x,
+            "spread_y": spread_y,
+            "defensive": defensive,
+            "midfield": midfield,
+            "attacking": attacking
+        }
     
     def _compute_snapshot(
         self,
-        tracks: List[Track],
+        avg_x: np.ndarray,
+        avg_y: np.ndarray,
+        stats: Dict[str, float],
         start_time: float,
         end_time: float,
         team_side: str
-    ) -> Optional[TeamTacticalSnapshot]:
-        """Compute a single tactical snapshot"""
-        
-        # Get average positions for each player in this window
-        player_positions = []
-        
-        for track in tracks:
-            points = self.db.query(TrackPoint).filter(
-                TrackPoint.track_id == track.id,
-                TrackPoint.timestamp >= start_time,
-                TrackPoint.timestamp < end_time,
-                TrackPoint.x_m.isnot(None),
-                TrackPoint.y_m.isnot(None)
-            ).all()
-            
-            if points:
-                avg_x = np.mean([p.x_m for p in points])
-                avg_y = np.mean([p.y_m for p in points])
-                player_positions.append((avg_x, avg_y))
+    ) -> TeamTacticalSnapshot:
+        """
+        Compute a single tactical snapshot
         
-        if len(player_positions) < 3:
-            return None
+        Args:
+            avg_x, avg_y: Each player's average position in the window
+                          (NaN for players without points in it); at least
+                          three players must have points
+            stats: The window's row of _compute_window_stats, plus its
+                   defensive_line_height, block_type and compactness
+        """
         
-        positions_array = np.array(player_positions)
+        # Average positions of the players seen in this window
+        has_points = ~np.isnan(avg_x)
+        positions_array = np.column_stack((avg_x[has_points], avg_y[has_points]))
         
         # Compute formation
         formation, confidence = self._detect_formation(positions_array)
         
-        # Compute centroid and spread
-        centroid_x = np.mean(positions_array[:, 0])
-        centroid_y = np.mean(positions_array[:, 1])
-        spread_x = np.std(positions_array[:, 0])
-        spread_y = np.std(positions_array[:, 1])
-        
-        # Compute compactness (convex hull area)
-        compactness = self._compute_compactness(positions_array)
-        
-        # Compute defensive lines
-        lines = self._compute_lines(positions_array)
-        
-        # Compute defensive line height
-        defensive_line_height = self._compute_defensive_line_height(
-            lines['defensive'], team_side
-        )
-        
-        # Determine block type
-        block_type = self._determine_block_type(defensive_line_height)
-        
         # Compute pressing intensity (simplified - would need ball position)
         pressing_intensity = self._estimate_pressing_intensity(
-            positions_array, centroid_y
+            positions_array, stats['centroid_y']
         )
         
         return TeamTacticalSnapshot(
@@ -273,20 +391,20 @@ class TacticalAnalysisEngine:
             team_side=team_side,
             formation=formation,
             formation_confidence=confidence,
-            centroid_x=centroid_x,
-            centroid_y=centroid_y,
-            spread_x=spread_x,
-            spread_y=spread_y,
-            compactness=compactness,
-            defensive_line_y=lines['defensive'],
-            midfield_line_y=lines['midfield'],
-            attacking_line_y=lines['attacking'],
-            line_spacing_def_mid=abs(lines['midfield'] - lines['defensive']),
-            line_spacing_mid_att=abs(lines['attacking'] - lines['midfield']),
-            defensive_line_height=defensive_line_height,
-            block_type=block_type,
+            centroid_x=stats['centroid_x'],
+            centroid_y=stats['centroid_y'],
+            spread_x=stats['spread_x'],
+            spread_y=stats['spread_y'],
+            compactness=stats['compactness'],
+            defensive_line_y=stats['defensive'],
+            midfield_line_y=stats['midfield'],
+            attacking_line_y=stats['attacking'],
+            line_spacing_def_mid=abs(stats['midfield'] - stats['defensive']),
+            line_spacing_mid_att=abs(stats['attacking'] - stats['midfield']),
+            defensive_line_height=stats['defensive_line_height'],
+            block_type=stats['block_type'],
             pressing_intensity=pressing_intensity,
-            player_positions=player_positions
+            player_positions=positions_array
         )
     
     def _detect_formation(
@@ -296,93 +414,51 @@ class TacticalAnalysisEngine:
         """
         Detect formation by comparing to standard formations
         
+        Players are matched to template slots with an optimal assignment
+        (Hungarian algorithm); the template with the smallest total
+        distance wins.
+        
         Returns:
             Tuple of (formation_name, confidence_score)
         """
-        # Normalize positions to 0-1 range
-        x_norm = (positions[:, 0] - positions[:, 0].min()) / (positions[:, 0].max() - positions[:, 0].min() + 1e-6)
-        y_norm = (positions[:, 1] - positions[:, 1].min()) / (positions[:, 1].max() - positions[:, 1].min() + 1e-6)
-        normalized_positions = np.column_stack([x_norm, y_norm])
-        
-        best_formation = "4-4-2"
-        best_score = float('inf')
-        
-        for formation_name, formation_template in self.STANDARD_FORMATIONS.items():
-            # Flatten template
-            template_positions = []
-            for line in formation_template:
-                template_positions.extend(line)
-            
-            template_array = np.array(template_positions)
-            
-            # Match number of players (take closest)
-            if len(template_array) != len(normalized_positions):
-                # Pad or truncate
-                if len(template_array) > len(normalized_positions):
-                    template_array = template_array[:len(normalized_positions)]
-                else:
-                    # Duplicate some positions
-                    repeats = len(normalized_positions) - len(template_array)
-                    template_array = np.vstack([
-                        template_array,
-                        template_array[:repeats]
-                    ])
-            
-            # Compute distance (Hungarian algorithm would be better, but simplified here)
-            # Sort both by y-coordinate
-            template_sorted = template_array[template_array[:, 1].argsort()]
-            positions_sorted = normalized_positions[normalized_positions[:, 1].argsort()]
-            
-            distance = np.sum(np.sqrt(np.sum((template_sorted - positions_sorted) ** 2, axis=1)))
-            
-            if distance < best_score:
-                best_score = distance
-                best_formation = formation_name
+        # Normalize positions to 0-1 range (both axes at once)
+        low = positions.min(axis=0)
+        normalized_positions = (positions - low) / (positions.max(axis=0) - low + 1e-6)
         
-        # Convert distance to confidence (0-1)
-        confidence = max(0.0, 1.0 - (best_score / len(normalized_positions)))
+        # Player-to-slot distances for every template at once: (F, P, 11)
+        distances = np.linalg.norm(
+            normalized_positions[None, :, None, :] - self.FORMATION_TEMPLATES[:, None, :, :], axis=-1
+        )
         
-        return best_formation, confidence
-    
-    def _compute_compactness(self, positions: np.ndarray) -> float:
-        """Compute team compactness using convex hull area"""
-        if len(positions) < 3:
-            return 0.0
-        
-        try:
-            hull = ConvexHull(positions)
-            return hull.volume  # In 2D, volume is area
-        except:
-            return 0.0
-    
-    def _compute_lines(self, positions: np.ndarray) -> Dict[str, float]:
-        """Compute defensive, midfield, and attacking line positions"""
-        y_positions = positions[:, 1]
-        y_sorted = np.sort(y_positions)
+        # More players than slots (e.g. fragmented tracks): reuse slots in order
+        slots = np.resize(np.arange(distances.shape[2]), max(len(normalized_positions), distances.shape[2]))
+        distances = distances[:, :, slots]
         
-        n = len(y_sorted)
+        # Optimal player-to-slot assignment per template
+        scores = np.empty(len(distances))
+        for i, cost in enumerate(distances):
+            rows, cols = linear_sum_assignment(cost)
+            scores[i] = cost[rows, cols].sum()
         
-        # Divide into thirds
-        defensive_line = np.mean(y_sorted[:n//3]) if n >= 3 else y_sorted[0]
-        midfield_line = np.mean(y_sorted[n//3:2*n//3]) if n >= 3 else np.mean(y_sorted)
-        attacking_line = np.mean(y_sorted[2*n//3:]) if n >= 3 else y_sorted[-1]
+        best = int(np.argmin(scores))  # first formation on ties
+        best_formation = self.FORMATION_NAMES[best]
+        best_score = float(scores[best])
         
-        return {
-            'defensive': defensive_line,
-            'midfield': midfield_line,
-            'attacking': attacking_line
-        }
+        # Convert distance to confidence (0-1)
+        confidence = max(0.0, 1.0 - (best_score / len(normalized_positions)))
+        
+        return best_formation, confidence
     
     def _compute_defensive_line_height(
         self, 
-        defensive_line_y: float, 
+        defensive_line_y: np.ndarray, 
         team_side: str
-    ) -> float:
+    ) -> np.ndarray:
         """
         Compute distance of defensive line from own goal
         
         Args:
-            defensive_line_y: Y-coordinate of defensive line
+            defensive_line_y: Y-coordinate of defensive line (per window)
             team_side: 'home' or 'away'
             
         Returns:
@@ -395,14 +471,16 @@ class TacticalAnalysisEngine:
             # Away defends at y=PITCH_LENGTH
             return self.PITCH_LENGTH - defensive_line_y
     
-    def _determine_block_type(self, defensive_line_height: float) -> str:
-        """Determine if team is playing low/medium/high block"""
-        if defensive_line_height < self.PITCH_LENGTH * 0.25:
-            return "low"
-        elif defensive_line_height < self.PITCH_LENGTH * 0.5:
-            return "medium"
-        else:
-            return "high"
+    def _determine_block_type(self, defensive_line_height: np.ndarray) -> np.ndarray:
+        """Determine if team is playing low/medium/high block (per window)"""
+        return np.select(
+            [
+                defensive_line_height < self.PITCH_LENGTH * 0.25,
+                defensive_line_height < self.PITCH_LENGTH * 0.5
+            ],
+            ["low", "medium"],
+            "high"
+        )
     
     def _estimate_pressing_intensity(
         self, 
@@ -445,43 +523,29 @@ class TacticalAnalysisEngine:
         ATTACKING_THIRD_START = self.PITCH_LENGTH * 2 / 3
         DEFENSIVE_THIRD_END = self.PITCH_LENGTH / 3
         
-        for i in range(len(snapshots) - 1):
-            current = snapshots[i]
-            next_snap = snapshots[i + 1]
-            
-            # Check for defense to attack transition
-            if (current.centroid_y < DEFENSIVE_THIRD_END and 
-                next_snap.centroid_y > ATTACKING_THIRD_START):
-                
-                duration = next_snap.timestamp - current.timestamp
-                distance = abs(next_snap.centroid_y - current.centroid_y)
-                avg_speed = distance / duration if duration > 0 else 0
-                
-                transitions.append(TransitionEvent(
-                    start_time=current.timestamp,
-                    end_time=next_snap.timestamp,
-                    duration=duration,
-                    transition_type="defense_to_attack",
-                    distance_covered=distance,
-                    avg_speed=avg_speed
-                ))
-            
-            # Check for attack to defense transition
-            elif (current.centroid_y > ATTACKING_THIRD_START and 
-                  next_snap.centroid_y < DEFENSIVE_THIRD_END):
-                
-                duration = next_snap.timestamp - current.timestamp
-                distance = abs(current.centroid_y - next_snap.centroid_y)
-                avg_speed = distance / duration if duration > 0 else 0
-                
-                transitions.append(TransitionEvent(
-                    start_time=current.timestamp,
-                    end_time=next_snap.timestamp,
-                    duration=duration,
-                    transition_type="attack_to_defense",
-                    distance_covered=distance,
-                    avg_speed=avg_speed
-                ))
+        # Consecutive snapshot pairs as arrays
+        centroid_y = np.array([s.centroid_y for s in snapshots])
+        times = np.array([s.timestamp for s in snapshots])
+        current, next_y = centroid_y[:-1], centroid_y[1:]
+        
+        defense_to_attack = (current < DEFENSIVE_THIRD_END) & (next_y > ATTACKING_THIRD_START)
+        attack_to_defense = (current > ATTACKING_THIRD_START) & (next_y < DEFENSIVE_THIRD_END)
+        
+        durations = np.diff(times)
+        distances = np.abs(np.diff(centroid_y))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_speeds = np.where(durations > 0, distances / durations, 0.0)
+        transition_types = np.where(defense_to_attack, "defense_to_attack", "attack_to_defense")
+        
+        for i in np.flatnonzero(defense_to_attack | attack_to_defense).tolist():
+            transitions.append(TransitionEvent(
+                start_time=float(times[i]),
+                end_time=float(times[i + 1]),
+                duration=float(durations[i]),
+                transition_type=str(transition_types[i]),
+                distance_covered=float(distances[i]),
+                avg_speed=float(avg_speeds[i])
+            ))
         
         return transitions
 
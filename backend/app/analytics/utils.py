@@ -1,12 +1,105 @@
 """
 Analytics utilities and helper functions
 """
+import math
 import numpy as np
 from typing import List, Tuple
 import logging
+from scipy.spatial import ConvexHull, QhullError
+
+from app.analytics.jit import njit, prange, as_kernel_input
 
 logger = logging.getLogger(__name__)
 
+# Above this many points calculate_convex_hull_area uses scipy (Qhull);
+# below it the fixed per-call overhead of Qhull dominates
+HULL_KERNEL_MAX_POINTS = 64
+
+
+@njit(cache=True)
+def _direction_changes_kernel(xs, ys, angle_threshold):
+    """Count heading changes of at least angle_threshold degrees between steps"""
+    changes = 0
+    prev_angle = 0.0
+    for i in range(1, len(xs)):
+        angle = (math.degrees(math.atan2(ys[i] - ys[i - 1], xs[i] - xs[i - 1])) + 360) % 360
+        if i > 1:
+            angle_diff = abs(angle - prev_angle)
+            if angle_diff > 180:
+                angle_diff = 360 - angle_diff
+            if angle_diff >= angle_threshold:
+                changes += 1
+        prev_angle = angle
+    return changes
+
+
+@njit(cache=True)
+def _hull_area_kernel(xs, ys):
+    """Convex hull area (Andrew's monotone chain + shoelace); 0 for degenerate input"""
+    n = len(xs)
+    
+    # Insertion sort of point indices by (x, y); n is small
+    order = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        j = i
+        while j > 0 and (xs[order[j - 1]] > xs[i] or (xs[order[j - 1]] == xs[i] and ys[order[j - 1]] > ys[i])):
+            order[j] = order[j - 1]
+            j -= 1
+        order[j] = i
+    
+    # Lower hull left to right, then upper hull right to left, popping
+    # points that do not make a left turn
+    hull = np.empty(2 * n, dtype=np.int64)
+    k = 0
+    for i in range(n):
+        p = order[i]
+        while k >= 2 and (
+            (xs[hull[k - 1]] - xs[hull[k - 2]]) * (ys[p] - ys[hull[k - 2]])
+            - (ys[hull[k - 1]] - ys[hull[k - 2]]) * (xs[p] - xs[hull[k - 2]])
+        ) <= 0:
+            k -= 1
+        hull[k] = p
+        k += 1
+    lower_size = k
+    for i in range(n - 2, -1, -1):
+        p = order[i]
+        while k > lower_size and (
+            (xs[hull[k - 1]] - xs[hull[k - 2]]) * (ys[p] - ys[hull[k - 2]])
+            - (ys[hull[k - 1]] - ys[hull[k - 2]]) * (xs[p] - xs[hull[k - 2]])
+        ) <= 0:
+            k -= 1
+        hull[k] = p
+        k += 1
+    
+    # Shoelace over the closed chain (hull[k - 1] is hull[0] again)
+    area = 0.0
+    for i in range(k - 1):
+        a = hull[i]
+        b = hull[i + 1]
+        area += xs[a] * ys[b] - xs[b] * ys[a]
+    return abs(area) / 2
+
+
+@njit(cache=True, parallel=True)
+def _hull_areas_kernel(xs, ys):
+    """_hull_area_kernel of each row's non-NaN points, rows in parallel"""
+    n_rows = len(xs)
+    areas = np.zeros(n_rows)
+    for r in prange(n_rows):
+        row_x = xs[r]
+        row_y = ys[r]
+        px = np.empty(len(row_x))
+        py = np.empty(len(row_x))
+        m = 0
+        for p in range(len(row_x)):
+            if not math.isnan(row_x[p]):
+                px[m] = row_x[p]
+                py[m] = row_y[p]
+                m += 1
+        if m >= 3:
+            areas[r] = _hull_area_kernel(px[:m], py[:m])
+    return areas
+
 
 def smooth_trajectory(
     positions: List[Tuple[float, float]],
@@ -25,16 +118,19 @@ def smooth_trajectory(
     if len(positions) < window_size:
         return positions
     
-    positions_array = np.array(positions)
-    smoothed = np.copy(positions_array)
+    positions_array = np.asarray(positions, dtype=np.float64)
+    smoothed = positions_array.copy()
     
     half_window = window_size // 2
+    width = 2 * half_window + 1
     
-    for i in range(half_window, len(positions) - half_window):
-        window = positions_array[i - half_window:i + half_window + 1]
-        smoothed[i] = np.mean(window, axis=0)
+    # Centered window sums from prefix sums; the first and last
+    # half_window points are kept as they are
+    csum = np.zeros((len(positions_array) + 1, 2))
+    np.cumsum(positions_array, axis=0, out=csum[1:])
+    smoothed[half_window:len(positions_array) - half_window] = (csum[width:] - csum[:-width]) / width
     
-    return [(x, y) for x, y in smoothed]
+    return [(x, y) for x, y in smoothed.tolist()]
 
 
 def calculate_distance(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
@@ -51,9 +147,7 @@ def calculate_angle(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
     """
     dx = p2[0] - p1[0]
     dy = p2[1] - p1[1]
-    angle_rad = np.arctan2(dy, dx)
-    angle_deg = np.degrees(angle_rad)
-    return (angle_deg + 360) % 360
+    return (math.degrees(math.atan2(dy, dx)) + 360) % 360
 
 
 def detect_direction_changes(
@@ -73,23 +167,11 @@ def detect_direction_changes(
     if len(positions) < 3:
         return 0
     
-    changes = 0
-    prev_angle = None
-    
-    for i in range(1, len(positions)):
-        angle = calculate_angle(positions[i - 1], positions[i])
-        
-        if prev_angle is not None:
-            angle_diff = abs(angle - prev_angle)
-            if angle_diff > 180:
-                angle_diff = 360 - angle_diff
-            
-            if angle_diff >= angle_threshold:
-                changes += 1
-        
-        prev_angle = angle
-    
-    return changes
+    positions_array = np.asarray(positions, dtype=np.float64)
+    return int(_direction_changes_kernel(
+        as_kernel_input(positions_array[:, 0]), as_kernel_input(positions_array[:, 1]),
+        float(angle_threshold)
+    ))
 
 
 def calculate_convex_hull_area(positions: List[Tuple[float, float]]) -> float:
@@ -102,14 +184,36 @@ def calculate_convex_hull_area(positions: List[Tuple[float, float]]) -> float:
     if len(positions) < 3:
         return 0.0
     
+    points = np.asarray(positions, dtype=np.float64)
+    if len(points) <= HULL_KERNEL_MAX_POINTS:
+        return float(_hull_area_kernel(as_kernel_input(points[:, 0]), as_kernel_input(points[:, 1])))
+    
+    # No extent along an axis: no area, and Qhull would reject it
+    if np.ptp(points, axis=0).min() <= 0:
+        return 0.0
+    
     try:
-        from scipy.spatial import ConvexHull
-        points = np.array(positions)
         hull = ConvexHull(points)
-        return hull.volume  # In 2D, volume is area
-    except Exception as e:
-        logger.warning(f"Could not compute convex hull: {e}")
+    except QhullError as e:
+        # Other degenerate input, e.g. all points on one diagonal line
+        logger.debug(f"Degenerate convex hull input: {e}")
         return 0.0
+    return float(hull.volume)  # In 2D, volume is area
+
+
+def convex_hull_areas(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Convex hull area of each row of point sets
+    
+    Args:
+        xs, ys: (rows, points) coordinates, NaN for missing points
+        
+    Returns:
+        Area per row in square meters (0 for fewer than 3 points)
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    return _hull_areas_kernel(as_kernel_input(xs), as_kernel_input(ys))
 
 
 def interpolate_missing_positions(
@@ -131,24 +235,17 @@ def interpolate_missing_positions(
     if len(positions) < 2:
         return positions
     
-    from scipy.interpolate import interp1d
-    
-    # Extract data
-    pos_array = np.array([(x, y, t) for x, y, t in positions])
+    # Extract data, ordered by time (np.interp needs increasing times)
+    pos_array = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    pos_array = pos_array[np.argsort(pos_array[:, 2], kind="stable")]
     original_times = pos_array[:, 2]
     original_x = pos_array[:, 0]
     original_y = pos_array[:, 1]
     
-    # Create interpolation functions
-    interp_x = interp1d(original_times, original_x, kind='linear', fill_value='extrapolate')
-    interp_y = interp1d(original_times, original_y, kind='linear', fill_value='extrapolate')
-    
-    # Interpolate
-    interpolated = []
-    for t in timestamps:
-        if min(original_times) <= t <= max(original_times):
-            x = float(interp_x(t))
-            y = float(interp_y(t))
-            interpolated.append((x, y, t))
+    # Interpolate at the expected timestamps inside the observed range
+    target_times = np.asarray(timestamps, dtype=np.float64)
+    target_times = target_times[(target_times >= original_times[0]) & (target_times <= original_times[-1])]
+    x = np.interp(target_times, original_times, original_x)
+    y = np.interp(target_times, original_times, original_y)
     
-    return interpolated
+    return list(zip(x.tolist(), y.tolist(), target_times.tolist()))
@@ -6,12 +6,149 @@ and actions on the pitch.
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple
+import heapq
+import math
 import numpy as np
 from datetime import datetime
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.models import Track, TrackPoint, Match
+from app.analytics.jit import njit, prange, as_kernel_input
+
+
+# ============================================================================
+# Detection kernel
+# One forward scan over x/y/timestamp pairing each start point with the end
+# of its movement, compiled by numba when available. It returns indices and
+# per-event values only; XTEvent objects are built by the engine afterwards.
+# ============================================================================
+
+EVENT_PASS = 0
+EVENT_CARRY = 1
+EVENT_SHOT = 2
+EVENT_TYPES = ("pass", "carry", "shot")  # indexed by event code
+
+LOOKAHEAD_FRAMES = 10  # look-ahead: next 9 points
+
+# Shot geometry (pitch in meters, attacking toward x = 105)
+GOAL_X = 105.0
+GOAL_Y = 68.0 / 2
+
+MIN_MOVE_DIST = 1.0  # meaningful movement: distance > 1m, dt > 0
+PASS_MIN_SPEED = 15.0  # velocity > 15 m/s
+PASS_MIN_DIST = 10.0  # distance > 10m
+SHOT_MIN_SPEED = 20.0  # velocity > 20 m/s
+SHOT_MIN_COS = 0.8  # cosine to goal > 0.8
+SHOT_MIN_X = 70.0  # attacking third
+CARRY_MIN_SPEED = 3.0  # velocity in (3, 12) m/s
+CARRY_MAX_SPEED = 12.0
+CARRY_MIN_DIST = 2.0  # distance > 2m
+
+
+@njit(cache=True)
+def _detect_xt_events_kernel(xs, ys, ts):
+    """
+    Detect xT events in a single pass
+    
+    For each start point, the first of the next 9 points that makes a
+    meaningful movement (dt > 0, distance > 1m) and classifies as an event
+    ends it; scanning resumes after that end point. Classification, first
+    match wins:
+    - pass: velocity > 15 m/s over more than 10m
+    - shot: from x > 70, velocity > 20 m/s pointing at goal (cosine > 0.8)
+    - carry: velocity in (3, 12) m/s over more than 2m
+    
+    Returns:
+        (codes, starts, ends, distances, velocities)
+    """
+    n = len(xs)
+    codes = np.empty(n, dtype=np.int8)
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    distances = np.empty(n, dtype=np.float64)
+    velocities = np.empty(n, dtype=np.float64)
+    count = 0
+    
+    i = 0
+    while i < n - 1:
+        x0 = xs[i]
+        y0 = ys[i]
+        t0 = ts[i]
+        to_goal_x = GOAL_X - x0
+        to_goal_y = GOAL_Y - y0
+        mag_goal = math.sqrt(to_goal_x * to_goal_x + to_goal_y * to_goal_y)
+        
+        for j in range(i + 1, min(i + LOOKAHEAD_FRAMES, n)):
+            move_x = xs[j] - x0
+            move_y = ys[j] - y0
+            distance = math.sqrt(move_x * move_x + move_y * move_y)
+            time_diff = ts[j] - t0
+            if not (time_diff > 0 and distance > MIN_MOVE_DIST):
+                continue
+            
+            velocity = distance / time_diff
+            if velocity > PASS_MIN_SPEED and distance > PASS_MIN_DIST:
+                code = EVENT_PASS
+            elif (velocity > SHOT_MIN_SPEED and x0 > SHOT_MIN_X and mag_goal > 0
+                    and (to_goal_x * move_x + to_goal_y * move_y) / (mag_goal * distance) > SHOT_MIN_COS):
+                code = EVENT_SHOT
+            elif CARRY_MIN_SPEED < velocity < CARRY_MAX_SPEED and distance > CARRY_MIN_DIST:
+                code = EVENT_CARRY
+            else:
+                continue
+            
+            codes[count] = code
+            starts[count] = i
+            ends[count] = j
+            distances[count] = distance
+            velocities[count] = velocity
+            count += 1
+            i = j  # Skip to end of event
+            break
+        
+        i += 1
+    
+    return codes[:count], starts[:count], ends[:count], distances[:count], velocities[:count]
+
+
+@njit(cache=True, parallel=True)
+def _detect_xt_tracks_kernel(xs, ys, ts, offsets):
+    """
+    Run _detect_xt_events_kernel on many tracks in parallel
+    
+    Track k occupies [offsets[k], offsets[k + 1]) of the arrays. A track of
+    m points yields fewer than m events, so its results are written to the
+    same region and threads never share slots.
+    
+    Returns:
+        (codes, starts, ends, distances, velocities, counts); track k's
+        events are the first counts[k] entries of its region, with indices
+        local to the track
+    """
+    n_tracks = len(offsets) - 1
+    n = len(xs)
+    codes = np.empty(n, dtype=np.int8)
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    distances = np.empty(n, dtype=np.float64)
+    velocities = np.empty(n, dtype=np.float64)
+    counts = np.zeros(n_tracks, dtype=np.int64)
+    
+    for k in prange(n_tracks):
+        lo = offsets[k]
+        hi = offsets[k + 1]
+        c, s, e, d, v = _detect_xt_events_kernel(xs[lo:hi], ys[lo:hi], ts[lo:hi])
+        m = len(c)
+        codes[lo:lo + m] = c
+        starts[lo:lo + m] = s
+        ends[lo:lo + m] = e
+        distances[lo:lo + m] = d
+        velocities[lo:lo + m] = v
+        counts[k] = m
+    
+    return codes, starts, ends, distances, velocities, counts
 
 
 @dataclass
@@ -97,6 +234,23 @@ class ExpectedThreatEngine:
         [0.25, 0.32, 0.40, 0.48, 0.52, 0.56, 0.56, 0.52, 0.48, 0.40, 0.32, 0.25]
     ])
     
+    # Row-major flat copies: cell (col, row) is at col * GRID_HEIGHT + row.
+    # The list serves scalar lookups without NumPy indexing overhead.
+    XT_GRID_FLAT = np.ascontiguousarray(XT_GRID).ravel()
+    _XT_VALUES = XT_GRID_FLAT.tolist()
+    
+    # get_xt_grid_data payload: the grid is constant, so it is built once.
+    # values is a tuple of tuples: callers share it and cannot mutate it
+    _GRID_DATA = {
+        "grid_width": GRID_WIDTH,
+        "grid_height": GRID_HEIGHT,
+        "cell_width": PITCH_LENGTH / GRID_WIDTH,
+        "cell_height": PITCH_WIDTH / GRID_HEIGHT,
+        "pitch_length": PITCH_LENGTH,
+        "pitch_width": PITCH_WIDTH,
+        "values": tuple(map(tuple, XT_GRID.tolist()))
+    }
+    
     def __init__(self, db: Session):
         self.db = db
         self.cell_width = self.PITCH_LENGTH / self.GRID_WIDTH
@@ -112,14 +266,37 @@ class ExpectedThreatEngine:
         Returns:
             (col, row) cell indices
         """
-        col = int(np.clip(x / self.cell_width, 0, self.GRID_WIDTH - 1))
-        row = int(np.clip(y / self.cell_height, 0, self.GRID_HEIGHT - 1))
+        # Plain int arithmetic: np.clip dispatch dominates for a scalar
+        col = int(x / self.cell_width)
+        col = 0 if col < 0 else self.GRID_WIDTH - 1 if col > self.GRID_WIDTH - 1 else col
+        row = int(y / self.cell_height)
+        row = 0 if row < 0 else self.GRID_HEIGHT - 1 if row > self.GRID_HEIGHT - 1 else row
         return (col, row)
     
+    def position_to_cell_array(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert arrays of pitch coordinates to grid cells
+        
+        Returns:
+            (cols, rows) int32 cell index arrays
+        """
+        cols = np.clip(np.asarray(xs) / self.cell_width, 0, self.GRID_WIDTH - 1).astype(np.int32)
+        rows = np.clip(np.asarray(ys) / self.cell_height, 0, self.GRID_HEIGHT - 1).astype(np.int32)
+        return cols, rows
+    
     def get_xt_value(self, x: float, y: float) -> float:
         """Get xT value for a position"""
         col, row = self.position_to_cell(x, y)
-        return float(self.XT_GRID[col, row])
+        return self._XT_VALUES[col * self.GRID_HEIGHT + row]
+    
+    def get_xt_values(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Get xT values for arrays of positions"""
+        cols, rows = self.position_to_cell_array(xs, ys)
+        return self.XT_GRID_FLAT[cols * self.GRID_HEIGHT + rows]
     
     def compute_xt_gain(
         self, 
@@ -162,17 +339,29 @@ class ExpectedThreatEngine:
         if not track:
             raise ValueError(f"Track {player_id} not found")
         
-        points = self.db.query(TrackPoint).filter(
-            TrackPoint.track_id == player_id,
-            TrackPoint.x_m.isnot(None),
-            TrackPoint.y_m.isnot(None)
-        ).order_by(TrackPoint.timestamp).all()
+        # Only the columns detection reads: plain rows, no ORM objects
+        rows = self.db.execute(
+            select(TrackPoint.x_m, TrackPoint.y_m, TrackPoint.timestamp)
+            .where(
+                TrackPoint.track_id == player_id,
+                TrackPoint.x_m.isnot(None),
+                TrackPoint.y_m.isnot(None)
+            )
+            .order_by(TrackPoint.timestamp)
+        ).all()
         
-        if len(points) < 2:
+        if len(rows) < 2:
             return self._empty_summary(player_id, match_id), []
         
+        # Structure-of-arrays view of the track
+        n = len(rows)
+        x_m, y_m, timestamps = zip(*rows)
+        xs = np.fromiter(x_m, dtype=np.float64, count=n)
+        ys = np.fromiter(y_m, dtype=np.float64, count=n)
+        ts = np.fromiter(timestamps, dtype=np.float64, count=n)
+        
         # Detect events
-        events = self._detect_events(points, player_id, match_id)
+        events = self._detect_events(xs, ys, ts, player_id, match_id)
         
         # Compute summary
         summary = self._compute_summary(events, player_id, match_id)
@@ -192,24 +381,70 @@ class ExpectedThreatEngine:
             Track.team_side.isnot(None)
         ).all()
         
+        # One query for every point of the match instead of one per track
+        rows = self.db.execute(
+            select(TrackPoint.track_id, TrackPoint.x_m, TrackPoint.y_m, TrackPoint.timestamp)
+            .join(Track, Track.id == TrackPoint.track_id)
+            .where(
+                Track.match_id == match_id,
+                Track.team_side.isnot(None),
+                TrackPoint.x_m.isnot(None),
+                TrackPoint.y_m.isnot(None)
+            )
+            .order_by(TrackPoint.track_id, TrackPoint.timestamp)
+        ).all()
+        
+        track_slices = {}
+        if rows:
+            track_ids, x_m, y_m, timestamps = zip(*rows)
+            n = len(rows)
+            xs = np.fromiter(x_m, dtype=np.float64, count=n)
+            ys = np.fromiter(y_m, dtype=np.float64, count=n)
+            ts = np.fromiter(timestamps, dtype=np.float64, count=n)
+            
+            # Rows are grouped by track: each track is a contiguous slice
+            _, track_starts = np.unique(np.array(track_ids, dtype=object), return_index=True)
+            track_starts.sort()
+            offsets = np.append(track_starts, n).astype(np.int64)
+            
+            # Tracks are independent: detect on all of them in one (parallel) call
+            codes, ev_starts, ev_ends, distances, velocities, counts = _detect_xt_tracks_kernel(
+                as_kernel_input(xs), as_kernel_input(ys), as_kernel_input(ts), offsets
+            )
+            for k, count in enumerate(counts.tolist()):
+                lo, hi = int(offsets[k]), int(offsets[k + 1])
+                found = slice(lo, lo + count)
+                track_slices[track_ids[lo]] = (
+                    hi - lo,
+                    (codes[found], ev_starts[found], ev_ends[found], distances[found], velocities[found],
+                     xs[lo:hi], ys[lo:hi], ts[lo:hi])
+                )
+        
+        # Per-player event lists, each already in timestamp order
         home_events = []
         away_events = []
         home_summaries = []
         away_summaries = []
         
         for track in tracks:
+            # One bad track must not fail the whole match
             try:
-                summary, events = self.analyze_player_xt(match_id, track.id)
-                
-                if track.team_side == "home":
-                    home_events.extend(events)
-                    home_summaries.append(summary)
+                n_points, detected = track_slices.get(track.id, (0, None))
+                if n_points < 2:
+                    summary, events = self._empty_summary(track.id, match_id), []
                 else:
-                    away_events.extend(events)
-                    away_summaries.append(summary)
+                    events = self._build_events(*detected, track.id, match_id)
+                    summary = self._compute_summary(events, track.id, match_id)
             except Exception as e:
                 print(f"Error analyzing track {track.id}: {e}")
                 continue
+            
+            if track.team_side == "home":
+                home_events.append(events)
+                home_summaries.append(summary)
+            else:
+                away_events.append(events)
+                away_summaries.append(summary)
         
         # Compute team totals
         home_total_xt = sum(s.total_xt_gain for s in home_summaries)
@@ -220,147 +455,97 @@ class ExpectedThreatEngine:
             "home": {
                 "total_xt": home_total_xt,
                 "player_summaries": home_summaries,
-                "events": sorted(home_events, key=lambda e: e.timestamp)
+                "events": list(heapq.merge(*home_events, key=lambda e: e.timestamp))
             },
             "away": {
                 "total_xt": away_total_xt,
                 "player_summaries": away_summaries,
-                "events": sorted(away_events, key=lambda e: e.timestamp)
+                "events": list(heapq.merge(*away_events, key=lambda e: e.timestamp))
             }
         }
     
     def _detect_events(
         self,
-        points: List[TrackPoint],
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ts: np.ndarray,
         player_id: str,
         match_id: str
     ) -> List[XTEvent]:
         """
-        Detect pass, carry, and shot events from track points
+        Detect pass, carry, and shot events from a track's
+        timestamp-ordered x/y/timestamp arrays
         
         Simplified heuristics:
         - CARRY: Player moves with ball (continuous movement)
         - PASS: Ball changes position rapidly (velocity spike)
         - SHOT: Movement toward goal with high velocity
-        """
-        events = []
         
-        i = 0
-        while i < len(points) - 1:
-            current = points[i]
-            
-            # Look ahead for next significant movement
-            j = i + 1
-            while j < len(points) and j < i + 10:  # Look ahead 10 frames max
-                next_point = points[j]
-                
-                distance = np.sqrt(
-                    (next_point.x_m - current.x_m) ** 2 + 
-                    (next_point.y_m - current.y_m) ** 2
-                )
-                time_diff = next_point.timestamp - current.timestamp
-                
-                if time_diff > 0 and distance > 1.0:  # Meaningful movement
-                    velocity = distance / time_diff
-                    
-                    # Detect event type
-                    event_type = self._classify_event(
-                        current.x_m, current.y_m,
-                        next_point.x_m, next_point.y_m,
-                        velocity, distance
-                    )
-                    
-                    if event_type:
-                        # Compute xT
-                        xt_gain = self.compute_xt_gain(
-                            current.x_m, current.y_m,
-                            next_point.x_m, next_point.y_m
-                        )
-                        
-                        start_cell = self.position_to_cell(current.x_m, current.y_m)
-                        end_cell = self.position_to_cell(next_point.x_m, next_point.y_m)
-                        
-                        event = XTEvent(
-                            event_id=f"{player_id}_{current.timestamp}",
-                            player_id=player_id,
-                            match_id=match_id,
-                            timestamp=current.timestamp,
-                            event_type=event_type,
-                            start_x=current.x_m,
-                            start_y=current.y_m,
-                            end_x=next_point.x_m,
-                            end_y=next_point.y_m,
-                            start_cell=start_cell,
-                            end_cell=end_cell,
-                            xt_start=self.get_xt_value(current.x_m, current.y_m),
-                            xt_end=self.get_xt_value(next_point.x_m, next_point.y_m),
-                            xt_gain=xt_gain,
-                            metadata={
-                                "distance": distance,
-                                "velocity": velocity,
-                                "duration": time_diff
-                            }
-                        )
-                        
-                        events.append(event)
-                        i = j  # Skip to end of event
-                        break
-                
-                j += 1
-            
-            i += 1
-        
-        return events
+        The numeric scan runs in _detect_xt_events_kernel; this only turns
+        its output into XTEvent objects.
+        """
+        codes, starts, ends, distances, velocities = _detect_xt_events_kernel(
+            as_kernel_input(xs), as_kernel_input(ys), as_kernel_input(ts)
+        )
+        return self._build_events(
+            codes, starts, ends, distances, velocities, xs, ys, ts, player_id, match_id
+        )
     
-    def _classify_event(
+    def _build_events(
         self,
-        start_x: float,
-        start_y: float,
-        end_x: float,
-        end_y: float,
-        velocity: float,
-        distance: float
-    ) -> Optional[str]:
-        """
-        Classify event type based on movement characteristics
-        
-        Returns:
-            "pass", "carry", "shot", or None
-        """
-        # Direction toward goal
-        goal_x = self.PITCH_LENGTH
-        goal_y = self.PITCH_WIDTH / 2
-        
-        # Vector to goal from start
-        to_goal_x = goal_x - start_x
-        to_goal_y = goal_y - start_y
-        
-        # Movement vector
-        move_x = end_x - start_x
-        move_y = end_y - start_y
-        
-        # Dot product (cosine similarity)
-        dot = to_goal_x * move_x + to_goal_y * move_y
-        mag_goal = np.sqrt(to_goal_x**2 + to_goal_y**2)
-        mag_move = np.sqrt(move_x**2 + move_y**2)
-        
-        if mag_move > 0 and mag_goal > 0:
-            toward_goal = dot / (mag_goal * mag_move)
-        else:
-            toward_goal = 0
+        codes: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        distances: np.ndarray,
+        velocities: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        ts: np.ndarray,
+        player_id: str,
+        match_id: str
+    ) -> List[XTEvent]:
+        """Turn one track's kernel output into XTEvent objects"""
+        start_cols, start_rows = self.position_to_cell_array(xs[starts], ys[starts])
+        end_cols, end_rows = self.position_to_cell_array(xs[ends], ys[ends])
+        xt_starts = self.XT_GRID_FLAT[start_cols * self.GRID_HEIGHT + start_rows]
+        xt_ends = self.XT_GRID_FLAT[end_cols * self.GRID_HEIGHT + end_rows]
         
-        # Classification rules
-        if velocity > 15.0 and distance > 10.0:
-            # High velocity, long distance = likely pass
-            return "pass"
-        elif velocity > 20.0 and toward_goal > 0.8 and start_x > 70:
-            # Very high velocity toward goal in attacking third = shot
-            return "shot"
-        elif velocity > 3.0 and velocity < 12.0 and distance > 2.0:
-            # Moderate velocity = carry
-            return "carry"
+        events = [
+            XTEvent(
+                event_id=f"{player_id}_{timestamp}",
+                player_id=player_id,
+                match_id=match_id,
+                timestamp=timestamp,
+                event_type=event_kind,
+                start_x=start_x,
+                start_y=start_y,
+                end_x=end_x,
+                end_y=end_y,
+                start_cell=(start_col, start_row),
+                end_cell=(end_col, end_row),
+                xt_start=xt_start,
+                xt_end=xt_end,
+                xt_gain=xt_end - xt_start,
+                metadata={
+                    "distance": distance,
+                    "velocity": velocity,
+                    "duration": end_time - timestamp
+                }
+            )
+            for (
+                timestamp, end_time, event_kind, start_x, start_y, end_x, end_y,
+                start_col, start_row, end_col, end_row, xt_start, xt_end,
+                distance, velocity
+            ) in zip(
+                ts[starts].tolist(), ts[ends].tolist(), [EVENT_TYPES[c] for c in codes.tolist()],
+                xs[starts].tolist(), ys[starts].tolist(), xs[ends].tolist(), ys[ends].tolist(),
+                start_cols.tolist(), start_rows.tolist(), end_cols.tolist(), end_rows.tolist(),
+                xt_starts.tolist(), xt_ends.tolist(),
+                distances.tolist(), velocities.tolist()
+            )
+        ]
         
-        return None
+        return events
     
     def _compute_summary(
         self,
@@ -370,13 +555,17 @@ class ExpectedThreatEngine:
     ) -> PlayerXTSummary:
         """Compute summary statistics from events"""
         
-        pass_events = [e for e in events if e.event_type == "pass"]
-        carry_events = [e for e in events if e.event_type == "carry"]
-        shot_events = [e for e in events if e.event_type == "shot"]
+        # One pass: event counts and positive xT gains per event type
+        counts = dict.fromkeys(EVENT_TYPES, 0)
+        gains = dict.fromkeys(EVENT_TYPES, 0.0)
+        for e in events:
+            counts[e.event_type] += 1
+            if e.xt_gain > 0:
+                gains[e.event_type] += e.xt_gain
         
-        pass_xt = sum(e.xt_gain for e in pass_events if e.xt_gain > 0)
-        carry_xt = sum(e.xt_gain for e in carry_events if e.xt_gain > 0)
-        shot_xt = sum(e.xt_gain for e in shot_events if e.xt_gain > 0)
+        pass_xt = gains["pass"]
+        carry_xt = gains["carry"]
+        shot_xt = gains["shot"]
         
         total_xt_gain = pass_xt + carry_xt + shot_xt
         
@@ -394,9 +583,9 @@ class ExpectedThreatEngine:
             pass_xt=pass_xt,
             carry_xt=carry_xt,
             shot_xt=shot_xt,
-            num_passes=len(pass_events),
-            num_carries=len(carry_events),
-            num_shots=len(shot_events),
+            num_passes=counts["pass"],
+            num_carries=counts["carry"],
+            num_shots=counts["shot"],
             avg_xt_per_action=avg_xt
         )
     
@@ -421,17 +610,10 @@ class ExpectedThreatEngine:
         Return xT grid data for visualization
         
         Returns:
-            Dict with grid dimensions and values
+            Dict with grid dimensions and values ((GRID_WIDTH, GRID_HEIGHT)
+            nested tuples, shared between calls)
         """
-        return {
-            "grid_width": self.GRID_WIDTH,
-            "grid_height": self.GRID_HEIGHT,
-            "cell_width": self.cell_width,
-            "cell_height": self.cell_height,
-            "pitch_length": self.PITCH_LENGTH,
-            "pitch_width": self.PITCH_WIDTH,
-            "values": self.XT_GRID.tolist()
-        }
+        return dict(self._GRID_DATA)
 
 
 def compute_match_xt(db: Session, match_id: str) -> Dict:
@@ -2,6 +2,7 @@
 Events API Routes - Phase 3
 """
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -66,7 +67,7 @@ async def get_match_events(
                 duration=e.duration,
                 velocity=e.velocity,
                 xt_value=e.xt_value,
-                metadata=e.metadata
+                metadata=e.extra_data
             )
             for e in db_events
         ]
@@ -108,7 +109,7 @@ async def get_match_events(
             duration=e.duration,
             velocity=e.velocity,
             xt_value=e.xt_value,
-            metadata=e.metadata
+            metadata=e.get_metadata()
         )
         for e in events
     ]
@@ -164,7 +165,7 @@ async def get_player_events(
                 duration=e.duration,
                 velocity=e.velocity,
                 xt_value=e.xt_value,
-                metadata=e.metadata
+                metadata=e.extra_data
             )
             for e in db_events
         ]
@@ -206,7 +207,7 @@ async def get_player_events(
             duration=e.duration,
             velocity=e.velocity,
             xt_value=e.xt_value,
-            metadata=e.metadata
+            metadata=e.get_metadata()
         )
         for e in events
     ]
@@ -237,76 +238,71 @@ async def get_team_event_stats(
     """
     Get event statistics for a team
     """
-    events = db.query(Event).filter(
+    # Aggregate stored events in the database: one row per event type
+    # (zero xT values are left out of the xT average, as below)
+    rows = db.query(
+        Event.event_type,
+        func.count(),
+        func.avg(Event.distance),
+        func.avg(Event.velocity),
+        func.avg(func.nullif(Event.xt_value, 0))
+    ).filter(
         Event.match_id == match_id,
         Event.team_side == team_side
-    ).all()
+    ).group_by(Event.event_type).all()
     
-    if not events:
-        # Compute on-the-fly
-        engine = EventDetectionEngine(db)
-        all_events = engine.detect_all_events(match_id)
-        events_data = [e for e in all_events if e.team_side == team_side]
-        
-        # Convert to Event-like objects for processing
-        class EventData:
-            def __init__(self, e):
-                self.event_type = e.event_type
-                self.distance = e.distance
-                self.velocity = e.velocity
-                self.xt_value = e.xt_value
-        
-        events = [EventData(e) for e in events_data]
-    
-    # Compute stats by type
-    event_type_stats = {}
+    type_stats = [
+        (EventTypeEnum(etype).value, count, avg_dist, avg_vel, avg_xt)
+        for etype, count, avg_dist, avg_vel, avg_xt in rows
+    ]
     
-    for event in events:
-        etype = event.event_type if isinstance(event.event_type, str) else event.event_type.value
-        
-        if etype not in event_type_stats:
-            event_type_stats[etype] = {
-                "count": 0,
-                "distances": [],
-                "velocities": [],
-                "xt_gains": []
-            }
+    if not type_stats:
+        # Compute on-the-fly, accumulating per event type in one pass:
+        # [count, distance sum, velocity sum, xT sum, xT count]
+        engine = EventDetectionEngine(db)
+        sums = {}
+        for e in engine.detect_all_events(match_id):
+            if e.team_side != team_side:
+                continue
+            acc = sums.get(e.event_type)
+            if acc is None:
+                acc = sums[e.event_type] = [0, 0.0, 0.0, 0.0, 0]
+            acc[0] += 1
+            acc[1] += e.distance
+            acc[2] += e.velocity
+            if e.xt_value:
+                acc[3] += e.xt_value
+                acc[4] += 1
         
-        event_type_stats[etype]["count"] += 1
-        event_type_stats[etype]["distances"].append(event.distance)
-        event_type_stats[etype]["velocities"].append(event.velocity)
-        if event.xt_value:
-            event_type_stats[etype]["xt_gains"].append(event.xt_value)
+        type_stats = [
+            (etype, count, dist_sum / count, vel_sum / count, xt_sum / xt_count if xt_count else None)
+            for etype, (count, dist_sum, vel_sum, xt_sum, xt_count) in sums.items()
+        ]
     
     # Build response
-    breakdown = []
-    for etype, stats in event_type_stats.items():
-        avg_dist = sum(stats["distances"]) / len(stats["distances"]) if stats["distances"] else 0.0
-        avg_vel = sum(stats["velocities"]) / len(stats["velocities"]) if stats["velocities"] else 0.0
-        avg_xt = sum(stats["xt_gains"]) / len(stats["xt_gains"]) if stats["xt_gains"] else None
-        
-        breakdown.append(EventTypeStatsResponse(
+    breakdown = [
+        EventTypeStatsResponse(
             event_type=etype,
-            count=stats["count"],
+            count=count,
             avg_distance=avg_dist,
             avg_velocity=avg_vel,
             avg_xt_gain=avg_xt
-        ))
-    
-    total_passes = sum(1 for e in events if (e.event_type if isinstance(e.event_type, str) else e.event_type.value) == "pass")
-    total_carries = sum(1 for e in events if (e.event_type if isinstance(e.event_type, str) else e.event_type.value) == "carry")
-    total_shots = sum(1 for e in events if (e.event_type if isinstance(e.event_type, str) else e.event_type.value) == "shot")
+        )
+        for etype, count, avg_dist, avg_vel, avg_xt in type_stats
+    ]
+    by_type = {stats.event_type: stats for stats in breakdown}
     
-    pass_distances = [e.distance for e in events if (e.event_type if isinstance(e.event_type, str) else e.event_type.value) == "pass"]
-    carry_distances = [e.distance for e in events if (e.event_type if isinstance(e.event_type, str) else e.event_type.value) == "carry"]
+    total_passes = by_type["pass"].count if "pass" in by_type else 0
+    total_carries = by_type["carry"].count if "carry" in by_type else 0
+    total_shots = by_type["shot"].count if "shot" in by_type else 0
     
-    avg_pass_dist = sum(pass_distances) / len(pass_distances) if pass_distances else 0.0
-    avg_carry_dist = sum(carry_distances) / len(carry_distances) if carry_distances else 0.0
+    avg_pass_dist = by_type["pass"].avg_distance if "pass" in by_type else 0.0
+    avg_carry_dist = by_type["carry"].avg_distance if "carry" in by_type else 0.0
     
     return TeamEventStatsResponse(
         team_side=team_side,
         match_id=match_id,
-        total_events=len(events),
+        total_events=sum(stats.count for stats in breakdown),
         event_type_breakdown=breakdown,
         total_passes=total_passes,
         total_carries=total_carries,
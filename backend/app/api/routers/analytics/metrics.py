@@ -3,6 +3,7 @@ Analytics API Routes
 Endpoints for retrieving analytics metrics and visualizations
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Optional
@@ -12,8 +13,8 @@ import logging
 from app.db.session import get_db
 from app.models.models import Video, Track, TrackPoint, Match, ObjectClass, ProcessingStatus
 from app.analytics.models import (
-    PlayerMetric, PlayerMetricTimeSeries, PlayerHeatmap,
-    TeamMetric, MetricType, TimeSeriesMetricType
+    PlayerMatchMetrics, PlayerMetricTimeSeries, PlayerMetricSeries, PlayerHeatmap,
+    TeamMetric, TimeSeriesMetricType, PLAYER_MATCH_METRIC_UNITS
 )
 from app.schemas.analytics_schemas import (
     PlayerMetricResponse,
@@ -74,29 +75,19 @@ def get_match_analytics(
     # Aggregate metrics
     track_ids = [t.id for t in tracks]
     
-    total_distance_metrics = db.query(PlayerMetric).filter(
-        PlayerMetric.player_id.in_(track_ids),
-        PlayerMetric.metric_name == MetricType.TOTAL_DISTANCE
+    summary = db.query(PlayerMatchMetrics).filter(
+        PlayerMatchMetrics.match_id == match_id,
+        PlayerMatchMetrics.player_id.in_(track_ids)
     ).all()
     
-    top_speed_metrics = db.query(PlayerMetric).filter(
-        PlayerMetric.player_id.in_(track_ids),
-        PlayerMetric.metric_name == MetricType.TOP_SPEED
-    ).all()
-    
-    sprint_metrics = db.query(PlayerMetric).filter(
-        PlayerMetric.player_id.in_(track_ids),
-        PlayerMetric.metric_name == MetricType.SPRINT_COUNT
-    ).all()
-    
-    total_distance = sum(m.numeric_value for m in total_distance_metrics) / 1000.0  # km
-    avg_speed = sum(m.numeric_value for m in top_speed_metrics) / len(top_speed_metrics) * 3.6 if top_speed_metrics else 0
-    max_speed = max((m.numeric_value for m in top_speed_metrics), default=0) * 3.6
-    total_sprints = sum(int(m.numeric_value) for m in sprint_metrics)
+    total_distance = sum(m.total_distance for m in summary) / 1000.0  # km
+    avg_speed = sum(m.top_speed for m in summary) / len(summary) * 3.6 if summary else 0
+    max_speed = max((m.top_speed for m in summary), default=0) * 3.6
+    total_sprints = sum(m.sprint_count for m in summary)
     
     # Find top performers
-    top_distance_player = max(total_distance_metrics, key=lambda m: m.numeric_value) if total_distance_metrics else None
-    top_speed_player = max(top_speed_metrics, key=lambda m: m.numeric_value) if top_speed_metrics else None
+    top_distance_player = max(summary, key=lambda m: m.total_distance) if summary else None
+    top_speed_player = max(summary, key=lambda m: m.top_speed) if summary else None
     
     return MatchAnalyticsSummary(
         match_id=match_id,
@@ -176,31 +167,28 @@ def get_player_metrics(
         raise HTTPException(status_code=404, detail="Player not found")
     
     # Get metrics
-    query = db.query(PlayerMetric).filter(PlayerMetric.player_id == player_id)
+    query = db.query(PlayerMatchMetrics).filter(PlayerMatchMetrics.player_id == player_id)
     if match_id:
-        query = query.filter(PlayerMetric.match_id == match_id)
+        query = query.filter(PlayerMatchMetrics.match_id == match_id)
     
-    metrics = query.all()
+    metrics = query.first()
     
-    if len(metrics) == 0:
+    if metrics is None:
         raise HTTPException(status_code=404, detail="No metrics found for this player")
     
-    # Build summary
-    metric_dict = {m.metric_name: m.numeric_value for m in metrics}
-    
     return PlayerMetricsSummary(
         player_id=player_id,
         track_id=track.track_id,
         object_class=track.object_class if isinstance(track.object_class, str) else track.object_class.value,
         team_side=track.team_side if isinstance(track.team_side, str) else (track.team_side.value if track.team_side else None),
-        total_distance_km=metric_dict.get(MetricType.TOTAL_DISTANCE, 0) / 1000.0,
-        avg_speed_kmh=metric_dict.get(MetricType.AVG_SPEED, 0) * 3.6,
-        top_speed_kmh=metric_dict.get(MetricType.TOP_SPEED, 0) * 3.6,
-        high_intensity_distance_m=metric_dict.get(MetricType.HIGH_INTENSITY_DISTANCE, 0),
-        sprint_count=int(metric_dict.get(MetricType.SPRINT_COUNT, 0)),
-        max_acceleration_mps2=metric_dict.get(MetricType.MAX_ACCELERATION, 0),
-        max_deceleration_mps2=metric_dict.get(MetricType.MAX_DECELERATION, 0),
-        stamina_index=metric_dict.get(MetricType.STAMINA_INDEX, 0)
+        total_distance_km=metrics.total_distance / 1000.0,
+        avg_speed_kmh=metrics.avg_speed * 3.6,
+        top_speed_kmh=metrics.top_speed * 3.6,
+        high_intensity_distance_m=metrics.high_intensity_distance,
+        sprint_count=metrics.sprint_count,
+        max_acceleration_mps2=metrics.max_acceleration,
+        max_deceleration_mps2=metrics.max_deceleration,
+        stamina_index=metrics.stamina_index
     )
 
 
@@ -212,12 +200,26 @@ def get_player_metrics_detailed(
     """
     Get all detailed metrics for a player
     """
-    metrics = db.query(PlayerMetric).filter(PlayerMetric.player_id == player_id).all()
+    rows = db.query(PlayerMatchMetrics).filter(PlayerMatchMetrics.player_id == player_id).all()
     
-    if len(metrics) == 0:
+    if len(rows) == 0:
         raise HTTPException(status_code=404, detail="No metrics found")
     
-    return metrics
+    # One entry per metric column of each (player, match) row
+    return [
+        PlayerMetricResponse(
+            id=row.id,
+            player_id=row.player_id,
+            match_id=row.match_id,
+            video_id=row.video_id,
+            metric_name=metric.value,
+            numeric_value=getattr(row, metric.value),
+            unit=unit,
+            created_at=row.created_at
+        )
+        for row in rows
+        for metric, unit in PLAYER_MATCH_METRIC_UNITS.items()
+    ]
 
 
 @router.get("/players/{player_id}/timeseries/{metric_type}", response_model=PlayerTimeSeriesResponse)
@@ -236,32 +238,56 @@ def get_player_timeseries(
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid metric type: {metric_type}")
     
-    # Get time series data
-    query = db.query(PlayerMetricTimeSeries).filter(
-        PlayerMetricTimeSeries.player_id == player_id,
-        PlayerMetricTimeSeries.metric_type == metric_enum
-    ).order_by(PlayerMetricTimeSeries.timestamp)
+    # One array row per series (several when not filtered by match)
+    query = db.query(PlayerMetricSeries).filter(
+        PlayerMetricSeries.player_id == player_id,
+        PlayerMetricSeries.metric_type == metric_enum
+    )
     
     if match_id:
-        query = query.filter(PlayerMetricTimeSeries.match_id == match_id)
-    
-    timeseries = query.all()
+        query = query.filter(PlayerMetricSeries.match_id == match_id)
+    
+    series = query.all()
+    
+    if series:
+        timeseries = sorted(
+            (
+                (ts, value, row.unit, row.match_id)
+                for row in series
+                for ts, value in zip(row.timestamps, row.values)
+            ),
+            key=lambda point: point[0]
+        )
+    else:
+        # Data written before player_metric_series: one row per sample. A
+        # track belongs to a single match, so the match-leading covering
+        # index applies even when no match_id is given (index-only scan)
+        legacy_match_id = match_id or db.query(Video.match_id).join(
+            Track, Track.video_id == Video.id
+        ).filter(Track.id == player_id).scalar()
+        
+        timeseries = db.query(
+            PlayerMetricTimeSeries.timestamp,
+            PlayerMetricTimeSeries.value,
+            PlayerMetricTimeSeries.unit,
+            PlayerMetricTimeSeries.match_id
+        ).filter(
+            PlayerMetricTimeSeries.match_id == legacy_match_id,
+            PlayerMetricTimeSeries.player_id == player_id,
+            PlayerMetricTimeSeries.metric_type == metric_enum
+        ).order_by(PlayerMetricTimeSeries.timestamp).all()
     
     if len(timeseries) == 0:
         raise HTTPException(status_code=404, detail="No time series data found")
     
     data_points = [
-        TimeSeriesDataPoint(
-            timestamp=ts.timestamp,
-            value=ts.value,
-            unit=ts.unit
-        )
-        for ts in timeseries
+        TimeSeriesDataPoint(timestamp=ts, value=value, unit=unit)
+        for ts, value, unit, _ in timeseries
     ]
     
     return PlayerTimeSeriesResponse(
         player_id=player_id,
-        match_id=timeseries[0].match_id,
+        match_id=timeseries[0][3],
         metric_type=metric_type,
         data_points=data_points
     )
@@ -269,6 +295,16 @@ def get_player_timeseries(
 
 # ============= Heatmaps =============
 
+def _heatmap_json(**fields) -> ORJSONResponse:
+    """
+    HeatmapResponse fields as JSON
+    
+    heatmap_data is passed as a NumPy grid and written directly by orjson
+    (OPT_SERIALIZE_NUMPY) instead of being expanded to nested Python lists.
+    """
+    return ORJSONResponse(fields)
+
+
 @router.get("/players/{player_id}/heatmap", response_model=HeatmapResponse)
 def get_player_heatmap(
     player_id: UUID,
@@ -288,7 +324,20 @@ def get_player_heatmap(
     if not heatmap:
         raise HTTPException(status_code=404, detail="Heatmap not found")
     
-    return heatmap
+    return _heatmap_json(
+        id=heatmap.id,
+        player_id=heatmap.player_id,
+        match_id=heatmap.match_id,
+        video_id=heatmap.video_id,
+        grid_width=heatmap.grid_width,
+        grid_height=heatmap.grid_height,
+        heatmap_data=heatmap.grid,
+        pitch_length=heatmap.pitch_length,
+        pitch_width=heatmap.pitch_width,
+        total_positions=heatmap.total_positions,
+        max_intensity=heatmap.max_intensity,
+        created_at=heatmap.created_at
+    )
 
 
 @router.get("/matches/{match_id}/heatmap/team/{team_side}", response_model=HeatmapResponse)
@@ -334,17 +383,17 @@ def get_team_heatmap(
     combined_data = np.zeros((heatmaps[0].grid_height, heatmaps[0].grid_width))
     
     for hm in heatmaps:
-        combined_data += np.array(hm.heatmap_data)
+        combined_data += hm.grid
     
     # Create response
-    return HeatmapResponse(
+    return _heatmap_json(
         id=heatmaps[0].id,
         player_id=heatmaps[0].player_id,
         match_id=match_id,
         video_id=video.id,
         grid_width=heatmaps[0].grid_width,
         grid_height=heatmaps[0].grid_height,
-        heatmap_data=combined_data.tolist(),
+        heatmap_data=combined_data,
         pitch_length=heatmaps[0].pitch_length,
         pitch_width=heatmaps[0].pitch_width,
         total_positions=sum(hm.total_positions for hm in heatmaps),
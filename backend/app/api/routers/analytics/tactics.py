@@ -68,7 +68,7 @@ async def get_match_tactics(
                 defensive_line_height=s.defensive_line_height,
                 block_type=s.block_type,
                 pressing_intensity=s.pressing_intensity,
-                player_positions=s.player_positions
+                player_positions=s.player_positions.tolist()
             )
             for s in tactical_data["home"]
         ]
@@ -92,7 +92,7 @@ async def get_match_tactics(
                 defensive_line_height=s.defensive_line_height,
                 block_type=s.block_type,
                 pressing_intensity=s.pressing_intensity,
-                player_positions=s.player_positions
+                player_positions=s.player_positions.tolist()
             )
             for s in tactical_data["away"]
         ]
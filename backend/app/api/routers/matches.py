@@ -11,7 +11,8 @@ from uuid import UUID
 import logging
 
 from app.db.session import get_db
-from app.models.models import Match
+from app.db.bulk import drop_track_points_partition
+from app.models.models import Match, Video
 from app.schemas.schemas import MatchCreate, MatchUpdate, MatchResponse
 
 logger = logging.getLogger(__name__)
@@ -108,6 +109,8 @@ async def delete_match(match_id: UUID, db: Session = Depends(get_db)):
             detail=f"Match with ID {match_id} not found"
         )
     
+    for (video_id,) in db.query(Video.id).filter(Video.match_id == match_id):
+        drop_track_points_partition(db, video_id)
     db.delete(match)
     db.commit()
     return None
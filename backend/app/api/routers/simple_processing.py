@@ -14,12 +14,13 @@ import time
 import gc
 import shutil
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Dict, Any
 import cv2
 import numpy as np
 
 from app.db.session import get_db
+from app.db.bulk import copy_track_points, drop_track_points_partition
 from app.models.models import Video, Track as TrackModel, TrackPoint, ObjectClass, TeamSide
 from app.schemas.schemas import ProcessingStatusResponse
 from app.storage.storage_interface import get_storage
@@ -568,7 +569,7 @@ def process_video_sync(video_id: str, db_session_factory):
         
         # Update status to processing
         video.status = 'processing'
-        video.processing_started_at = datetime.utcnow()
+        video.processing_started_at = datetime.now(timezone.utc)
         db.commit()
         
         processing_status[video_id] = {'status': 'processing', 'progress': 5, 'error': None}
@@ -673,17 +674,15 @@ def process_video_sync(video_id: str, db_session_factory):
         logger.info(f"Filtered to {len(tracks)} valid player tracks")
         
         # Delete existing tracks for this video - do it properly
-        existing_tracks = db.query(TrackModel).filter(TrackModel.video_id == UUID(video_id)).all()
-        for existing_track in existing_tracks:
-            # Delete track points first
-            db.query(TrackPoint).filter(TrackPoint.track_id == existing_track.id).delete()
+        # Drop the video's track point partition first (no per-row cascade)
+        drop_track_points_partition(db, UUID(video_id))
         # Now delete the tracks
         db.query(TrackModel).filter(TrackModel.video_id == UUID(video_id)).delete()
         db.commit()  # Commit the deletions before inserting new ones
         
-        # Save tracks to database
-        for track_data in tracks:
-            track = TrackModel(
+        # Save tracks to database (one batched INSERT to get their ids)
+        new_tracks = [
+            TrackModel(
                 video_id=UUID(video_id),
                 track_id=track_data['display_id'],  # Use display_id (1, 2, 3...)
                 object_class='player',
@@ -692,31 +691,37 @@ def process_video_sync(video_id: str, db_session_factory):
                 last_frame=track_data['last_frame'],
                 total_detections=len(track_data['points'])
             )
-            db.add(track)
-            db.flush()
-            
-            # Add track points
-            for point in track_data['points']:
-                track_point = TrackPoint(
-                    track_id=track.id,
-                    frame_number=int(point['frame']),
-                    timestamp=float(point['frame']) / fps,
-                    bbox_x1=float(point['bbox'][0]),
-                    bbox_y1=float(point['bbox'][1]),
-                    bbox_x2=float(point['bbox'][2]),
-                    bbox_y2=float(point['bbox'][3]),
-                    confidence=float(point['confidence']),
-                    x_px=float(point['center_x']),
-                    y_px=float(point['center_y'])
-                )
-                db.add(track_point)
+            for track_data in tracks
+        ]
+        db.add_all(new_tracks)
+        db.flush()
+        
+        # Add track points with a single COPY
+        copy_track_points(db, UUID(video_id), (
+            (
+                track.id,
+                int(point['frame']),
+                float(point['frame']) / fps,
+                int(round(point['bbox'][0])),
+                int(round(point['bbox'][1])),
+                int(round(point['bbox'][2])),
+                int(round(point['bbox'][3])),
+                float(point['confidence']),
+                float(point['center_x']),
+                float(point['center_y']),
+                None,
+                None
+            )
+            for track, track_data in zip(new_tracks, tracks)
+            for point in track_data['points']
+        ))
         
         db.commit()
         logger.info(f"Saved {len(tracks)} tracks to database")
         
         # Update video status to completed
         video.status = 'completed'
-        video.processing_completed_at = datetime.utcnow()
+        video.processing_completed_at = datetime.now(timezone.utc)
         db.commit()
         
         processing_status[video_id] = {
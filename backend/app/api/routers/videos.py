@@ -9,6 +9,7 @@ from uuid import UUID
 import logging
 
 from app.db.session import get_db
+from app.db.bulk import drop_track_points_partition
 from app.models.models import Video, Match, ProcessingStatus
 from app.schemas.schemas import VideoResponse, VideoListResponse, VideoUploadResponse
 from app.services.video_service import VideoService
@@ -164,6 +165,7 @@ async def delete_video(video_id: UUID, db: Session = Depends(get_db)):
     
     # TODO: Delete from object storage as well
     
+    drop_track_points_partition(db, video.id)
     db.delete(video)
     db.commit()
     return None
@@ -43,6 +43,8 @@ class Settings(BaseSettings):
     supabase_bucket_name: str = Field(default="videos", alias="SUPABASE_BUCKET_NAME")
     
     db_echo: bool = Field(default=False, alias="DB_ECHO")
+    # Load analytics time series / events with COPY (PostgreSQL only)
+    analytics_copy_ingest: bool = Field(default=True, alias="ANALYTICS_COPY_INGEST")
     
     def get_database_url(self) -> str:
         """Build database URL from individual parameters if DATABASE_URL not provided"""
@@ -0,0 +1,274 @@
+"""
+Bulk ingestion helpers
+COPY-based loading for high-volume tables (track_points, and events when
+enabled), batched multi-row inserts, per-video partition management and
+upserts of per-player aggregates
+"""
+import io
+import json
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Iterable, Sequence
+from uuid import UUID
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.analytics.models import PlayerMatchMetrics, Event
+from app.core.config import settings
+
+# Rows per INSERT batch for bulk_insert_events
+INSERT_BATCH_SIZE = 10_000
+
+# Backslash escapes for COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+# track_points -> tracks foreign key, DEFERRABLE since alembic revision 018
+TRACK_POINTS_TRACKS_FKEY = "track_points_track_id_fkey"
+
+# Column order expected by copy_track_points (video_id and created_at are
+# added per batch)
+TRACK_POINT_COPY_COLUMNS = (
+    "track_id", "frame_number", "timestamp",
+    "bbox_x1", "bbox_y1", "bbox_x2", "bbox_y2",
+    "confidence", "x_px", "y_px", "x_m", "y_m",
+)
+
+
+# Columns written by copy_events, in row-dict keys (attribute names) ->
+# table column order
+EVENT_COPY_COLUMNS = (
+    "match_id", "player_id", "team_side", "event_type", "timestamp", "frame_number",
+    "start_x", "start_y", "end_x", "end_y", "distance", "duration", "xt_value",
+    "extra_data",
+)
+
+
+def _copy_value(value) -> str:
+    """Format a value for COPY ... FROM STDIN (text format)"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value).translate(_COPY_ESCAPES)
+    return str(value)
+
+
+def _copy_from(db: Session, table: str, columns: Sequence[str], buffer: io.StringIO) -> None:
+    """Run COPY table (columns) FROM STDIN on the session's connection"""
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+
+def _copy_models(db: Session, model, attributes: Sequence[str], rows: Iterable[Dict]) -> int:
+    """
+    COPY row dicts (keyed by model attribute names) into the model's table
+    
+    Values go through the column types' bind processing first (e.g. the
+    SMALLINT codes of SmallIntEnum columns). Omitted columns get their
+    server defaults.
+    """
+    mapper_columns = [model.__mapper__.columns[attribute] for attribute in attributes]
+    processors = [
+        column.type.process_bind_param if hasattr(column.type, "process_bind_param") else None
+        for column in mapper_columns
+    ]
+    dialect = db.get_bind().dialect
+    
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        values = []
+        for attribute, process in zip(attributes, processors):
+            value = row.get(attribute)
+            if process is not None:
+                value = process(value, dialect)
+            values.append(_copy_value(value))
+        buffer.write("\t".join(values))
+        buffer.write("\n")
+        count += 1
+    
+    if count:
+        _copy_from(db, model.__table__.name, [column.name for column in mapper_columns], buffer)
+    return count
+
+
+def copy_enabled(db: Session) -> bool:
+    """Whether analytics rows should be loaded with COPY (setting + PostgreSQL)"""
+    return settings.analytics_copy_ingest and db.get_bind().dialect.name == "postgresql"
+
+
+def track_points_partition(video_id: UUID) -> str:
+    """Name of the track_points partition holding one video's points"""
+    return f"track_points_v_{video_id.hex}"
+
+
+def ensure_track_points_partition(db: Session, video_id: UUID) -> None:
+    """Create the LIST partition for a video if it does not exist yet"""
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {track_points_partition(video_id)} "
+        f"PARTITION OF track_points FOR VALUES IN ('{video_id}') WITH (fillfactor = 100)"
+    ))
+
+
+def drop_track_points_partition(db: Session, video_id: UUID) -> None:
+    """
+    Remove all track points of a video at once
+
+    Dropping the partition replaces a row-by-row ON DELETE CASCADE from
+    tracks; call it before deleting the video or re-ingesting its tracks.
+
+    The partition is detached CONCURRENTLY, which takes SHARE UPDATE
+    EXCLUSIVE instead of ACCESS EXCLUSIVE on track_points, so reads and
+    COPYs of other videos carry on. That cannot run in a transaction
+    block: the work runs on an autocommit connection of the session's
+    engine and is committed at once, independently of the session. The
+    session must not hold locks on track_points (the detach waits for
+    them).
+    """
+    partition = track_points_partition(video_id)
+    with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": partition}).scalar()
+        if exists is None:
+            return
+
+        # None: already detached; True: an earlier concurrent detach was
+        # interrupted and only needs finalizing
+        detach_pending = conn.execute(
+            text("SELECT inhdetachpending FROM pg_inherits WHERE inhrelid = to_regclass(:name)"),
+            {"name": partition}
+        ).scalar()
+        if detach_pending:
+            conn.execute(text(f"ALTER TABLE track_points DETACH PARTITION {partition} FINALIZE"))
+        elif detach_pending is not None:
+            # A partition referenced by a foreign key (track_point_keypoints)
+            # has to be detached before it can be dropped, and detaching
+            # requires no referencing rows
+            conn.execute(
+                text("DELETE FROM track_point_keypoints WHERE video_id = :video_id"), {"video_id": video_id}
+            )
+            conn.execute(text(f"ALTER TABLE track_points DETACH PARTITION {partition} CONCURRENTLY"))
+        conn.execute(text(f"DROP TABLE {partition}"))
+
+
+def copy_track_points(db: Session, video_id: UUID, rows: Iterable[Sequence]) -> int:
+    """
+    Load track points with a single COPY instead of one INSERT per row
+
+    Args:
+        db: Session; the COPY runs inside its current transaction
+        video_id: Video the points belong to (partition key)
+        rows: Tuples in TRACK_POINT_COPY_COLUMNS order. bbox values must be
+              integers (SMALLINT columns)
+
+    Returns:
+        Number of rows copied
+    """
+    # One created_at for the whole batch (track_points has no server default)
+    created_at = _copy_value(datetime.now(timezone.utc))
+    video = _copy_value(video_id)
+
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write(video)
+        for value in row:
+            buffer.write("\t")
+            buffer.write(_copy_value(value))
+        buffer.write(f"\t{created_at}\n")
+        count += 1
+
+    if count == 0:
+        return 0
+
+    ensure_track_points_partition(db, video_id)
+
+    # Defer only the tracks FK to commit; other deferrable constraints in
+    # the caller's transaction keep their own timing
+    db.execute(text(f"SET CONSTRAINTS {TRACK_POINTS_TRACKS_FKEY} DEFERRED"))
+
+    _copy_from(db, "track_points", ("video_id",) + TRACK_POINT_COPY_COLUMNS + ("created_at",), buffer)
+
+    return count
+
+
+def bulk_insert_events(
+    db: Session,
+    rows: Iterable[Dict],
+    batch_size: int = INSERT_BATCH_SIZE
+) -> int:
+    """
+    Insert events rows without creating ORM objects
+    
+    With COPY ingest enabled (see copy_enabled) all rows are loaded with a
+    single COPY. Otherwise each batch is one ORM bulk INSERT, which
+    SQLAlchemy sends as multi-row VALUES statements (insertmanyvalues)
+    rather than one INSERT per row.
+    
+    Args:
+        db: Session; rows are inserted inside its current transaction
+        rows: Dicts keyed by Event attribute names
+        batch_size: Rows per batch (INSERT path)
+    
+    Returns:
+        Number of rows inserted
+    """
+    if copy_enabled(db):
+        return copy_events(db, rows)
+    
+    return _insert_batches(db, Event, rows, batch_size)
+
+
+def copy_events(db: Session, rows: Iterable[Dict]) -> int:
+    """Load events rows with one COPY (velocity is a generated column)"""
+    return _copy_models(db, Event, EVENT_COPY_COLUMNS, rows)
+
+
+def _insert_batches(db: Session, model, rows: Iterable[Dict], batch_size: int) -> int:
+    """ORM bulk INSERT of row dicts, batch_size rows per statement"""
+    rows = iter(rows)
+    count = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        db.execute(insert(model), batch)
+        count += len(batch)
+    return count
+
+
+def upsert_player_match_metrics(db: Session, rows: Sequence[Dict]) -> int:
+    """
+    Write player_match_metrics rows with one INSERT ... ON CONFLICT DO UPDATE
+
+    Re-running analytics for a match overwrites each player's row in place
+    (keyed by player_id, match_id) instead of adding new ones.
+
+    Args:
+        db: Session; the upsert runs inside its current transaction
+        rows: Dicts keyed by PlayerMatchMetrics attribute names
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    statement = postgresql.insert(PlayerMatchMetrics).values(list(rows))
+    key = ("player_id", "match_id")
+    updates = {
+        name: statement.excluded[name]
+        for name in rows[0]
+        if name not in key
+    }
+    updates["updated_at"] = func.now()
+    db.execute(statement.on_conflict_do_update(index_elements=list(key), set_=updates))
+    return len(rows)
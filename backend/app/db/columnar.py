@@ -0,0 +1,86 @@
+"""
+Columnar mirror of track_points for analytics scans
+Only available when the citus_columnar extension is installed (see
+alembic revision 019_track_points_columnar); callers fall back to the
+row-store table otherwise.
+"""
+from collections import defaultdict
+from typing import Dict, List, Sequence
+from uuid import UUID
+
+from sqlalchemy import text, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+
+def columnar_available(db: Session) -> bool:
+    """Whether the track_points_columnar mirror exists in this database"""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(text("SELECT to_regclass('track_points_columnar')")).scalar() is not None
+
+
+def sync_track_points_columnar(db: Session, video_id: UUID) -> bool:
+    """
+    Append the calibrated track points of a video to the columnar mirror
+
+    Only points with both x_m and y_m are copied. Columnar tables are
+    append-only, so tracks already mirrored are skipped; a track that was
+    not calibrated yet has no mirrored rows and is picked up by a later
+    sync. Re-processing a video creates new track ids; rows of deleted
+    tracks are never read again and go away with the next full rebuild
+    (TRUNCATE).
+
+    Returns:
+        False if the mirror is not available
+    """
+    if not columnar_available(db):
+        return False
+
+    db.execute(
+        text("""
+            INSERT INTO track_points_columnar
+                (track_id, frame_number, timestamp, x_px, y_px, x_m, y_m)
+            SELECT tp.track_id, tp.frame_number, tp.timestamp, tp.x_px, tp.y_px, tp.x_m, tp.y_m
+            FROM track_points tp
+            JOIN tracks t ON t.id = tp.track_id
+            WHERE t.video_id = :video_id
+              AND tp.x_m IS NOT NULL
+              AND tp.y_m IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM track_points_columnar c WHERE c.track_id = t.id
+              )
+            ORDER BY tp.track_id, tp.timestamp
+        """),
+        {"video_id": video_id}
+    )
+    return True
+
+
+def load_columnar_track_points(
+    db: Session,
+    track_ids: Sequence[UUID]
+) -> Dict[UUID, List[Row]]:
+    """
+    Read the analytics columns for many tracks in one scan
+
+    Returns:
+        track_id -> rows ordered by timestamp. Rows expose timestamp,
+        frame_number, x_px, y_px, x_m, y_m like TrackPoint objects.
+    """
+    points: Dict[UUID, List[Row]] = defaultdict(list)
+    if not track_ids:
+        return points
+
+    query = text("""
+        SELECT track_id, frame_number, timestamp, x_px, y_px, x_m, y_m
+        FROM track_points_columnar
+        WHERE track_id = ANY(:track_ids)
+        ORDER BY track_id, timestamp
+    """).bindparams(bindparam("track_ids", type_=ARRAY(PG_UUID(as_uuid=True))))
+
+    for row in db.execute(query, {"track_ids": list(track_ids)}):
+        points[row.track_id].append(row)
+
+    return points
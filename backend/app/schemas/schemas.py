@@ -115,7 +115,6 @@ class VideoListResponse(BaseModel):
 
 class TrackPointResponse(BaseModel):
     """Schema for track point response"""
-    id: UUID
     frame_number: int
     timestamp: float
     bbox_x1: int
@@ -191,6 +190,17 @@ class CalibrationMatrixResponse(BaseModel):
 
 # ============= Team Color Schemas =============
 
+def pack_rgb(rgb: List[int]) -> int:
+    """Pack an [R, G, B] triple into the INTEGER stored in team_colors"""
+    r, g, b = rgb
+    return (r << 16) | (g << 8) | b
+
+
+def unpack_rgb(value: int) -> List[int]:
+    """Unpack a team_colors INTEGER into [R, G, B]"""
+    return [(value >> 16) & 255, (value >> 8) & 255, value & 255]
+
+
 class TeamColorCreate(BaseModel):
     """Schema for creating team color"""
     team_side: TeamSide
@@ -217,6 +227,13 @@ class TeamColorResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
+    @field_validator("primary_color_rgb", "secondary_color_rgb", mode="before")
+    @classmethod
+    def unpack_packed_rgb(cls, v):
+        if isinstance(v, int):
+            return unpack_rgb(v)
+        return v
+    
     model_config = {"from_attributes": True}
 
 
@@ -5,14 +5,17 @@ Background processing tasks for video processing and analytics
 import logging
 import tempfile
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID
 
+import numpy as np
 from celery import Task
 from sqlalchemy.orm import Session
 
 from app.workers.celery_app import celery_app
 from app.db.session import SessionLocal
+from app.db.bulk import copy_track_points, bulk_insert_events, upsert_player_match_metrics
+from app.db.columnar import sync_track_points_columnar, load_columnar_track_points
 from app.models.models import Video, Track, TrackPoint, ProcessingStatus, ObjectClass
 from app.storage.storage_interface import get_storage
 from app.cv_pipeline.frame_extractor import FrameExtractor
@@ -70,7 +73,7 @@ def process_video_task(self, video_id: str):
         
         # Update status to processing
         video.status = ProcessingStatus.PROCESSING
-        video.processing_started_at = datetime.utcnow()
+        video.processing_started_at = datetime.now(timezone.utc)
         self.db.commit()
         
         # Initialize storage
@@ -145,6 +148,7 @@ def process_video_task(self, video_id: str):
         # Save tracks to database
         logger.info("Saving tracks to database...")
         
+        new_tracks = []
         for track_id, track_data in tracks_data.items():
             points = track_data["points"]
             
@@ -168,31 +172,35 @@ def process_video_task(self, video_id: str):
                 last_frame=points[-1]["frame_number"],
                 total_detections=len(points)
             )
-            
-            self.db.add(track)
-            self.db.flush()  # Get track.id
-            
-            # Create TrackPoint records
-            for point in points:
-                track_point = TrackPoint(
-                    track_id=track.id,
-                    frame_number=point["frame_number"],
-                    timestamp=point["timestamp"],
-                    bbox_x1=point["bbox"][0],
-                    bbox_y1=point["bbox"][1],
-                    bbox_x2=point["bbox"][2],
-                    bbox_y2=point["bbox"][3],
-                    confidence=point["confidence"],
-                    x_px=point["x_px"],
-                    y_px=point["y_px"],
-                    x_m=None,  # Will be set after calibration
-                    y_m=None
-                )
-                self.db.add(track_point)
+            new_tracks.append((track, points))
+        
+        # One batched INSERT for the tracks to get their ids
+        self.db.add_all([track for track, _ in new_tracks])
+        self.db.flush()
+        
+        # COPY all TrackPoint rows in one go (x_m / y_m set after calibration)
+        copy_track_points(self.db, video.id, (
+            (
+                track.id,
+                point["frame_number"],
+                point["timestamp"],
+                int(round(point["bbox"][0])),
+                int(round(point["bbox"][1])),
+                int(round(point["bbox"][2])),
+                int(round(point["bbox"][3])),
+                point["confidence"],
+                point["x_px"],
+                point["y_px"],
+                None,
+                None
+            )
+            for track, points in new_tracks
+            for point in points
+        ))
         
         # Update video status
         video.status = ProcessingStatus.COMPLETED
-        video.processing_completed_at = datetime.utcnow()
+        video.processing_completed_at = datetime.now(timezone.utc)
         self.db.commit()
         
         # Clean up temporary file
@@ -239,11 +247,11 @@ def analytics_computation_task(self, video_id: str):
     logger.info(f"Starting analytics computation for video_id: {video_id}")
     
     try:
-        from app.analytics.physical import PhysicalMetricsEngine, TeamMetricsEngine, TrackPointData
+        from app.analytics.physical import PhysicalMetricsEngine, TeamMetricsEngine, TrackArray
         from app.analytics.heatmap import HeatmapEngine, HeatmapConfig
         from app.analytics.models import (
-            PlayerMetric, PlayerMetricTimeSeries, PlayerHeatmap,
-            TeamMetric, MetricType, TimeSeriesMetricType
+            PlayerMetricSeries, PlayerHeatmap,
+            TeamMetric, TimeSeriesMetricType
         )
         
         # Get video from database
@@ -280,110 +288,85 @@ def analytics_computation_task(self, video_id: str):
         metrics_computed = 0
         heatmaps_created = 0
         
-        # Process each player track
+        # Scan the columnar mirror once for all tracks when it is available
+        columnar_points = None
+        if sync_track_points_columnar(self.db, video.id):
+            columnar_points = load_columnar_track_points(self.db, [t.id for t in player_tracks])
+        
+        # Load each player track as columns (sorted by timestamp)
+        track_arrays = []
         for track in player_tracks:
             # Get all track points ordered by timestamp
-            track_points = (
-                self.db.query(TrackPoint)
-                .filter(TrackPoint.track_id == track.id)
-                .order_by(TrackPoint.timestamp)
-                .all()
-            )
+            if columnar_points is not None:
+                track_points = columnar_points.get(track.id, [])
+            else:
+                track_points = (
+                    self.db.query(TrackPoint)
+                    .filter(TrackPoint.track_id == track.id)
+                    .order_by(TrackPoint.timestamp)
+                    .all()
+                )
             
             if len(track_points) < 2:
                 continue
             
-            # Check if metric coordinates are available
-            has_metric_coords = all(tp.x_m is not None and tp.y_m is not None for tp in track_points)
+            track_array = TrackArray.from_points(track_points)
             
-            if not has_metric_coords:
+            # Check if metric coordinates are available
+            if not track_array.has_metric_coords:
                 logger.warning(f"Track {track.id} missing metric coordinates, skipping")
                 continue
             
-            # Convert to TrackPointData
-            track_point_data = [
-                TrackPointData(
-                    timestamp=tp.timestamp,
-                    frame_number=tp.frame_number,
-                    x_m=tp.x_m,
-                    y_m=tp.y_m,
-                    x_px=tp.x_px,
-                    y_px=tp.y_px
-                )
-                for tp in track_points
-            ]
-            
-            # Compute physical metrics
-            physical_metrics = physical_engine.compute_metrics(track_point_data)
-            
+            track_arrays.append((track, track_array))
+        
+        # Compute physical metrics for all players at once (tracks are independent)
+        all_metrics = physical_engine.compute_metrics_batch([ta for _, ta in track_arrays])
+        
+        # Process each player track
+        player_match_metrics = []
+        for (track, track_array), physical_metrics in zip(track_arrays, all_metrics):
             if physical_metrics is None:
                 logger.warning(f"Failed to compute metrics for track {track.id}")
                 continue
             
-            # Save aggregate metrics to database
-            aggregate_metrics = [
-                (MetricType.TOTAL_DISTANCE, physical_metrics.total_distance_m, "m"),
-                (MetricType.TOP_SPEED, physical_metrics.top_speed_mps, "m/s"),
-                (MetricType.AVG_SPEED, physical_metrics.avg_speed_mps, "m/s"),
-                (MetricType.HIGH_INTENSITY_DISTANCE, physical_metrics.high_intensity_distance_m, "m"),
-                (MetricType.SPRINT_COUNT, physical_metrics.sprint_count, "count"),
-                (MetricType.MAX_ACCELERATION, physical_metrics.max_acceleration_mps2, "m/s²"),
-                (MetricType.MAX_DECELERATION, physical_metrics.max_deceleration_mps2, "m/s²"),
-                (MetricType.STAMINA_INDEX, physical_metrics.stamina_index, "index"),
-            ]
+            # Aggregate metrics: one row per player, upserted after the loop
+            player_match_metrics.append({
+                "player_id": track.id,
+                "match_id": video.match_id,
+                "video_id": video.id,
+                "total_distance": float(physical_metrics.total_distance_m),
+                "top_speed": float(physical_metrics.top_speed_mps),
+                "avg_speed": float(physical_metrics.avg_speed_mps),
+                "high_intensity_distance": float(physical_metrics.high_intensity_distance_m),
+                "sprint_count": int(physical_metrics.sprint_count),
+                "max_acceleration": float(physical_metrics.max_acceleration_mps2),
+                "max_deceleration": float(physical_metrics.max_deceleration_mps2),
+                "stamina_index": float(physical_metrics.stamina_index),
+                "distance_per_minute": physical_metrics.distance_per_minute,
+            })
             
-            for metric_name, value, unit in aggregate_metrics:
-                player_metric = PlayerMetric(
-                    player_id=track.id,
-                    match_id=video.match_id,
-                    video_id=video.id,
-                    metric_name=metric_name,
-                    numeric_value=value,
-                    unit=unit
-                )
-                self.db.add(player_metric)
-            
-            # Save time series data (speed and acceleration)
-            for timestamp, speed in physical_metrics.speed_timeseries:
-                ts_record = PlayerMetricTimeSeries(
-                    player_id=track.id,
-                    match_id=video.match_id,
-                    video_id=video.id,
-                    timestamp=timestamp,
-                    metric_type=TimeSeriesMetricType.SPEED,
-                    value=speed,
-                    unit="m/s"
-                )
-                self.db.add(ts_record)
-            
-            for timestamp, accel in physical_metrics.acceleration_timeseries:
-                ts_record = PlayerMetricTimeSeries(
-                    player_id=track.id,
-                    match_id=video.match_id,
-                    video_id=video.id,
-                    timestamp=timestamp,
-                    metric_type=TimeSeriesMetricType.ACCELERATION,
-                    value=accel,
-                    unit="m/s²"
-                )
-                self.db.add(ts_record)
-            
-            for timestamp, stamina in physical_metrics.stamina_curve:
-                ts_record = PlayerMetricTimeSeries(
-                    player_id=track.id,
-                    match_id=video.match_id,
-                    video_id=video.id,
-                    timestamp=timestamp,
-                    metric_type=TimeSeriesMetricType.STAMINA,
-                    value=stamina,
-                    unit="m/s"
-                )
-                self.db.add(ts_record)
+            # Save time series data (speed, acceleration, stamina): one array
+            # row per metric instead of one row per sample
+            series = (
+                (TimeSeriesMetricType.SPEED, physical_metrics.speed_timeseries, "m/s"),
+                (TimeSeriesMetricType.ACCELERATION, physical_metrics.acceleration_timeseries, "m/s²"),
+                (TimeSeriesMetricType.STAMINA, physical_metrics.stamina_curve, "m/s"),
+            )
+            for metric_type, points, unit in series:
+                if points:
+                    self.db.add(PlayerMetricSeries.from_points(
+                        points,
+                        player_id=track.id,
+                        match_id=video.match_id,
+                        video_id=video.id,
+                        metric_type=metric_type,
+                        unit=unit
+                    ))
             
             metrics_computed += 1
             
             # Generate heatmap
-            positions = [(tp.x_m, tp.y_m) for tp in track_points if tp.x_m is not None]
+            positions = np.column_stack((track_array.x_m, track_array.y_m))
             
             if len(positions) > 0:
                 heatmap = heatmap_engine.generate_heatmap(positions, normalize=True)
@@ -395,7 +378,8 @@ def analytics_computation_task(self, video_id: str):
                         video_id=video.id,
                         grid_width=heatmap.grid_width,
                         grid_height=heatmap.grid_height,
-                        heatmap_data=heatmap.to_dict()["data"],
+                        heatmap_data=heatmap.to_bytes("uint16"),
+                        dtype="uint16",
                         pitch_length=heatmap.pitch_length,
                         pitch_width=heatmap.pitch_width,
                         total_positions=heatmap.total_positions,
@@ -404,6 +388,8 @@ def analytics_computation_task(self, video_id: str):
                     self.db.add(heatmap_record)
                     heatmaps_created += 1
         
+        upsert_player_match_metrics(self.db, player_match_metrics)
+        
         # Commit all changes
         self.db.commit()
         
@@ -493,7 +479,7 @@ def compute_tactical_analysis_task(self, match_id: str):
                         defensive_line_height=snapshot.defensive_line_height,
                         block_type=snapshot.block_type,
                         pressing_intensity=snapshot.pressing_intensity,
-                        player_positions=snapshot.player_positions
+                        player_positions=snapshot.player_positions.tolist()
                     )
                     self.db.add(tactical_record)
                     snapshots_created += 1
@@ -617,36 +603,40 @@ def compute_xt_analysis_task(self, match_id: str):
         # Annotate with xT
         all_events = event_engine.annotate_events_with_xt(all_events, xt_engine)
         
-        events_created = 0
+        # Events already stored for this match, fetched once instead of one
+        # lookup per detected event
+        existing_keys = {
+            (str(player_id), timestamp, event_type)
+            for player_id, timestamp, event_type in self.db.query(
+                EventModel.player_id, EventModel.timestamp, EventModel.event_type
+            ).filter(EventModel.match_id == match_id)
+        }
+        
+        event_rows = []
         for event in all_events:
-            # Check if already exists
-            existing = self.db.query(EventModel).filter(
-                EventModel.match_id == match_id,
-                EventModel.player_id == event.player_id,
-                EventModel.timestamp == event.timestamp,
-                EventModel.event_type == EventType[event.event_type.upper()]
-            ).first()
-            
-            if not existing:
-                event_record = EventModel(
-                    match_id=match_id,
-                    player_id=event.player_id,
-                    team_side=event.team_side,
-                    event_type=EventType[event.event_type.upper()],
-                    timestamp=event.timestamp,
-                    frame_number=event.frame_number,
-                    start_x=event.start_x,
-                    start_y=event.start_y,
-                    end_x=event.end_x,
-                    end_y=event.end_y,
-                    distance=event.distance,
-                    duration=event.duration,
-                    velocity=event.velocity,
-                    xt_value=event.xt_value,
-                    metadata=event.metadata
-                )
-                self.db.add(event_record)
-                events_created += 1
+            event_type = EventType[event.event_type.upper()]
+            key = (str(event.player_id), event.timestamp, event_type)
+            if key in existing_keys:
+                continue
+            existing_keys.add(key)
+            event_rows.append({
+                "match_id": match_id,
+                "player_id": event.player_id,
+                "team_side": event.team_side,
+                "event_type": event_type,
+                "timestamp": event.timestamp,
+                "frame_number": event.frame_number,
+                "start_x": event.start_x,
+                "start_y": event.start_y,
+                "end_x": event.end_x,
+                "end_y": event.end_y,
+                "distance": event.distance,
+                "duration": event.duration,
+                "xt_value": event.xt_value,
+                "extra_data": event.get_metadata()
+            })
+        
+        events_created = bulk_insert_events(self.db, event_rows)
         
         self.db.commit()
         
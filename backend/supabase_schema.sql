@@ -5,16 +5,21 @@
 -- ============================================================
 
 -- DROP existing types and tables if they exist (for clean installation)
+DROP VIEW IF EXISTS team_colors_rgb;
+DROP TABLE IF EXISTS track_points_columnar;
+DROP FUNCTION IF EXISTS set_updated_at() CASCADE;
 DROP TABLE IF EXISTS transition_metrics CASCADE;
 DROP TABLE IF EXISTS events CASCADE;
 DROP TABLE IF EXISTS xt_metrics CASCADE;
 DROP TABLE IF EXISTS tactical_snapshots CASCADE;
 DROP TABLE IF EXISTS team_metrics CASCADE;
 DROP TABLE IF EXISTS player_heatmaps CASCADE;
+DROP TABLE IF EXISTS player_metric_series CASCADE;
 DROP TABLE IF EXISTS player_metric_timeseries CASCADE;
-DROP TABLE IF EXISTS player_metrics CASCADE;
+DROP TABLE IF EXISTS player_match_metrics CASCADE;
 DROP TABLE IF EXISTS team_colors CASCADE;
 DROP TABLE IF EXISTS calibration_matrices CASCADE;
+DROP TABLE IF EXISTS track_point_keypoints CASCADE;
 DROP TABLE IF EXISTS track_points CASCADE;
 DROP TABLE IF EXISTS tracks CASCADE;
 DROP TABLE IF EXISTS videos CASCADE;
@@ -28,58 +33,13 @@ DROP TYPE IF EXISTS objectclass CASCADE;
 DROP TYPE IF EXISTS processingstatus CASCADE;
 
 -- ============================================================
--- ENUM TYPES
+-- ENUMERATED VALUES
 -- ============================================================
-
-CREATE TYPE processingstatus AS ENUM (
-    'pending', 
-    'processing', 
-    'completed', 
-    'failed'
-);
-
-CREATE TYPE objectclass AS ENUM (
-    'player', 
-    'ball', 
-    'referee', 
-    'goalkeeper'
-);
-
-CREATE TYPE teamside AS ENUM (
-    'home', 
-    'away', 
-    'referee', 
-    'unknown'
-);
-
-CREATE TYPE metrictype AS ENUM (
-    'total_distance',
-    'top_speed',
-    'avg_speed',
-    'high_intensity_distance',
-    'sprint_count',
-    'max_acceleration',
-    'max_deceleration',
-    'stamina_index',
-    'avg_heart_rate',
-    'distance_per_minute'
-);
-
-CREATE TYPE timeseriesmetrictype AS ENUM (
-    'speed',
-    'acceleration',
-    'stamina',
-    'distance_rolling'
-);
-
-CREATE TYPE eventtype AS ENUM (
-    'pass',
-    'carry',
-    'shot',
-    'dribble',
-    'tackle',
-    'interception'
-);
+-- No PostgreSQL enum types: low-volume columns are VARCHAR + CHECK,
+-- high-volume columns store SMALLINT codes (1-based declaration order of
+-- the Python enums in app/analytics/models.py):
+--   player_metric_timeseries / player_metric_series.metric_type: 1 speed, 2 acceleration, 3 stamina, 4 distance_rolling
+--   events.event_type: 1 pass, 2 carry, 3 shot, 4 dribble, 5 tackle, 6 interception
 
 -- ============================================================
 -- CORE TABLES (Phase 1)
@@ -91,13 +51,13 @@ CREATE TABLE matches (
     name VARCHAR(255) NOT NULL,
     home_team VARCHAR(255) NOT NULL,
     away_team VARCHAR(255) NOT NULL,
-    match_date TIMESTAMP,
+    match_date TIMESTAMPTZ,
     venue VARCHAR(255),
     competition VARCHAR(255),
     season VARCHAR(50),
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP
-);
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+) WITH (fillfactor = 70);
 
 -- Videos table
 CREATE TABLE videos (
@@ -114,73 +74,96 @@ CREATE TABLE videos (
     codec VARCHAR(50),
     bitrate INTEGER,
     total_frames INTEGER,
-    status processingstatus NOT NULL DEFAULT 'pending',
-    processing_started_at TIMESTAMP,
-    processing_completed_at TIMESTAMP,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processing', 'completed', 'failed')),
+    processing_started_at TIMESTAMPTZ,
+    processing_completed_at TIMESTAMPTZ,
     processing_error TEXT,
     processed_video_path TEXT,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP
-);
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+) WITH (fillfactor = 70);
 
 CREATE INDEX idx_video_match_id ON videos(match_id);
-CREATE INDEX idx_video_status ON videos(status);
+CREATE INDEX idx_video_pending ON videos(created_at) WHERE status IN ('pending', 'processing');
+CREATE INDEX idx_video_failed ON videos(created_at) WHERE status = 'failed';
 
 -- Tracks table
 CREATE TABLE tracks (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     video_id UUID NOT NULL REFERENCES videos(id) ON DELETE CASCADE,
     track_id INTEGER NOT NULL,
-    object_class objectclass NOT NULL,
-    team_side teamside,
+    object_class VARCHAR(16) NOT NULL
+        CHECK (object_class IN ('player', 'ball', 'referee', 'goalkeeper')),
+    team_side VARCHAR(16) CHECK (team_side IN ('home', 'away', 'referee', 'unknown')),
     player_number INTEGER,
     player_name VARCHAR(255),
     first_frame INTEGER NOT NULL,
     last_frame INTEGER NOT NULL,
     total_detections INTEGER NOT NULL,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
     UNIQUE(video_id, track_id)
-);
-
-CREATE INDEX idx_track_video_id ON tracks(video_id);
-CREATE INDEX idx_track_video_track_id ON tracks(video_id, track_id);
+) WITH (fillfactor = 70);
 
--- Track points table
+-- Track points table (hash partitioned by track_id)
 CREATE TABLE track_points (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    track_id UUID NOT NULL REFERENCES tracks(id) ON DELETE CASCADE,
+    video_id UUID NOT NULL,  -- partition key, one partition per video
+    track_id UUID NOT NULL REFERENCES tracks(id) ON DELETE CASCADE DEFERRABLE INITIALLY IMMEDIATE,
     frame_number INTEGER NOT NULL,
-    timestamp FLOAT NOT NULL,
-    bbox_x1 INTEGER NOT NULL,
-    bbox_y1 INTEGER NOT NULL,
-    bbox_x2 INTEGER NOT NULL,
-    bbox_y2 INTEGER NOT NULL,
-    confidence FLOAT NOT NULL,
-    x_px FLOAT NOT NULL,
-    y_px FLOAT NOT NULL,
-    x_m FLOAT,
-    y_m FLOAT,
-    keypoints JSONB,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+    timestamp DOUBLE PRECISION NOT NULL,
+    bbox_x1 SMALLINT NOT NULL,
+    bbox_y1 SMALLINT NOT NULL,
+    bbox_x2 SMALLINT NOT NULL,
+    bbox_y2 SMALLINT NOT NULL,
+    bbox_w SMALLINT GENERATED ALWAYS AS (bbox_x2 - bbox_x1) STORED,
+    bbox_h SMALLINT GENERATED ALWAYS AS (bbox_y2 - bbox_y1) STORED,
+    confidence REAL NOT NULL,
+    x_px REAL NOT NULL,
+    y_px REAL NOT NULL,
+    x_m REAL,
+    y_m REAL,
+    created_at TIMESTAMPTZ NOT NULL,  -- set once per COPY batch by the loader
+    PRIMARY KEY (track_id, frame_number, video_id) INCLUDE (x_m, y_m, confidence, timestamp)
+) PARTITION BY LIST (video_id);
+
+-- Partitions (track_points_v_<video uuid hex>) are created by the loader
+-- (app.db.bulk) and dropped when a video is deleted or re-processed
+
+CREATE INDEX idx_trackpoint_frame_brin ON track_points USING BRIN (frame_number) WITH (pages_per_range = 64);
+-- After large ingests (maintenance window): CLUSTER track_points USING track_points_pkey;
+
+-- Optional columnar mirror for analytics scans (requires citus_columnar,
+-- see alembic revision 019_track_points_columnar):
+-- CREATE TABLE track_points_columnar (track_id UUID NOT NULL, frame_number INTEGER NOT NULL,
+--     timestamp DOUBLE PRECISION NOT NULL, x_px REAL NOT NULL, y_px REAL NOT NULL, x_m REAL, y_m REAL) USING columnar;
+
+-- Track point keypoints (one row per keypoint)
+CREATE TABLE track_point_keypoints (
+    video_id UUID NOT NULL,
+    track_id UUID NOT NULL,
+    frame_number INTEGER NOT NULL,
+    kp_index SMALLINT NOT NULL,
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    conf REAL,
+    PRIMARY KEY (track_id, frame_number, kp_index),
+    FOREIGN KEY (track_id, frame_number, video_id)
+        REFERENCES track_points(track_id, frame_number, video_id) ON DELETE CASCADE
 );
 
-CREATE INDEX idx_trackpoint_track_id ON track_points(track_id);
-CREATE INDEX idx_trackpoint_track_frame ON track_points(track_id, frame_number);
-CREATE INDEX idx_trackpoint_frame ON track_points(frame_number);
-
 -- Calibration matrices table
 CREATE TABLE calibration_matrices (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     match_id UUID NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
-    matrix JSONB NOT NULL,
+    matrix DOUBLE PRECISION[][] NOT NULL,
     source_points JSONB NOT NULL,
     target_points JSONB NOT NULL,
     pitch_length FLOAT,
     pitch_width FLOAT,
     reprojection_error FLOAT,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
 CREATE INDEX idx_calibration_match_id ON calibration_matrices(match_id);
@@ -189,60 +172,92 @@ CREATE INDEX idx_calibration_match_id ON calibration_matrices(match_id);
 CREATE TABLE team_colors (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     match_id UUID NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
-    team_side teamside NOT NULL,
+    team_side VARCHAR(16) NOT NULL CHECK (team_side IN ('home', 'away', 'referee', 'unknown')),
     team_name VARCHAR(255) NOT NULL,
-    primary_color_rgb INTEGER[] NOT NULL,
-    secondary_color_rgb INTEGER[],
+    primary_color_rgb INTEGER NOT NULL,  -- (R << 16) | (G << 8) | B
+    secondary_color_rgb INTEGER,
     color_cluster_centers JSONB,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
     UNIQUE(match_id, team_side)
 );
 
-CREATE INDEX idx_teamcolor_match_id ON team_colors(match_id);
+CREATE VIEW team_colors_rgb AS
+SELECT id, match_id, team_side, team_name,
+       (primary_color_rgb >> 16) & 255 AS primary_r,
+       (primary_color_rgb >> 8) & 255 AS primary_g,
+       primary_color_rgb & 255 AS primary_b,
+       (secondary_color_rgb >> 16) & 255 AS secondary_r,
+       (secondary_color_rgb >> 8) & 255 AS secondary_g,
+       secondary_color_rgb & 255 AS secondary_b
+FROM team_colors;
 
 -- ============================================================
 -- ANALYTICS TABLES (Phase 2)
 -- ============================================================
 
--- Player metrics table
-CREATE TABLE player_metrics (
+-- Player match metrics table: one row per player and match
+CREATE TABLE player_match_metrics (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     player_id UUID NOT NULL,
     match_id UUID NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
     video_id UUID NOT NULL REFERENCES videos(id) ON DELETE CASCADE,
-    metric_name metrictype NOT NULL,
-    numeric_value FLOAT NOT NULL,
-    unit VARCHAR(50),
-    metadata JSONB,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP
+    total_distance FLOAT NOT NULL,
+    top_speed FLOAT NOT NULL,
+    avg_speed FLOAT NOT NULL,
+    high_intensity_distance FLOAT NOT NULL,
+    sprint_count INTEGER NOT NULL,
+    max_acceleration FLOAT NOT NULL,
+    max_deceleration FLOAT NOT NULL,
+    stamina_index FLOAT NOT NULL,
+    distance_per_minute JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT uq_player_match_metrics_player_match UNIQUE (player_id, match_id)
 );
 
-CREATE INDEX idx_player_metric_player_match ON player_metrics(player_id, match_id);
-CREATE INDEX idx_player_metric_match ON player_metrics(match_id);
-CREATE INDEX idx_player_metric_video ON player_metrics(video_id);
-CREATE INDEX idx_player_metric_type ON player_metrics(metric_name);
+CREATE INDEX idx_player_match_metrics_match ON player_match_metrics(match_id);
 
 -- Player metric timeseries table
+-- Hash-partitioned by match (partitions created below the events table)
 CREATE TABLE player_metric_timeseries (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id BIGINT GENERATED ALWAYS AS IDENTITY,
     player_id UUID NOT NULL,
     match_id UUID NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
     video_id UUID NOT NULL REFERENCES videos(id) ON DELETE CASCADE,
     timestamp FLOAT NOT NULL,
     frame_number INTEGER,
-    metric_type timeseriesmetrictype NOT NULL,
-    value FLOAT NOT NULL,
+    metric_type SMALLINT NOT NULL CHECK (metric_type BETWEEN 1 AND 4),
+    value REAL NOT NULL,
     unit VARCHAR(50),
-    created_at TIMESTAMP NOT NULL DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, match_id)
+) PARTITION BY HASH (match_id);
 
-CREATE INDEX idx_timeseries_player_match ON player_metric_timeseries(player_id, match_id);
-CREATE INDEX idx_timeseries_player_timestamp ON player_metric_timeseries(player_id, timestamp);
-CREATE INDEX idx_timeseries_match ON player_metric_timeseries(match_id);
+CREATE INDEX idx_timeseries_covering ON player_metric_timeseries(match_id, player_id, metric_type, timestamp)
+    INCLUDE (value, unit);
 CREATE INDEX idx_timeseries_video ON player_metric_timeseries(video_id);
 
+-- Player metric series table: one array row per player, match and metric
+-- (replaces the row-per-sample player_metric_timeseries for new data)
+CREATE TABLE player_metric_series (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    player_id UUID NOT NULL,
+    match_id UUID NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    video_id UUID NOT NULL REFERENCES videos(id) ON DELETE CASCADE,
+    metric_type SMALLINT NOT NULL CHECK (metric_type BETWEEN 1 AND 4),
+    unit VARCHAR(50),
+    timestamps FLOAT8[] NOT NULL,
+    "values" REAL[] NOT NULL,
+    start_ts FLOAT NOT NULL,
+    sample_rate FLOAT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_metric_series_player_match_type ON player_metric_series(player_id, match_id, metric_type);
+CREATE INDEX idx_metric_series_match ON player_metric_series(match_id);
+CREATE INDEX idx_metric_series_video ON player_metric_series(video_id);
+
 -- Player heatmaps table
 CREATE TABLE player_heatmaps (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -251,14 +266,17 @@ CREATE TABLE player_heatmaps (
     video_id UUID NOT NULL REFERENCES videos(id) ON DELETE CASCADE,
     grid_width INTEGER NOT NULL,
     grid_height INTEGER NOT NULL,
-    heatmap_data JSONB NOT NULL,
+    heatmap_data BYTEA NOT NULL,  -- (grid_height x grid_width), row-major, encoded per dtype
+    dtype VARCHAR(16) NOT NULL DEFAULT 'float32' CHECK (dtype IN ('float32', 'uint16')),
     pitch_length FLOAT NOT NULL DEFAULT 105.0,
     pitch_width FLOAT NOT NULL DEFAULT 68.0,
     total_positions INTEGER NOT NULL,
     max_intensity FLOAT NOT NULL,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP
-);
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+) WITH (fillfactor = 100);
+
+ALTER TABLE player_heatmaps ALTER COLUMN heatmap_data SET STORAGE MAIN;
 
 CREATE INDEX idx_heatmap_player_match ON player_heatmaps(player_id, match_id);
 CREATE INDEX idx_heatmap_match ON player_heatmaps(match_id);
@@ -274,8 +292,8 @@ CREATE TABLE team_metrics (
     numeric_value FLOAT NOT NULL,
     unit VARCHAR(50),
     metadata JSONB,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
 CREATE INDEX idx_team_metric_match ON team_metrics(match_id);
@@ -308,10 +326,9 @@ CREATE TABLE tactical_snapshots (
     block_type VARCHAR(20),
     pressing_intensity FLOAT,
     player_positions JSONB,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
-CREATE INDEX idx_tactical_snapshot_match ON tactical_snapshots(match_id);
 CREATE INDEX idx_tactical_snapshot_match_team ON tactical_snapshots(match_id, team_side);
 CREATE INDEX idx_tactical_snapshot_timestamp ON tactical_snapshots(timestamp);
 
@@ -330,21 +347,21 @@ CREATE TABLE xt_metrics (
     num_carries INTEGER NOT NULL DEFAULT 0,
     num_shots INTEGER NOT NULL DEFAULT 0,
     avg_xt_per_action FLOAT NOT NULL DEFAULT 0.0,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
-CREATE INDEX idx_xt_metric_match ON xt_metrics(match_id);
 CREATE INDEX idx_xt_metric_player ON xt_metrics(player_id);
 CREATE INDEX idx_xt_metric_match_player ON xt_metrics(match_id, player_id);
 
 -- Events table
+-- Hash-partitioned by match like player_metric_timeseries
 CREATE TABLE events (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id BIGINT GENERATED ALWAYS AS IDENTITY,
     match_id UUID NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
     player_id UUID NOT NULL,
     team_side VARCHAR(50) NOT NULL,
-    event_type eventtype NOT NULL,
+    event_type SMALLINT NOT NULL CHECK (event_type BETWEEN 1 AND 6),
     timestamp FLOAT NOT NULL,
     frame_number INTEGER,
     start_x FLOAT NOT NULL,
@@ -353,17 +370,38 @@ CREATE TABLE events (
     end_y FLOAT NOT NULL,
     distance FLOAT NOT NULL,
     duration FLOAT NOT NULL,
-    velocity FLOAT NOT NULL,
+    velocity FLOAT NOT NULL GENERATED ALWAYS AS (
+        CASE WHEN duration > 0 THEN distance / duration ELSE 0 END
+    ) STORED,
     xt_value FLOAT,
     metadata JSONB,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, match_id)
+) PARTITION BY HASH (match_id);
 
-CREATE INDEX idx_event_match ON events(match_id);
 CREATE INDEX idx_event_player ON events(player_id);
-CREATE INDEX idx_event_match_player ON events(match_id, player_id);
+CREATE INDEX idx_event_match_player_ts ON events(match_id, player_id, timestamp)
+    INCLUDE (event_type, start_x, start_y, end_x, end_y, xt_value);
 CREATE INDEX idx_event_type ON events(event_type);
-CREATE INDEX idx_event_timestamp ON events(timestamp);
+CREATE INDEX idx_event_metadata_gin ON events USING GIN (metadata jsonb_path_ops);
+CREATE INDEX idx_event_timestamp_brin ON events USING BRIN (timestamp) WITH (pages_per_range = 64);
+
+-- 16 hash partitions each for player_metric_timeseries and events (storage
+-- parameters go on the partitions, not the partitioned parents)
+DO $$
+DECLARE
+    t TEXT;
+    i INT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['player_metric_timeseries', 'events'] LOOP
+        FOR i IN 0..15 LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES WITH (MODULUS 16, REMAINDER %s) WITH (fillfactor = 100)',
+                t || '_p' || i, t, i
+            );
+        END LOOP;
+    END LOOP;
+END $$;
 
 -- Transition metrics table
 CREATE TABLE transition_metrics (
@@ -376,17 +414,42 @@ CREATE TABLE transition_metrics (
     duration FLOAT NOT NULL,
     distance_covered FLOAT NOT NULL,
     avg_speed FLOAT NOT NULL,
-    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
-CREATE INDEX idx_transition_match ON transition_metrics(match_id);
 CREATE INDEX idx_transition_match_team ON transition_metrics(match_id, team_side);
 
+-- ============================================================
+-- updated_at TRIGGERS
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'matches', 'videos', 'tracks', 'calibration_matrices', 'team_colors',
+        'player_match_metrics', 'player_heatmaps', 'team_metrics', 'xt_metrics'
+    ] LOOP
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_updated_at BEFORE UPDATE ON %I FOR EACH ROW EXECUTE FUNCTION set_updated_at()',
+            t, t
+        );
+    END LOOP;
+END $$;
+
 -- ============================================================
 -- COMPLETE!
 -- ============================================================
 -- Schema created successfully for Nashama Vision
 -- Total tables: 17
 -- Total indexes: 44
--- Total enums: 6
+-- Total enums: 0
 -- ============================================================
@@ -0,0 +1,51 @@
+"""
+Shared fixtures for the analytics service tests
+"""
+import numpy as np
+import pytest
+
+
+class KernelPath:
+    """
+    One execution path of the numba kernels: "compiled" or "python"
+
+    The pure-Python path swaps kernels for their uncompiled py_func (the
+    kernel itself when numba is not installed) and feeds lists, like
+    as_kernel_input does without numba.
+    """
+
+    def __init__(self, name, monkeypatch):
+        self.name = name
+        self._monkeypatch = monkeypatch
+
+    def kernel(self, module, name):
+        """
+        module.<name> for this path
+
+        On the pure-Python path the uncompiled kernel also replaces the
+        module attribute, so kernels and engine methods calling it by name
+        use it too.
+        """
+        kernel = getattr(module, name)
+        if self.name == "compiled":
+            return kernel
+        kernel = getattr(kernel, "py_func", kernel)
+        self._monkeypatch.setattr(module, name, kernel)
+        return kernel
+
+    def to_input(self, values):
+        """Kernel input for this path: an array, or a list on the pure-Python path"""
+        if self.name == "compiled":
+            return np.asarray(values)
+        return np.asarray(values).tolist()
+
+    def patch_kernel_input(self, module):
+        """Make module.as_kernel_input convert like to_input on this path"""
+        if self.name != "compiled":
+            self._monkeypatch.setattr(module, "as_kernel_input", lambda a: a.tolist())
+
+
+@pytest.fixture(params=["compiled", "python"])
+def kernel_path(request, monkeypatch):
+    """Runs a test once with the compiled kernels and once with pure Python"""
+    return KernelPath(request.param, monkeypatch)
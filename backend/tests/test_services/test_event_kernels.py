@@ -0,0 +1,124 @@
+"""
+Tests for the event detection kernels (compiled and pure-Python paths)
+"""
+import numpy as np
+import pytest
+
+from app.analytics import events
+from app.analytics.events import EVENT_PASS, EVENT_CARRY, EVENT_SHOT
+
+
+@pytest.fixture
+def kernels(kernel_path):
+    """(detect_events, detect_tracks, to_input) for one execution path"""
+    return (
+        kernel_path.kernel(events, "_detect_events_kernel"),
+        kernel_path.kernel(events, "_detect_tracks_kernel"),
+        kernel_path.to_input,
+    )
+
+
+def _detect(kernel, to_input, xs, ys, ts):
+    codes, starts, ends, values_a, values_b = kernel(
+        to_input(np.array(xs, dtype=np.float64)),
+        to_input(np.array(ys, dtype=np.float64)),
+        to_input(np.array(ts, dtype=np.float64)),
+    )
+    return list(zip(codes.tolist(), starts.tolist(), ends.tolist())), values_a, values_b
+
+
+# Fixed trajectories (y = 34, the goal line centre, unless given)
+PASS_TRACK = ([10.0, 20.0], [34.0, 34.0], [0.0, 0.5])  # 10m in 0.5s
+SHOT_TRACK = ([80.0, 90.0], [34.0, 34.0], [0.0, 0.5])  # same, from the attacking third
+# 5 m/s for 0.8s, then a 10m kick in 0.5s
+CARRY_THEN_PASS_TRACK = (
+    [0.0, 1.0, 2.0, 3.0, 4.0, 14.0],
+    [34.0] * 6,
+    [0.0, 0.2, 0.4, 0.6, 0.8, 1.3],
+)
+
+
+def test_pass_detected(kernels):
+    """A 10m move at 20 m/s is a pass, too slow for a carry"""
+    detect_events, _, to_input = kernels
+    found, _, _ = _detect(detect_events, to_input, *PASS_TRACK)
+    assert found == [(EVENT_PASS, 0, 1)]
+
+
+def test_shot_detected_with_pass(kernels):
+    """The same move toward goal from the attacking third is also a shot"""
+    detect_events, _, to_input = kernels
+    found, _, _ = _detect(detect_events, to_input, *SHOT_TRACK)
+    assert found == [(EVENT_PASS, 0, 1), (EVENT_SHOT, 0, 1)]
+
+
+def test_shot_requires_pointing_at_goal(kernels):
+    """Moving away from goal is a pass but not a shot"""
+    detect_events, _, to_input = kernels
+    found, _, _ = _detect(detect_events, to_input, [90.0, 80.0], [34.0, 34.0], [0.0, 0.5])
+    assert found == [(EVENT_PASS, 0, 1)]
+
+
+def test_carry_values(kernels):
+    """Carries report the covered distance and duration"""
+    detect_events, _, to_input = kernels
+    found, values_a, values_b = _detect(detect_events, to_input, *CARRY_THEN_PASS_TRACK)
+
+    assert found[0] == (EVENT_CARRY, 0, 4)
+    assert values_a[0] == pytest.approx(4.0)
+    assert values_b[0] == pytest.approx(0.8)
+
+
+def test_pass_cursor_skips_consumed_points(kernels):
+    """A pass moves the pass cursor past its end: (1, 2) is never reported"""
+    detect_events, _, to_input = kernels
+    found, _, _ = _detect(
+        detect_events, to_input,
+        [0.0, 10.0, 20.0, 30.0], [34.0] * 4, [0.0, 0.5, 1.0, 1.5]
+    )
+    assert found == [(EVENT_PASS, 0, 1), (EVENT_PASS, 2, 3)]
+
+
+def test_detector_cursors_are_independent(kernels):
+    """
+    The carry over points 0-4 does not hold back the pass detector: the
+    pass starting at 2 (12m in 0.9s) is still found, while passes starting
+    at 0 or 1 are too slow
+    """
+    detect_events, _, to_input = kernels
+    found, _, _ = _detect(detect_events, to_input, *CARRY_THEN_PASS_TRACK)
+    assert found == [(EVENT_CARRY, 0, 4), (EVENT_PASS, 2, 5)]
+
+
+@pytest.mark.parametrize("n_points", [0, 1])
+def test_fewer_than_two_points(kernels, n_points):
+    """Tracks with fewer than 2 points yield no events"""
+    detect_events, _, to_input = kernels
+    found, values_a, values_b = _detect(
+        detect_events, to_input, [50.0] * n_points, [34.0] * n_points, [0.0] * n_points
+    )
+    assert found == []
+    assert len(values_a) == 0
+    assert len(values_b) == 0
+
+
+def test_tracks_kernel_matches_single_track(kernels):
+    """The batch kernel writes each track's events to its own 3 * offset region"""
+    detect_events, detect_tracks, to_input = kernels
+    tracks = [PASS_TRACK, ([50.0], [34.0], [0.0]), CARRY_THEN_PASS_TRACK, SHOT_TRACK]
+
+    lengths = [len(xs) for xs, _, _ in tracks]
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    xs, ys, ts = (np.concatenate([np.array(track[i], dtype=np.float64) for track in tracks]) for i in range(3))
+
+    codes, starts, ends, values_a, values_b, counts = detect_tracks(
+        to_input(xs), to_input(ys), to_input(ts), offsets
+    )
+
+    assert counts.tolist() == [1, 0, 2, 2]
+    for k, track in enumerate(tracks):
+        expected, expected_a, expected_b = _detect(detect_events, to_input, *track)
+        region = slice(3 * offsets[k], 3 * offsets[k] + counts[k])
+        assert list(zip(codes[region].tolist(), starts[region].tolist(), ends[region].tolist())) == expected
+        assert values_a[region].tolist() == pytest.approx(expected_a.tolist())
+        assert values_b[region].tolist() == pytest.approx(expected_b.tolist())
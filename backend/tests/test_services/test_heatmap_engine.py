@@ -0,0 +1,91 @@
+"""
+Tests for the HeatmapEngine grid and its stored encodings
+"""
+import numpy as np
+import pytest
+
+from app.analytics.heatmap import HeatmapEngine, HeatmapConfig, encode_grid, decode_grid
+
+
+def _random_grid(seed=0, shape=(25, 40)):
+    return np.random.default_rng(seed).gamma(2.0, 3.0, size=shape).astype(np.float32)
+
+
+def test_float32_round_trip():
+    """float32 grids decode to exactly the encoded values"""
+    grid = _random_grid()
+    blob = encode_grid(grid, "float32", float(grid.max()))
+
+    assert len(blob) == grid.size * 4
+    decoded = decode_grid(blob, "float32", *grid.shape, float(grid.max()))
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, grid)
+
+
+def test_uint16_error_bound():
+    """uint16 grids are half the size and within max_intensity / 131070 of the input"""
+    grid = _random_grid(seed=1)
+    max_intensity = float(grid.max())
+    blob = encode_grid(grid, "uint16", max_intensity)
+
+    assert len(blob) == grid.size * 2
+    decoded = decode_grid(blob, "uint16", *grid.shape, max_intensity)
+    assert decoded.dtype == np.float32
+    # Quantization error plus float32 rounding of the decoded value
+    bound = max_intensity / 131070 + max_intensity * np.finfo(np.float32).eps
+    assert np.abs(decoded.astype(np.float64) - grid).max() <= bound
+    assert decoded.max() == pytest.approx(max_intensity)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "uint16"])
+def test_all_zero_grid(dtype):
+    """An empty grid (max_intensity 0, so scale 0) round-trips to zeros"""
+    grid = np.zeros((25, 40), dtype=np.float32)
+
+    decoded = decode_grid(encode_grid(grid, dtype, 0.0), dtype, 25, 40, 0.0)
+
+    assert decoded.shape == (25, 40)
+    assert not decoded.any()
+
+
+def test_unknown_dtype_rejected():
+    """Encodings other than float32 and uint16 are rejected"""
+    grid = _random_grid()
+    with pytest.raises(KeyError):
+        encode_grid(grid, "float16", float(grid.max()))
+    with pytest.raises(KeyError):
+        decode_grid(b"\x00" * 8, "int8", 2, 2, 1.0)
+
+
+def test_heatmap_to_bytes_round_trip():
+    """Heatmap.to_bytes output decodes to the heatmap's (grid_height, grid_width) data"""
+    heatmap = HeatmapEngine().generate_heatmap([(10.0, 10.0), (50.0, 30.0), (90.0, 60.0)])
+
+    for dtype in ("float32", "uint16"):
+        decoded = decode_grid(
+            heatmap.to_bytes(dtype), dtype, heatmap.grid_height, heatmap.grid_width, heatmap.max_intensity
+        )
+        np.testing.assert_allclose(decoded, heatmap.data, atol=heatmap.max_intensity / 65535)
+
+
+def test_out_of_bounds_and_edge_positions_land_in_border_bins():
+    """Off-pitch positions are clamped and the far pitch edges are inclusive"""
+    engine = HeatmapEngine(HeatmapConfig(grid_width=4, grid_height=2))
+    positions = [
+        (-5.0, -5.0),    # off the pitch, before both origins
+        (0.0, 0.0),      # the origin corner
+        (105.0, 68.0),   # the far corner, exactly on the last edges
+        (200.0, 80.0),   # off the pitch, past the far corner
+        (105.0, 0.0),    # far end of the x axis
+        (-1.0, 68.0),    # far end of the y axis, x off the pitch
+        (52.5, 34.0),    # on inner edges: the upper bin of each
+    ]
+
+    heatmap = engine.generate_heatmap(positions, normalize=False, apply_smoothing=False)
+
+    # Rows are y bins (34 m), columns are x bins (26.25 m)
+    np.testing.assert_array_equal(heatmap.data, [
+        [2, 0, 0, 1],
+        [1, 0, 1, 2],
+    ])
+    assert heatmap.data.sum() == heatmap.total_positions == len(positions)
@@ -0,0 +1,117 @@
+"""
+Tests for the convex hull area kernels and their scipy fallback
+"""
+import numpy as np
+import pytest
+from scipy.spatial import ConvexHull
+
+from app.analytics import utils
+from app.analytics.utils import HULL_KERNEL_MAX_POINTS, calculate_convex_hull_area, convex_hull_areas
+
+
+@pytest.fixture
+def kernels(kernel_path):
+    """(hull_area, hull_areas, to_input) for one execution path"""
+    return (
+        kernel_path.kernel(utils, "_hull_area_kernel"),
+        kernel_path.kernel(utils, "_hull_areas_kernel"),
+        kernel_path.to_input,
+    )
+
+
+def _area(kernel, to_input, points):
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return kernel(to_input(points[:, 0]), to_input(points[:, 1]))
+
+
+@pytest.mark.parametrize("n_points", [3, 4, 10, 30, HULL_KERNEL_MAX_POINTS])
+def test_hull_area_matches_scipy(kernels, n_points):
+    """Random point sets give the same area as ConvexHull(...).volume"""
+    hull_area, _, to_input = kernels
+    rng = np.random.default_rng(n_points)
+    for _ in range(20):
+        points = rng.uniform([0, 0], [105, 68], size=(n_points, 2))
+        assert _area(hull_area, to_input, points) == pytest.approx(ConvexHull(points).volume)
+
+
+def test_hull_area_degenerate_input(kernels):
+    """Collinear points, including on a diagonal, have no area"""
+    hull_area, _, to_input = kernels
+    assert _area(hull_area, to_input, [(0, 5), (3, 5), (10, 5)]) == 0.0
+    assert _area(hull_area, to_input, [(2, 0), (2, 7), (2, 3), (2, 1)]) == 0.0
+    assert _area(hull_area, to_input, [(0, 0), (1, 1), (2, 2), (5, 5), (3, 3)]) == 0.0
+
+
+def test_hull_area_duplicates_and_interior_points(kernels):
+    """Repeated corners and interior points do not change the area"""
+    hull_area, _, to_input = kernels
+    square = [(0, 0), (4, 0), (4, 4), (0, 4)]
+    points = square + square + [(2, 2), (1, 3), (4, 2), (0, 0)]
+    assert _area(hull_area, to_input, points) == pytest.approx(16.0)
+    assert _area(hull_area, to_input, [(1, 1), (1, 1), (1, 1)]) == 0.0
+
+
+@pytest.mark.parametrize("n_points", [0, 1, 2])
+def test_hull_area_fewer_than_three_points(kernels, n_points):
+    """Fewer than 3 points have no area"""
+    hull_area, _, to_input = kernels
+    assert _area(hull_area, to_input, [(0, 0), (10, 3)][:n_points]) == 0.0
+
+
+def test_hull_areas_rows_with_nan(kernels):
+    """Rows use only their non-NaN points; fewer than 3 of them give 0"""
+    _, hull_areas, to_input = kernels
+    nan = np.nan
+    xs = np.array([
+        [0, 4, 4, 0, nan, nan],      # square, padded
+        [nan, 0, nan, 6, 0, nan],    # right triangle, NaNs in between
+        [1, 2, nan, nan, nan, nan],  # 2 points
+        [nan] * 6,                   # no points
+        [0, 1, 2, 3, 4, 5],          # collinear
+    ], dtype=np.float64)
+    ys = np.array([
+        [0, 0, 4, 4, nan, nan],
+        [nan, 0, nan, 0, 3, nan],
+        [1, 2, nan, nan, nan, nan],
+        [nan] * 6,
+        [0, 1, 2, 3, 4, 5],
+    ], dtype=np.float64)
+
+    areas = hull_areas(to_input(xs), to_input(ys))
+
+    assert areas.tolist() == pytest.approx([16.0, 9.0, 0.0, 0.0, 0.0])
+
+
+def test_convex_hull_areas_matches_scipy():
+    """convex_hull_areas agrees with ConvexHull on random NaN-padded rows"""
+    rng = np.random.default_rng(7)
+    xs = rng.uniform(0, 105, size=(50, 11))
+    ys = rng.uniform(0, 68, size=(50, 11))
+    xs[rng.random(xs.shape) < 0.3] = np.nan
+
+    expected = []
+    for row_x, row_y in zip(xs, ys):
+        valid = ~np.isnan(row_x)
+        points = np.column_stack([row_x[valid], row_y[valid]])
+        expected.append(ConvexHull(points).volume if len(points) >= 3 else 0.0)
+
+    assert convex_hull_areas(xs, ys).tolist() == pytest.approx(expected)
+
+
+def test_calculate_convex_hull_area_scipy_fallback():
+    """Above HULL_KERNEL_MAX_POINTS the area comes from scipy, same result"""
+    rng = np.random.default_rng(1)
+    for n_points in (HULL_KERNEL_MAX_POINTS, HULL_KERNEL_MAX_POINTS + 1, 500):
+        points = rng.uniform([0, 0], [105, 68], size=(n_points, 2))
+        area = calculate_convex_hull_area([tuple(p) for p in points.tolist()])
+        assert area == pytest.approx(ConvexHull(points).volume)
+
+
+def test_calculate_convex_hull_area_degenerate_fallback():
+    """Degenerate input above HULL_KERNEL_MAX_POINTS gives 0 instead of raising"""
+    n_points = HULL_KERNEL_MAX_POINTS + 10
+    horizontal = [(float(i), 5.0) for i in range(n_points)]
+    diagonal = [(float(i), float(i)) for i in range(n_points)]
+    assert calculate_convex_hull_area(horizontal) == 0.0
+    assert calculate_convex_hull_area(diagonal) == 0.0
+    assert calculate_convex_hull_area([(0.0, 0.0), (1.0, 1.0)]) == 0.0
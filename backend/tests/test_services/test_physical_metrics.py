@@ -1,9 +1,11 @@
 """
 Tests for Physical Metrics Engine
 """
+import numpy as np
 import pytest
 from sqlalchemy.orm import Session
-from app.analytics.physical import PhysicalMetricsEngine, TrackPointData
+from app.analytics import physical
+from app.analytics.physical import PhysicalMetricsEngine, TrackPointData, TrackArray
 
 
 def test_physical_metrics_engine_initialization():
@@ -123,3 +125,175 @@ def test_insufficient_tracks_returns_none():
     
     # Should return None for insufficient data
     assert metrics is None
+
+
+def test_track_array_from_points_sorts_by_timestamp():
+    """Test that TrackArray columns are ordered by timestamp and accepted by the engine"""
+    engine = PhysicalMetricsEngine()
+    
+    track_points = [
+        TrackPointData(
+            timestamp=i * 0.033,
+            frame_number=i,
+            x_m=float(i) * 0.4,
+            y_m=0.0,
+            x_px=float(i) * 10,
+            y_px=100.0
+        )
+        for i in reversed(range(100))
+    ]
+    
+    track = TrackArray.from_points(track_points)
+    
+    assert len(track) == 100
+    assert track.has_metric_coords
+    assert list(track.frame_number[:3]) == [0, 1, 2]
+    # 99 steps of 0.4 m, once the points are back in timestamp order
+    assert engine.compute_metrics(track).total_distance_m == pytest.approx(99 * 0.4, abs=1e-4)
+
+
+def test_long_track_keeps_timestamp_precision():
+    """Test speed and acceleration late in a match against analytic values"""
+    engine = PhysicalMetricsEngine()
+    
+    # Constant acceleration from rest, starting 5000 s into the match at
+    # 25 fps: finite-difference speeds are exact at interval midpoints
+    start, fps, accel = 5000.0, 25, 0.5
+    track_points = []
+    for i in range(251):
+        t = i / fps
+        track_points.append(TrackPointData(
+            timestamp=start + t,
+            frame_number=125000 + i,
+            x_m=10.0 + 0.5 * accel * t * t,
+            y_m=30.0,
+            x_px=0.0,
+            y_px=0.0
+        ))
+    
+    track = TrackArray.from_points(track_points)
+    for metrics in (
+        engine.compute_metrics(track),
+        engine._build_metrics(track, engine._compute_core_metrics(track))
+    ):
+        assert metrics.max_acceleration_mps2 == pytest.approx(accel, abs=0.02)
+        assert metrics.top_speed_mps == pytest.approx(accel * (10.0 - 0.5 / fps), abs=1e-3)
+        assert metrics.speed_timeseries[-1][0] == start + 10.0
+
+
+def _track(xs, timestamps):
+    """TrackArray of a trajectory along the x axis"""
+    return TrackArray.from_points([
+        TrackPointData(timestamp=t, frame_number=i, x_m=x, y_m=0.0, x_px=0.0, y_px=0.0)
+        for i, (x, t) in enumerate(zip(xs, timestamps))
+    ])
+
+
+def _core_metrics(engine, track):
+    """The core sweep from the compiled kernel, its Python form and the NumPy helpers"""
+    args = (track.x_m, track.y_m, track.timestamp,
+            engine.high_intensity_threshold, engine.sprint_threshold, engine.sprint_min_duration)
+    kernel = physical._physical_kernel
+    return [kernel(*args), getattr(kernel, "py_func", kernel)(*args), engine._compute_core_metrics(track)]
+
+
+# 1 s steps at 8, 8, 6, 8, 8, 8, 2 and 9 m/s: sprints (>= 7 m/s) over samples
+# 1-2 (1 s, counted), 4-6 (2 s, counted) and 8 (0 s, at the end, not counted)
+SPRINT_XS = [0.0, 8.0, 16.0, 22.0, 30.0, 38.0, 46.0, 48.0, 57.0]
+SPRINT_TIMESTAMPS = [float(t) for t in range(9)]
+
+
+def test_acceleration_hand_computed():
+    """Test acceleration between kept samples; steps with no time are skipped"""
+    engine = PhysicalMetricsEngine()
+    
+    # Speeds 1, 3, 2 m/s at t = 1, 2, 3 (the repeated t = 1 point is dropped)
+    track = _track([0.0, 1.0, 1.0, 4.0, 6.0], [0.0, 1.0, 1.0, 2.0, 3.0])
+    
+    for core in _core_metrics(engine, track):
+        distances, speeds, timestamps, accelerations = core[:4]
+        max_accel, max_decel, avg_accel = core[7:10]
+        assert speeds.tolist() == pytest.approx([1.0, 3.0, 2.0])
+        assert timestamps.tolist() == [1.0, 2.0, 3.0]
+        assert accelerations.tolist() == pytest.approx([2.0, -1.0])
+        assert (max_accel, max_decel, avg_accel) == pytest.approx((2.0, -1.0, 1.5))
+    
+    # Zero time steps give zero acceleration
+    accelerations = engine._compute_acceleration(
+        np.array([1.0, 3.0, 2.0], dtype=np.float32), np.array([1.0, 1.0, 2.0])
+    )
+    assert accelerations.dtype == np.float32
+    assert accelerations.tolist() == pytest.approx([0.0, -1.0])
+
+
+def test_sprint_and_intensity_edges():
+    """Test sprint runs at the start and end of the series and the minimum duration"""
+    engine = PhysicalMetricsEngine()
+    track = _track(SPRINT_XS, SPRINT_TIMESTAMPS)
+    
+    for core in _core_metrics(engine, track):
+        total_distance, avg_speed, top_speed = core[4:7]
+        high_intensity_distance, sprint_distance, sprint_count = core[10:]
+        assert total_distance == pytest.approx(57.0)
+        assert avg_speed == pytest.approx(57.0 / 8)
+        assert top_speed == pytest.approx(9.0)
+        assert high_intensity_distance == pytest.approx(55.0)  # all but the 2 m/s second
+        assert sprint_distance == pytest.approx(49.0)  # all but the 6 and 2 m/s seconds
+        assert sprint_count == 2
+    
+    # A sprint spanning the whole series is closed by the end sentinel
+    speeds = np.full(3, 8.0, dtype=np.float32)
+    assert engine._compute_sprint_metrics(np.ones(3), speeds, np.array([0.0, 0.5, 1.0])) == (3.0, 1)
+    assert engine._compute_sprint_metrics(np.ones(3), speeds, np.array([0.0, 0.4, 0.9])) == (3.0, 0)
+
+
+def test_distance_per_minute_buckets():
+    """Test per-minute distance; samples at exactly the last whole minute are dropped"""
+    engine = PhysicalMetricsEngine()
+    
+    # Steps of 10, 20, 30 and 40 m ending at t = 30, 60, 90 and 120 s
+    track = _track([0.0, 10.0, 30.0, 60.0, 100.0], [0.0, 30.0, 60.0, 90.0, 120.0])
+    
+    for core in _core_metrics(engine, track):
+        distances, _, timestamps = core[:3]
+        per_minute = engine._compute_distance_per_minute(track, distances, timestamps)
+        assert per_minute.tolist() == pytest.approx([10.0, 50.0])
+    
+    metrics = engine.compute_metrics(track)
+    assert metrics.distance_per_minute == pytest.approx([10.0, 50.0])
+    # Coefficient of variation of (10, 50) is 2/3
+    assert metrics.stamina_index == pytest.approx(100.0 - 200.0 / 3)
+
+
+def test_stamina_curve_windows():
+    """Test the rolling speed average over [t - 30 s, t + 30 s], bounds included"""
+    engine = PhysicalMetricsEngine()
+    
+    speeds = np.array([1.0, 2.0, 3.0, 4.0, 5.0], dtype=np.float32)
+    timestamps = np.array([0.0, 20.0, 40.0, 70.0, 130.0])
+    
+    curve = engine._compute_stamina_curve(speeds, timestamps)
+    
+    assert [t for t, _ in curve] == timestamps.tolist()
+    # 0: {0, 20}; 20: {0, 20, 40}; 40: {20, 40, 70}; 70: {40, 70}; 130: {130}
+    assert [v for _, v in curve] == pytest.approx([1.5, 2.0, 3.0, 3.5, 5.0])
+
+
+def test_compute_metrics_batch_matches_single_tracks():
+    """Test that the parallel batch sweep gives the single-track results"""
+    engine = PhysicalMetricsEngine()
+    tracks = [
+        _track(SPRINT_XS, SPRINT_TIMESTAMPS),
+        _track([5.0], [0.0]),  # too short: None
+        _track([0.0, 1.0, 1.0, 4.0, 6.0], [0.0, 1.0, 1.0, 2.0, 3.0]),
+    ]
+    
+    results = engine.compute_metrics_batch(tracks)
+    
+    assert results[1] is None
+    assert results[0].sprint_count == 2
+    assert results[0].total_distance_m == pytest.approx(57.0)
+    assert results[2].max_acceleration_mps2 == pytest.approx(2.0)
+    for track, result in zip(tracks, results):
+        if result is not None:
+            assert result == engine.compute_metrics(track)
@@ -0,0 +1,108 @@
+"""
+Tests for the vectorised window statistics of the Tactical Analysis Engine
+"""
+import math
+from collections import defaultdict
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.analytics.tactical import TacticalAnalysisEngine
+
+nan = np.nan
+
+
+def test_compute_window_stats_with_nan_padding():
+    """Players without points (NaN) are left out of every statistic"""
+    engine = TacticalAnalysisEngine(db=None)
+    xs = np.array([
+        [10, nan, 20, 30, nan, nan],   # 3 players
+        [0, 10, 20, 30, 40, 50],       # 6 players
+        [nan] * 6,                     # no players
+        [nan, 1, 2, 3, 4, nan],        # 4 players
+    ], dtype=np.float64)
+    ys = np.array([
+        [5, nan, 35, 20, nan, nan],
+        [6, 1, 5, 2, 4, 3],
+        [nan] * 6,
+        [nan, 10, 40, 20, 30, nan],
+    ], dtype=np.float64)
+
+    stats = engine._compute_window_stats(xs, ys)
+
+    assert stats["players"].tolist() == [3, 6, 0, 4]
+    with np.errstate(invalid="ignore"), pytest.warns(RuntimeWarning):
+        expected_spread_x = np.nanstd(xs, axis=1)
+        expected_spread_y = np.nanstd(ys, axis=1)
+    assert stats["centroid_x"].tolist() == pytest.approx([20.0, 25.0, nan, 2.5], nan_ok=True)
+    assert stats["centroid_y"].tolist() == pytest.approx([20.0, 3.5, nan, 25.0], nan_ok=True)
+    assert stats["spread_x"].tolist() == pytest.approx(expected_spread_x.tolist(), nan_ok=True)
+    assert stats["spread_y"].tolist() == pytest.approx(expected_spread_y.tolist(), nan_ok=True)
+    # Thirds by y: 3 players -> 1/1/1, 6 -> 2/2/2, 4 -> 1/1/2
+    assert stats["defensive"].tolist() == pytest.approx([5.0, 1.5, nan, 10.0], nan_ok=True)
+    assert stats["midfield"].tolist() == pytest.approx([20.0, 3.5, nan, 20.0], nan_ok=True)
+    assert stats["attacking"].tolist() == pytest.approx([35.0, 5.5, nan, 35.0], nan_ok=True)
+
+
+class _BucketSession:
+    """
+    Serves _window_positions' grouped query from fixed (track_id,
+    timestamp, x, y) points, bucketed like the SQL floor expression
+    """
+
+    def __init__(self, points, min_time, step):
+        cells = defaultdict(lambda: [0.0, 0.0, 0])
+        for track_id, timestamp, x, y in points:
+            cell = cells[(track_id, float(math.floor((timestamp - min_time) / step)))]
+            cell[0] += x
+            cell[1] += y
+            cell[2] += 1
+        self._rows = [(track_id, bucket, *cell) for (track_id, bucket), cell in cells.items()]
+
+    def query(self, *columns):
+        grouped = SimpleNamespace(all=lambda: self._rows)
+        return SimpleNamespace(filter=lambda *a: SimpleNamespace(group_by=lambda *a: grouped))
+
+
+def test_window_positions_buckets():
+    """
+    Window k averages buckets k and k + 1; a point exactly at max_time
+    lands in the last bucket and still counts toward the last window
+    """
+    min_time, max_time, step = 100.0, 108.0, 2.0
+    points = [
+        ("a", 100.0, 0.0, 0.0),       # bucket 0
+        ("a", 101.0, 2.0, 2.0),       # bucket 0
+        ("a", 102.5, 4.0, 4.0),       # bucket 1
+        ("a", max_time, 10.0, 10.0),  # bucket 4
+        ("b", 103.9, 6.0, 1.0),       # bucket 1
+    ]
+    engine = TacticalAnalysisEngine(_BucketSession(points, min_time, step))
+
+    track_rows, avg_x, avg_y = engine._window_positions(["a", "b", "c"], min_time, step)
+
+    assert track_rows == {"a": 0, "b": 1, "c": 2}
+    assert avg_x.dtype == np.float32
+    np.testing.assert_allclose(avg_x, [
+        [2.0, 4.0, nan, 10.0, 10.0],
+        [6.0, 6.0, nan, nan, nan],
+        [nan, nan, nan, nan, nan],
+    ])
+    np.testing.assert_allclose(avg_y[1], [1.0, 1.0, nan, nan, nan])
+
+    # _generate_snapshots keeps ceil((max_time - min_time) / step) windows:
+    # the last of them still sees the max_time point
+    n_windows = min(int(np.ceil((max_time - min_time) / step)), avg_x.shape[1])
+    assert n_windows == 4
+    assert avg_x[0, n_windows - 1] == pytest.approx(10.0)
+
+
+def test_window_positions_without_points():
+    """Tracks without any points give no windows"""
+    engine = TacticalAnalysisEngine(_BucketSession([], 0.0, 2.0))
+
+    track_rows, avg_x, avg_y = engine._window_positions(["a", "b"], 0.0, 2.0)
+
+    assert track_rows == {"a": 0, "b": 1}
+    assert avg_x.shape == avg_y.shape == (2, 0)
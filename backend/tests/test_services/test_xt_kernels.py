@@ -0,0 +1,207 @@
+"""
+Tests for the xT detection kernels, grid lookups and match event merge
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.analytics import xt
+from app.analytics.xt import ExpectedThreatEngine, EVENT_PASS, EVENT_CARRY, EVENT_SHOT
+
+
+@pytest.fixture
+def kernels(kernel_path):
+    """
+    (detect_events, detect_tracks, to_input) for one execution path
+
+    The engine methods use the same path for the test.
+    """
+    kernel_path.patch_kernel_input(xt)
+    return (
+        kernel_path.kernel(xt, "_detect_xt_events_kernel"),
+        kernel_path.kernel(xt, "_detect_xt_tracks_kernel"),
+        kernel_path.to_input,
+    )
+
+
+# Pass 30 -> 50 (20m in 1s); scanning resumes after its end point, so the
+# carry starts at point 2: 50 -> 53 (6 m/s). After a long pause, a shot
+# 75 -> 83 (32 m/s toward goal) from the attacking third; y = 30 throughout
+TRAJECTORY = (
+    [30.0, 50.0, 50.0, 53.0, 75.0, 83.0],
+    [30.0] * 6,
+    [0.0, 1.0, 1.5, 2.0, 30.0, 30.25],
+)
+EXPECTED_EVENTS = [(EVENT_PASS, 0, 1), (EVENT_CARRY, 2, 3), (EVENT_SHOT, 4, 5)]
+
+# Cells (col, row) and XT_GRID values of the trajectory points, in row 5
+EXPECTED_CELLS = [(4, 5), (7, 5), (7, 5), (8, 5), (11, 5), (12, 5)]
+EXPECTED_XT = [0.04, 0.07, 0.07, 0.09, 0.18, 0.23]
+
+
+def _arrays(track):
+    return tuple(np.array(values, dtype=np.float64) for values in track)
+
+
+def test_detect_xt_events(kernels):
+    """Event codes, bounds, distances and velocities for a known trajectory"""
+    detect_events, _, to_input = kernels
+    codes, starts, ends, distances, velocities = detect_events(*map(to_input, _arrays(TRAJECTORY)))
+
+    assert list(zip(codes.tolist(), starts.tolist(), ends.tolist())) == EXPECTED_EVENTS
+    assert distances.tolist() == pytest.approx([20.0, 3.0, 8.0])
+    assert velocities.tolist() == pytest.approx([20.0, 6.0, 32.0])
+
+
+@pytest.mark.parametrize("n_points", [0, 1])
+def test_detect_xt_events_fewer_than_two_points(kernels, n_points):
+    """Tracks with fewer than 2 points yield no events"""
+    detect_events, _, to_input = kernels
+    track = ([50.0] * n_points, [30.0] * n_points, [0.0] * n_points)
+    codes, starts, ends, distances, velocities = detect_events(*map(to_input, _arrays(track)))
+    assert len(codes) == len(starts) == len(ends) == len(distances) == len(velocities) == 0
+
+
+def test_detect_xt_tracks_kernel(kernels):
+    """The batch kernel writes each track's events to the track's own region"""
+    detect_events, detect_tracks, to_input = kernels
+    tracks = [TRAJECTORY, ([50.0], [30.0], [0.0]), ([90.0, 30.0], [30.0, 30.0], [0.0, 2.0])]
+
+    offsets = np.concatenate([[0], np.cumsum([len(t[0]) for t in tracks])]).astype(np.int64)
+    xs, ys, ts = (np.concatenate([_arrays(track)[i] for track in tracks]) for i in range(3))
+    codes, starts, ends, distances, velocities, counts = detect_tracks(
+        to_input(xs), to_input(ys), to_input(ts), offsets
+    )
+
+    # The last track runs backwards at 30 m/s over 60m: a pass, not a shot
+    assert counts.tolist() == [3, 0, 1]
+    for k, track in enumerate(tracks):
+        expected = detect_events(*map(to_input, _arrays(track)))
+        region = slice(offsets[k], offsets[k] + counts[k])
+        for column, expected_column in zip((codes, starts, ends, distances, velocities), expected):
+            assert column[region].tolist() == pytest.approx(expected_column.tolist())
+
+
+def test_flat_grid_lookup_matches_grid():
+    """XT_GRID_FLAT[col * GRID_HEIGHT + row] is XT_GRID[col, row]"""
+    engine = ExpectedThreatEngine(db=None)
+    cols, rows = np.meshgrid(np.arange(engine.GRID_WIDTH), np.arange(engine.GRID_HEIGHT), indexing="ij")
+    flat = engine.XT_GRID_FLAT[cols * engine.GRID_HEIGHT + rows]
+    np.testing.assert_array_equal(flat, engine.XT_GRID)
+
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(-5, 110, 200)
+    ys = rng.uniform(-5, 73, 200)
+    scalar = [engine.get_xt_value(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+    assert engine.get_xt_values(xs, ys).tolist() == scalar
+
+
+def test_position_to_cell_array_pitch_edges():
+    """Positions on or beyond the pitch edges clamp to the border cells"""
+    engine = ExpectedThreatEngine(db=None)
+    xs = np.array([105.0, 0.0, -1.0, 200.0, 105.0])
+    ys = np.array([68.0, 0.0, -5.0, 100.0, 0.0])
+
+    cols, rows = engine.position_to_cell_array(xs, ys)
+
+    assert cols.tolist() == [15, 0, 0, 15, 15]
+    assert rows.tolist() == [11, 0, 0, 11, 0]
+    assert list(zip(cols.tolist(), rows.tolist())) == [
+        engine.position_to_cell(x, y) for x, y in zip(xs.tolist(), ys.tolist())
+    ]
+
+
+def test_detect_events_xt_deltas(kernels):
+    """Start/end cells and xT gains of the known trajectory's events"""
+    engine = ExpectedThreatEngine(db=None)
+    events = engine._detect_events(*_arrays(TRAJECTORY), "player-1", "match-1")
+
+    assert [e.event_type for e in events] == ["pass", "carry", "shot"]
+    for event, (_, start, end) in zip(events, EXPECTED_EVENTS):
+        assert event.start_cell == EXPECTED_CELLS[start]
+        assert event.end_cell == EXPECTED_CELLS[end]
+        assert event.xt_start == pytest.approx(EXPECTED_XT[start])
+        assert event.xt_end == pytest.approx(EXPECTED_XT[end])
+    assert [e.xt_gain for e in events] == pytest.approx([0.03, 0.02, 0.05])
+
+    summary = engine._compute_summary(events, "player-1", "match-1")
+    assert (summary.num_passes, summary.num_carries, summary.num_shots) == (1, 1, 1)
+    assert summary.total_xt_gain == pytest.approx(0.10)
+
+
+class _MatchSession:
+    """Serves analyze_match_xt's two queries from fixed tracks and point rows"""
+
+    def __init__(self, tracks, rows):
+        self._tracks = tracks
+        self._rows = rows
+
+    def query(self, *args):
+        return SimpleNamespace(filter=lambda *a: SimpleNamespace(all=lambda: self._tracks))
+
+    def execute(self, statement):
+        return SimpleNamespace(all=lambda: self._rows)
+
+
+def test_analyze_match_xt_merges_events_by_timestamp(kernels):
+    """Per-player event lists are merged into one timestamp-ordered team list"""
+    xs, ys, ts = TRAJECTORY
+    shifted = [t + 0.5 for t in ts]
+    tracks = [
+        SimpleNamespace(id="a", team_side="home"),
+        SimpleNamespace(id="b", team_side="home"),
+        SimpleNamespace(id="c", team_side="away"),
+        SimpleNamespace(id="d", team_side="away"),
+    ]
+    # Ordered by track id, then timestamp, like the real query; "d" has no points
+    rows = (
+        [("a", x, y, t) for x, y, t in zip(xs, ys, ts)]
+        + [("b", x, y, t) for x, y, t in zip(xs, ys, shifted)]
+        + [("c", 50.0, 30.0, 0.0)]
+    )
+
+    result = ExpectedThreatEngine(_MatchSession(tracks, rows)).analyze_match_xt("match-1")
+
+    home = result["home"]["events"]
+    assert [(e.player_id, e.timestamp) for e in home] == [
+        ("a", 0.0), ("b", 0.5), ("a", 1.5), ("b", 2.0), ("a", 30.0), ("b", 30.5)
+    ]
+    assert result["home"]["total_xt"] == pytest.approx(0.20)
+    assert result["away"]["events"] == []
+    assert [s.total_xt_gain for s in result["away"]["player_summaries"]] == [0.0, 0.0]
+
+
+def test_grid_data_is_not_shared_mutably():
+    """Callers can change their grid payload without affecting later calls"""
+    engine = ExpectedThreatEngine(db=None)
+    data = engine.get_xt_grid_data()
+    data["grid_width"] = 0
+    with pytest.raises(TypeError):
+        data["values"][0][0] = 1.0
+
+    fresh = engine.get_xt_grid_data()
+    assert fresh["grid_width"] == engine.GRID_WIDTH
+    np.testing.assert_array_equal(fresh["values"], engine.XT_GRID)
+
+
+def test_analyze_match_xt_skips_failing_track(monkeypatch):
+    """A track whose events cannot be built is skipped, the others are kept"""
+    xs, ys, ts = TRAJECTORY
+    tracks = [SimpleNamespace(id="a", team_side="home"), SimpleNamespace(id="b", team_side="home")]
+    rows = [(track_id, x, y, t) for track_id in ("a", "b") for x, y, t in zip(xs, ys, ts)]
+    engine = ExpectedThreatEngine(_MatchSession(tracks, rows))
+
+    build_events = engine._build_events
+
+    def failing_for_a(*args):
+        if args[-2] == "a":
+            raise ValueError("bad track")
+        return build_events(*args)
+
+    monkeypatch.setattr(engine, "_build_events", failing_for_a)
+    result = engine.analyze_match_xt("match-1")
+
+    assert [s.player_id for s in result["home"]["player_summaries"]] == ["b"]
+    assert {e.player_id for e in result["home"]["events"]} == {"b"}
+    assert result["home"]["total_xt"] == pytest.approx(0.10)